@@ -12,8 +12,12 @@ from app.settings import settings
 from app.users import Users
 from app.categories import Categories
 from app.schedulers import Schedulers
-from app.tasks import Tasks
-from app.done_tasks import DoneTasks
+from app.tasks import Tasks, TaskOccurrences
+from app.done_tasks import DoneTasks, TaskMonthlyStats
+from app.mail import MailOutbox
+from app.reminders import ReminderCursors
+from app.tasks_celery import Jobs
+from app.database.tombstones import Tombstones
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,10 @@
+__all__ = (
+    'BaseCache',
+    'MemoryCache',
+    'RedisCache',
+    'cache'
+)
+
+from app.cache.backends import BaseCache, MemoryCache, RedisCache, get_cache_backend
+
+cache = get_cache_backend()
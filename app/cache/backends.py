@@ -0,0 +1,86 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.settings import settings
+
+
+class BaseCache:
+    async def get(self, key: str) -> Any | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    async def get_version(self, key: str, ttl: int) -> int:
+        version: int | None = await self.get(key)
+        if version is None:
+            version = await self.bump_version(key, ttl)
+        return version
+
+    async def bump_version(self, key: str, ttl: int) -> int:
+        # Версия - метка времени, а не счетчик с нуля: после вытеснения ключа старые записи не станут снова актуальными.
+        version: int = time.time_ns()
+        await self.set(key, version, ttl)
+        return version
+
+
+class MemoryCache(BaseCache):
+    # LRU в памяти процесса, значения хранятся до истечения ttl (секунды).
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Any | None:
+        item = self.data.get(key)
+        if item is None:
+            return None
+        expire, value = item
+        if expire < time.monotonic():
+            del self.data[key]
+            return None
+        self.data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        self.data[key] = (time.monotonic() + ttl, value)
+        self.data.move_to_end(key)
+        while len(self.data) > self.max_size:
+            self.data.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class RedisCache(BaseCache):
+    # Общий кэш для нескольких процессов, требует пакет redis (poetry install -E redis).
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as redis
+        except ImportError as err:
+            raise RuntimeError('CACHE__BACKEND=redis requires the redis package: poetry install -E redis') from err
+        self.client = redis.from_url(url)
+
+    async def get(self, key: str) -> Any | None:
+        value = await self.client.get(key)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        await self.client.set(key, json.dumps(value, default=str), ex=ttl)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*keys)
+
+
+def get_cache_backend() -> BaseCache:
+    if settings.cache.BACKEND == 'redis':
+        return RedisCache(settings.cache.REDIS_URL)
+    return MemoryCache(settings.cache.MEMORY_MAX_SIZE)
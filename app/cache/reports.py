@@ -0,0 +1,51 @@
+from datetime import date
+from typing import Awaitable, Callable, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import cache
+from app.database.unit_of_work import on_commit
+from app.settings import settings
+from app.utils import make_etag
+
+REPORTS_VERSION_TTL_SECONDS = 24 * 3600
+
+ReportsChangeConsumer = Callable[[int], Awaitable]
+reports_change_consumers: List[ReportsChangeConsumer] = []
+
+
+def register_reports_consumer(consumer: ReportsChangeConsumer) -> ReportsChangeConsumer:
+    # consumer(user_id) вызывается после сброса версии отчетов пользователя.
+    if consumer not in reports_change_consumers:
+        reports_change_consumers.append(consumer)
+    return consumer
+
+
+def get_reports_version_key(user_id: int) -> str:
+    return f'reports_version:{user_id}'
+
+
+async def get_reports_version(user_id: int) -> int:
+    return await cache.get_version(get_reports_version_key(user_id), REPORTS_VERSION_TTL_SECONDS)
+
+
+async def bump_reports_version(user_id: int) -> None:
+    # Вызывается после записи задач, выполненных задач и расписаний пользователя.
+    if settings.cache.REPORTS_ENABLED:
+        await cache.bump_version(get_reports_version_key(user_id), REPORTS_VERSION_TTL_SECONDS)
+        for consumer in reports_change_consumers:
+            await consumer(user_id)
+
+
+async def bump_reports_on_schedule_change(session: AsyncSession, user_id: int, deltas: list) -> None:
+    # Потребитель app.schedulers.changes: кэш сбрасывается, только если у задач изменились даты.
+    await on_commit(session, lambda: bump_reports_version(user_id))
+
+
+def get_report_etag(user_id: int, version: int, report: str, params: dict) -> str:
+    # Текущая дата входит в ключ: отчеты без дат строятся за текущий месяц.
+    return make_etag(user_id, version, report, date.today(), params)
+
+
+def get_report_cache_key(etag: str) -> str:
+    return f'report:{etag.strip(chr(34))}'
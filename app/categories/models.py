@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import TYPE_CHECKING, List
 
-from sqlalchemy import String, ForeignKey, UniqueConstraint
+from sqlalchemy import String, ForeignKey, text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.settings import Base
@@ -13,6 +14,7 @@ if TYPE_CHECKING:
 class Categories(Base):
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     user_id: Mapped[int] = mapped_column(ForeignKey('users.id'), nullable=False)
+    updated: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"), onupdate=datetime.utcnow)
     user: Mapped['Users'] = relationship(back_populates='categories')
 
     tasks: Mapped[List['Tasks']] = relationship(back_populates='category')
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.categories.schemas import CategoryListSchema, CategoryDetailSchema, CategoryCreateUpdateSchema
 from app.categories.services import CategoryService
+from app.database.pagination import CursorPage, CursorParams, get_cursor_params
 from app.database.settings import db_settings
 from app.users.schemas import UserReadSchema
 from app.users.services import UserService
@@ -18,27 +19,34 @@ router = APIRouter(
 
 @router.get('/list/', response_model=Page[CategoryListSchema])
 async def get_list(user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
-                   session: Annotated[AsyncSession, Depends(db_settings.get_session)]):
+                   session: Annotated[AsyncSession, Depends(db_settings.get_read_session)]):
     return await CategoryService.get_list(session, is_paginate=True, user_id=user.id)
 
 
+@router.get('/list/cursor/', response_model=CursorPage[CategoryListSchema])
+async def get_list_cursor(user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
+                          session: Annotated[AsyncSession, Depends(db_settings.get_read_session)],
+                          params: Annotated[CursorParams, Depends(get_cursor_params)]):
+    return await CategoryService.get_list(session, cursor_params=params, user_id=user.id)
+
+
 @router.get('/detail/{category_id}/', response_model=CategoryDetailSchema)
 async def get_detail(user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
-                     session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+                     session: Annotated[AsyncSession, Depends(db_settings.get_read_session)],
                      category_id: int):
     return await CategoryService.get_detail(session, id=category_id, user_id=user.id)
 
 
 @router.post('/create/', response_model=CategoryDetailSchema)
 async def create(user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
-                 session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+                 session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
                  data: CategoryCreateUpdateSchema):
     return await CategoryService.create_category(session, user, data)
 
 
 @router.put('/edit/{category_id}/', response_model=CategoryDetailSchema)
 async def edit(user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
-               session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+               session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
                category_id: int,
                data: CategoryCreateUpdateSchema):
     return await CategoryService.update_category(session, user, category_id, data)
@@ -46,6 +54,6 @@ async def edit(user: Annotated[UserReadSchema, Depends(UserService.get_current_u
 
 @router.delete('/delete/{category_id}/', status_code=status.HTTP_204_NO_CONTENT)
 async def delete(user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
-                 session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+                 session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
                  category_id: int):
     await CategoryService.delete_category(session, user, category_id)
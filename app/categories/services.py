@@ -11,6 +11,7 @@ from app.users.schemas import UserReadSchema
 
 class CategoryService(DatabaseService):
     model = Categories
+    tombstone_entity = 'categories'
 
     @classmethod
     async def create_category(cls, session: AsyncSession, user: UserReadSchema, data: CategoryCreateUpdateSchema):
@@ -24,11 +25,14 @@ class CategoryService(DatabaseService):
                               data: CategoryCreateUpdateSchema):
         exceptions = ExceptionsDatabase(unique_error=CategoryAlreadyExistsException,
                                         object_not_found=NotChangedCategoryDoesNotExistException)
-        return await cls.update(session,
-                                filters={'id': category_id, 'user_id': user.id},
-                                exceptions=exceptions,
-                                title=data.title)
+        category = await cls.update(session,
+                                    filters={'id': category_id, 'user_id': user.id},
+                                    exceptions=exceptions,
+                                    title=data.title)
+        await cls.touch_related(session, cls.model.tasks, user_id=user.id, category_id=category_id)
+        return category
 
     @classmethod
     async def delete_category(cls, session: AsyncSession, user: UserReadSchema, category_id: int) -> None:
+        await cls.touch_related(session, cls.model.tasks, user_id=user.id, category_id=category_id)
         await cls.delete(session, filters={'id': category_id, 'user_id': user.id})
@@ -0,0 +1,46 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Generic, List, Sequence, TypeVar
+
+from fastapi import Query
+from pydantic import BaseModel
+
+from app.exceptions import InvalidCursorException
+
+T = TypeVar('T')
+
+
+class CursorParams(BaseModel):
+    cursor: str | None = None
+    size: int = 50
+    include_total: bool = False
+
+
+def get_cursor_params(cursor: str | None = None,
+                      size: int = Query(50, ge=1, le=100),
+                      include_total: bool = False) -> CursorParams:
+    return CursorParams(cursor=cursor, size=size, include_total=include_total)
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: str | None = None
+    total: int | None = None
+
+
+def encode_cursor(values: Sequence) -> str:
+    data = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def decode_cursor(cursor: str, python_types: Sequence[type]) -> list:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(data, list) or len(data) != len(python_types):
+            raise InvalidCursorException
+        return [datetime.fromisoformat(value) if python_type is datetime else python_type(value)
+                for value, python_type in zip(data, python_types)]
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise InvalidCursorException
@@ -0,0 +1,37 @@
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class MeasuredAsyncQueuePool(AsyncAdaptedQueuePool):
+    # Пул с учетом времени ожидания соединения, для подбора размера пула под max_connections.
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def _do_get(self):
+        started: float = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            wait_seconds: float = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def get_metrics(self) -> dict:
+        return {
+            'size': self.size(),
+            'checked_in': self.checkedin(),
+            'checked_out': self.checkedout(),
+            'overflow': self.overflow(),
+            'checkouts': self.checkouts,
+            'timeouts': self.timeouts,
+            'wait_seconds_avg': self.wait_seconds_total / self.checkouts if self.checkouts else 0.0,
+            'wait_seconds_max': self.wait_seconds_max,
+        }
@@ -1,30 +1,81 @@
-from typing import Sequence
+from typing import Sequence, Callable, Hashable, Any
 
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import Select, select, Result, Insert, insert, Update, update, Delete, delete
+from sqlalchemy import (Select, select, Result, Insert, insert, Update, update, Delete, delete, func, tuple_,
+                        bindparam, any_, Executable)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import IntegrityError, InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
 from app.database.exceptions import ExceptionsDatabase, integrity_error_handling
+from app.database.pagination import CursorParams, CursorPage, encode_cursor, decode_cursor
+from app.database.tombstones import Tombstones
+from app.database.unit_of_work import commit
 from app.exceptions import (ObjectNotFoundException, UnhandledException, DatabaseQueryErrorException)
 
 
+# Заранее собранные запросы фиксированной формы: ключ кэша скомпилированных запросов SQLAlchemy
+# вычисляется один раз, а одинаковый SQL переиспользует подготовленный запрос asyncpg.
+statements_cache: dict[Hashable, Executable] = {}
+
+
 class DatabaseService:
     model = None
+    # Имя сущности в tombstones для /sync/, если удаления нужно передавать клиентам.
+    tombstone_entity: str | None = None
+
+    @classmethod
+    def get_statement(cls, key: Hashable, factory: Callable[[], Executable]) -> Executable:
+        statement: Executable | None = statements_cache.get((cls.model, key))
+        if statement is None:
+            statement = statements_cache[(cls.model, key)] = factory()
+        return statement
 
     @classmethod
-    async def get_list(cls, session: AsyncSession, is_paginate: bool = False, options: list = [], **filters):
+    def get_filters_clauses(cls, filters: dict) -> list:
+        return [getattr(cls.model, key) == bindparam(f'filter_{key}') for key in sorted(filters)]
+
+    @classmethod
+    async def get_list(cls, session: AsyncSession, is_paginate: bool = False, options: list = [],
+                       cursor_params: CursorParams | None = None, cursor_keys: tuple[str, ...] = ('id',), **filters):
         query: Select = (
             select(cls.model)
             .filter_by(**filters)
             .options(*options)
         )
+        if cursor_params:
+            return await cls.get_cursor_page(session, query, cursor_params, cursor_keys, filters)
         if is_paginate:
             return await paginate(session, query)
         result: Result[tuple[cls.model]] = await session.execute(query)
         data: Sequence[cls.model] = result.scalars().all()
         return data
 
+    @classmethod
+    async def get_cursor_page(cls, session: AsyncSession,
+                              query: Select,
+                              params: CursorParams,
+                              cursor_keys: tuple[str, ...],
+                              filters: dict) -> CursorPage:
+        # Keyset-пагинация: страница по индексу с условием (keys) > cursor, без OFFSET и без COUNT(*).
+        columns = [getattr(cls.model, key) for key in cursor_keys]
+        query = query.order_by(*columns).limit(params.size + 1)
+        if params.cursor:
+            values: list = decode_cursor(params.cursor, [column.type.python_type for column in columns])
+            query = query.where(tuple_(*columns) > tuple_(*values))
+        result: Result[tuple[cls.model]] = await session.execute(query)
+        items: list = list(result.unique().scalars().all())
+
+        next_cursor: str | None = None
+        if len(items) > params.size:
+            items = items[:params.size]
+            next_cursor = encode_cursor([getattr(items[-1], key) for key in cursor_keys])
+        total: int | None = None
+        if params.include_total:
+            total = await session.scalar(select(func.count()).select_from(cls.model).filter_by(**filters))
+        return CursorPage(items=items, next_cursor=next_cursor, total=total)
+
     @classmethod
     async def get_detail(cls, session: AsyncSession, options: list = [], is_none=False, **filters):
         try:
@@ -57,7 +108,7 @@ class DatabaseService:
                 .options(*options)
             )
             result: Result[cls.model] = await session.execute(stmt)
-            await session.commit()
+            await commit(session)
             return result.scalar_one_or_none()
         except IntegrityError as err:
             raise integrity_error_handling(err, exceptions)
@@ -82,7 +133,7 @@ class DatabaseService:
                 .options(*options)
             )
             result: Result[cls.model] = await session.execute(stmt)
-            await session.commit()
+            await commit(session)
             data = result.scalar_one_or_none()
             if not data:
                 if exceptions.object_not_found:
@@ -104,10 +155,124 @@ class DatabaseService:
                 delete(cls.model)
                 .filter_by(**filters)
             )
-            await session.execute(stmt)
-            await session.commit()
+            if cls.tombstone_entity:
+                stmt = stmt.returning(cls.model.id, cls.model.user_id)
+            result: Result = await session.execute(stmt)
+            if cls.tombstone_entity:
+                await cls.add_tombstones(session, result.all())
+            await commit(session)
         except InvalidRequestError as err:
             raise DatabaseQueryErrorException
         except Exception as err:
             print(err)
             raise UnhandledException
+
+    @classmethod
+    async def add_tombstones(cls, session: AsyncSession, rows: Sequence[tuple[int, int]]) -> None:
+        if rows:
+            await session.execute(insert(Tombstones),
+                                  [{'user_id': user_id, 'entity': cls.tombstone_entity, 'object_id': object_id}
+                                   for object_id, user_id in rows])
+
+    @classmethod
+    async def touch_related(cls, session: AsyncSession, relationship: InstrumentedAttribute, **filters) -> None:
+        # Связанные записи включают эту в свой ответ, поэтому их updated (ETag, Last-Modified) тоже меняется.
+        model = relationship.property.mapper.class_
+        stmt: Update = (
+            update(model)
+            .filter_by(**filters)
+            .values(updated=func.timezone('utc', func.now()))
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(stmt)
+
+    @classmethod
+    async def create_many(cls,
+                          session: AsyncSession,
+                          rows: list[dict[str, Any]],
+                          exceptions: ExceptionsDatabase = ExceptionsDatabase()) -> list:
+        # INSERT ... VALUES (...), (...) RETURNING пачками insertmanyvalues, одна транзакция.
+        if not rows:
+            return []
+        try:
+            stmt: Insert = cls.get_statement('create_many', lambda: insert(cls.model).returning(cls.model))
+            result = await session.scalars(stmt, rows)
+            data: list = list(result.all())
+            await commit(session)
+            return data
+        except IntegrityError as err:
+            raise integrity_error_handling(err, exceptions)
+        except InvalidRequestError as err:
+            raise DatabaseQueryErrorException
+        except Exception as err:
+            raise UnhandledException
+
+    @classmethod
+    async def update_many(cls,
+                          session: AsyncSession,
+                          rows: list[dict[str, Any]],
+                          filters: dict,
+                          exceptions: ExceptionsDatabase = ExceptionsDatabase()) -> list:
+        # UPDATE ... FROM unnest(массивы значений) RETURNING: форма запроса не зависит от количества строк.
+        if not rows:
+            return []
+        keys: tuple[str, ...] = tuple(key for key in rows[0] if key != 'id')
+
+        def factory() -> Update:
+            table = cls.model.__table__
+            data = (
+                func.unnest(*[bindparam(key, type_=ARRAY(table.c[key].type)) for key in ('id', *keys)])
+                .table_valued(*('id', *keys))
+                .render_derived(name='data')
+            )
+            return (
+                update(cls.model)
+                .where(cls.model.id == data.c.id, *cls.get_filters_clauses(filters))
+                .values({key: data.c[key] for key in keys})
+                .returning(cls.model)
+                .execution_options(synchronize_session=False)
+            )
+
+        params: dict = {key: [row[key] for row in rows] for key in ('id', *keys)}
+        params.update({f'filter_{key}': value for key, value in filters.items()})
+        try:
+            stmt: Update = cls.get_statement(('update_many', keys, tuple(sorted(filters))), factory)
+            result = await session.scalars(stmt, params)
+            data: list = list(result.all())
+            await commit(session)
+            return data
+        except IntegrityError as err:
+            raise integrity_error_handling(err, exceptions)
+        except InvalidRequestError as err:
+            raise DatabaseQueryErrorException
+        except Exception as err:
+            raise UnhandledException
+
+    @classmethod
+    async def delete_many(cls, session: AsyncSession, ids: list[int], filters: dict) -> list[int]:
+        if not ids:
+            return []
+
+        returning = (cls.model.id, cls.model.user_id) if cls.tombstone_entity else (cls.model.id,)
+
+        def factory() -> Delete:
+            return (
+                delete(cls.model)
+                .where(cls.model.id == any_(bindparam('ids', type_=ARRAY(cls.model.id.type))),
+                       *cls.get_filters_clauses(filters))
+                .returning(*returning)
+            )
+
+        params: dict = {'ids': ids, **{f'filter_{key}': value for key, value in filters.items()}}
+        try:
+            stmt: Delete = cls.get_statement(('delete_many', tuple(sorted(filters))), factory)
+            result: Result = await session.execute(stmt, params)
+            rows = result.all()
+            if cls.tombstone_entity:
+                await cls.add_tombstones(session, rows)
+            await commit(session)
+            return [row[0] for row in rows]
+        except InvalidRequestError as err:
+            raise DatabaseQueryErrorException
+        except Exception as err:
+            raise UnhandledException
@@ -1,26 +1,124 @@
-from typing import AsyncGenerator
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
 
 from sqlalchemy import MetaData
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, declared_attr
+from sqlalchemy.pool import NullPool
 
+from app.database.pool import MeasuredAsyncQueuePool
+from app.database.unit_of_work import UNIT_OF_WORK, run_on_commit
+from app.metrics import register_metrics
 from app.settings import settings
 from app.utils import camel_case_to_snake_case
 
 
+def get_engine_options(pool_settings: dict) -> dict:
+    connect_args: dict = {
+        'statement_cache_size': pool_settings['STATEMENT_CACHE_SIZE'],
+        'prepared_statement_cache_size': pool_settings['STATEMENT_CACHE_SIZE'],
+        'server_settings': settings.database.SERVER_SETTINGS,
+    }
+    if pool_settings['POOL_MODE'] == 'null':
+        return {'poolclass': NullPool, 'connect_args': connect_args,
+                'query_cache_size': settings.database.QUERY_CACHE_SIZE}
+    return {
+        'query_cache_size': settings.database.QUERY_CACHE_SIZE,
+        'poolclass': MeasuredAsyncQueuePool,
+        'pool_size': pool_settings['POOL_SIZE'],
+        'max_overflow': pool_settings['MAX_OVERFLOW'],
+        'pool_timeout': pool_settings['POOL_TIMEOUT'],
+        'pool_pre_ping': pool_settings['POOL_PRE_PING'],
+        'pool_recycle': pool_settings['POOL_RECYCLE'],
+        'connect_args': connect_args,
+    }
+
+
 class DatabaseSettings:
     def __init__(self, echo=settings.database.ENGINE_ECHO):
-        self.engine = create_async_engine(
+        self.pool_settings: dict = settings.database.get_pool_settings(settings.VERSION)
+        self.engine = self.create_engine(
             settings.POSTGRES_URL if settings.VERSION == 'PROD' else settings.database.POSTGRES_URL, echo=echo
         )
         self.session = async_sessionmaker(self.engine, expire_on_commit=False, autoflush=False)
+        register_metrics('database_pool', self.get_pool_metrics)
+
+        self.replica_engines: list[AsyncEngine] = [self.create_engine(url) for url in settings.database.REPLICA_URLS]
+        self.replicas: list[async_sessionmaker] = [
+            async_sessionmaker(engine, expire_on_commit=False, autoflush=False) for engine in self.replica_engines
+        ]
+        self.replicas_unhealthy_until: list[float] = [0.0] * len(self.replicas)
+        self.replicas_order = itertools.cycle(range(len(self.replicas)))
+        self.replicas_fallbacks: int = 0
+        if self.replicas:
+            register_metrics('database_replicas', self.get_replicas_metrics)
+
+    def create_engine(self, url: str, echo: bool = False) -> AsyncEngine:
+        return create_async_engine(url, echo=echo, **get_engine_options(self.pool_settings))
+
+    def get_pool_metrics(self) -> dict:
+        pool = self.engine.pool
+        if isinstance(pool, MeasuredAsyncQueuePool):
+            return pool.get_metrics()
+        return {'mode': self.pool_settings['POOL_MODE']}
 
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
         async with self.session() as session_db:
             yield session_db
 
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncSession]:
+        # Unit of work: сервисы делают flush, один commit в конце блока, при исключении - откат.
+        # Колбэки on_commit выполняются после фиксации.
+        async with self.session() as session_db:
+            session_db.info[UNIT_OF_WORK] = True
+            async with session_db.begin():
+                yield session_db
+            await run_on_commit(session_db)
+
+    async def get_transaction_session(self) -> AsyncGenerator[AsyncSession, None]:
+        async with self.transaction() as session_db:
+            yield session_db
+
+    async def open_read_session(self) -> AsyncSession:
+        # Реплики по кругу, пропуская недоступные; если доступных нет - основная база.
+        for _ in range(len(self.replicas)):
+            index: int = next(self.replicas_order)
+            if self.replicas_unhealthy_until[index] > time.monotonic():
+                continue
+            session_db: AsyncSession = self.replicas[index]()
+            try:
+                async with asyncio.timeout(settings.database.REPLICA_CONNECT_TIMEOUT):
+                    await session_db.connection()
+            except (SQLAlchemyError, OSError, TimeoutError):
+                await session_db.close()
+                self.replicas_unhealthy_until[index] = time.monotonic() + settings.database.REPLICA_RETRY_SECONDS
+                continue
+            return session_db
+        if self.replicas:
+            self.replicas_fallbacks += 1
+        return self.session()
+
+    async def get_read_session(self) -> AsyncGenerator[AsyncSession, None]:
+        async with await self.open_read_session() as session_db:
+            yield session_db
+
+    def get_replicas_metrics(self) -> dict:
+        now: float = time.monotonic()
+        return {
+            'replicas': len(self.replicas),
+            'healthy': sum(1 for unhealthy_until in self.replicas_unhealthy_until if unhealthy_until <= now),
+            'primary_fallbacks': self.replicas_fallbacks,
+        }
+
     async def dispose(self):  # Завершение.
         await self.engine.dispose()
+        for engine in self.replica_engines:
+            await engine.dispose()
 
 
 class Base(DeclarativeBase):
@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import String, Integer, ForeignKey, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.settings import Base
+
+
+class Tombstones(Base):
+    # Удаленные записи для /sync/: клиент узнает об удалении без полной выгрузки.
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    entity: Mapped[str] = mapped_column(String(31), nullable=False)
+    object_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    deleted: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"))
+
+    __table_args__ = (Index('ix_tombstones_user_id_deleted', 'user_id', 'deleted'),)
+
+    def __str__(self):
+        return f'<Tombstones {self.id}: {self.entity}-{self.object_id}/>'
@@ -0,0 +1,31 @@
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+UNIT_OF_WORK = 'unit_of_work'
+ON_COMMIT = 'on_commit'
+
+
+def is_unit_of_work(session: AsyncSession) -> bool:
+    return bool(session.info.get(UNIT_OF_WORK))
+
+
+async def commit(session: AsyncSession) -> None:
+    # В unit of work только flush: транзакцию фиксирует db_settings.transaction в конце блока.
+    if is_unit_of_work(session):
+        await session.flush()
+    else:
+        await session.commit()
+
+
+async def on_commit(session: AsyncSession, callback: Callable[[], Awaitable]) -> None:
+    # Побочные действия (сброс кэша) - только после фиксации транзакции.
+    if is_unit_of_work(session):
+        session.info.setdefault(ON_COMMIT, []).append(callback)
+    else:
+        await callback()
+
+
+async def run_on_commit(session: AsyncSession) -> None:
+    for callback in session.info.pop(ON_COMMIT, []):
+        await callback()
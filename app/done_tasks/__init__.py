@@ -1,7 +1,8 @@
 __all__ = (
     'DoneTasks',
+    'TaskMonthlyStats',
     'router'
 )
 
-from app.done_tasks.models import DoneTasks
-from app.done_tasks.routers import router
\ No newline at end of file
+from app.done_tasks.models import DoneTasks, TaskMonthlyStats
+from app.done_tasks.routers import router
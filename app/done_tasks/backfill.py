@@ -0,0 +1,30 @@
+"""
+Пересчет таблицы task_monthly_stats по done_tasks.
+
+> python -m app.done_tasks.backfill [--user-id ID]
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select
+
+from app.database.settings import db_settings
+from app.done_tasks import DoneTasks
+from app.done_tasks.services import TaskMonthlyStatsService
+from app.tasks import Tasks
+
+
+async def backfill_task_monthly_stats(user_id: int | None = None) -> None:
+    filters = []
+    if user_id:
+        filters.append(DoneTasks.task_id.in_(select(Tasks.id).where(Tasks.user_id == user_id)))
+    async with db_settings.session() as session:
+        await TaskMonthlyStatsService.refresh(session, filters)
+    await db_settings.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Backfill task_monthly_stats from done_tasks.')
+    parser.add_argument('--user-id', type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(backfill_task_monthly_stats(args.user_id))
@@ -1,7 +1,7 @@
 from datetime import date, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer, Date, Boolean, text, UniqueConstraint
+from sqlalchemy import ForeignKey, Integer, Date, Boolean, text, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.settings import Base
@@ -18,7 +18,24 @@ class DoneTasks(Base):
 
     task: Mapped['Tasks'] = relationship(back_populates='done_tasks')
 
-    __table_args__ = (UniqueConstraint('task_id', 'date', name='uq_task_id_date'),)
+    __table_args__ = (
+        UniqueConstraint('task_id', 'date', name='uq_task_id_date'),
+        # Покрывающий индекс: выборки по task_id и диапазону дат читают is_done и quantity без обращения к таблице.
+        Index('ix_done_tasks_task_id_date', 'task_id', 'date', postgresql_include=['is_done', 'quantity']),
+        Index('ix_done_tasks_task_id_updated', 'task_id', 'updated'),
+    )
 
     def __str__(self):
         return f'<DoneTasks {self.id}: {self.task_id}-{self.date}/>'
+
+
+class TaskMonthlyStats(Base):
+    task_id: Mapped[int] = mapped_column(ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False)
+    month: Mapped[date] = mapped_column(Date, nullable=False)
+    done_count: Mapped[int] = mapped_column(Integer, default=0)
+    quantity_sum: Mapped[int] = mapped_column(Integer, default=0)
+
+    __table_args__ = (UniqueConstraint('task_id', 'month', name='uq_task_id_month'),)
+
+    def __str__(self):
+        return f'<TaskMonthlyStats {self.id}: {self.task_id}-{self.month}/>'
@@ -1,14 +1,16 @@
 from datetime import date
 from typing import Annotated, Dict, List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.settings import db_settings
-from app.done_tasks.schemas import EditDoneTaskSchema, DoneTasksListSchema
+from app.done_tasks.schemas import (EditDoneTaskSchema, DoneTasksListSchema, BulkEditDoneTaskSchema,
+                                    BulkEditDoneTaskResultSchema)
 from app.done_tasks.services import DoneTaskService
 from app.users.schemas import UserReadSchema
 from app.users.services import UserService
+from app.utils import get_conditional_headers, is_not_modified
 
 router = APIRouter(
     prefix='/list-tasks',
@@ -17,21 +19,36 @@ router = APIRouter(
 
 
 @router.post('/edit/')
-async def edit_task(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def edit_task(session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
                     user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
                     data: EditDoneTaskSchema):
     return await DoneTaskService.done_task_edit(session, user, data)
 
 
+@router.post('/edit/bulk/', response_model=List[BulkEditDoneTaskResultSchema])
+async def edit_tasks_bulk(session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
+                          user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
+                          data: BulkEditDoneTaskSchema):
+    return await DoneTaskService.done_tasks_bulk_edit(session, user, data.items)
+
+
 @router.get('/detail/{done_task_id}/')
-async def detail(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def detail(request: Request,
+                 response: Response,
+                 session: Annotated[AsyncSession, Depends(db_settings.get_read_session)],
                  user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
                  done_task_id: int):
+    validators = await DoneTaskService.done_task_detail_validators(session, user, done_task_id)
+    if validators:
+        headers: dict[str, str] = get_conditional_headers(*validators)
+        if is_not_modified(request.headers, *validators):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
     return await DoneTaskService.done_task_detail(session, user, done_task_id)
 
 
 @router.get('/list/tasks/', response_model=Dict[date, List[DoneTasksListSchema]])
-async def scheduler_tasks(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def scheduler_tasks(session: Annotated[AsyncSession, Depends(db_settings.get_read_session)],
                           user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
                           task_id: int = None, category_id: int = None, is_done: bool = None,
                           date_start: date = None, date_end: date = None):
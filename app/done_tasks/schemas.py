@@ -1,6 +1,7 @@
 from datetime import date, datetime
+from typing import List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.categories.schemas import CategoryDetailSchema
 from app.tasks.schemas import TaskDetailSchema
@@ -16,6 +17,17 @@ class EditDoneTaskSchema(BaseDoneTaskSchema):
     task_id: int
 
 
+class BulkEditDoneTaskSchema(BaseModel):
+    items: List[EditDoneTaskSchema] = Field(min_length=1, max_length=1000)
+
+
+class BulkEditDoneTaskResultSchema(BaseModel):
+    task_id: int
+    date: date
+    id: int | None = None
+    detail: dict
+
+
 class DoneTasksDetail(BaseDoneTaskSchema):
     date: date
     update: datetime
@@ -1,23 +1,33 @@
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from typing import List
 
-from sqlalchemy import Select, select, Result
+from sqlalchemy import Select, select, Result, func, cast, Date, and_, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
 
-from app.database.exceptions import ExceptionsDatabase
+from app.cache.reports import bump_reports_version
+from app.database.exceptions import ExceptionsDatabase, integrity_error_handling
 from app.database.services import DatabaseService
-from app.done_tasks import DoneTasks
-from app.done_tasks.schemas import EditDoneTaskSchema
+from app.database.unit_of_work import commit, on_commit
+from app.done_tasks import DoneTasks, TaskMonthlyStats
+from app.done_tasks.schemas import EditDoneTaskSchema, BulkEditDoneTaskResultSchema
+from app.done_tasks.utils import expand_calendar, occurrences_calendar
 from app.exceptions import (InvalidTaskIdException,
                             NotAccordingToScheduleException,
                             QuantityCannotNegativeException,
                             DoneTaskAlreadyExistsException, ObjectNotFoundException, DatesIncorrectException,
-                            NotTasksFoundByDateException
+                            NotTasksFoundByDateException, DoneTaskDuplicatedException
                             )
-from app.tasks import Tasks
+from app.schedulers import Schedulers
+from app.schedulers.recurrence import Recurrence, RECURRENCE_FIELDS, get_recurrence
+from app.schedulers.utils import WEEK_DAYS
+from app.settings import settings
+from app.tasks import Tasks, TaskOccurrences
 from app.tasks.services import TaskService
 from app.users.schemas import UserReadSchema
+from app.utils import make_etag
 
 
 class DoneTaskService(DatabaseService):
@@ -41,16 +51,17 @@ class DoneTaskService(DatabaseService):
         options = [
             selectinload(cls.model.task).options(selectinload(Tasks.category), selectinload(Tasks.scheduler))
         ]
-        return await cls.update(session, filters={'id': done_task_db.id}, options=options, **data.model_dump())
+        done_task = await cls.update(session, filters={'id': done_task_db.id}, options=options, **data.model_dump())
+        await TaskMonthlyStatsService.refresh_month(session, done_task.task_id, done_task.date)
+        await on_commit(session, lambda: bump_reports_version(user.id))
+        return done_task
 
     @classmethod
     async def done_task_create(cls, session: AsyncSession, user: UserReadSchema, data: EditDoneTaskSchema):
         task_db: Tasks | None = await TaskService.task_detail(session, user, data.task_id)
         if not task_db:
             raise InvalidTaskIdException
-        day_week: str = data.date.strftime("%A").lower()
-        allowed_day: bool = task_db.scheduler.__dict__.get(day_week)
-        if not allowed_day:
+        if not get_recurrence(task_db.scheduler, task_db.start_date).occurs_on(data.date):
             raise NotAccordingToScheduleException
         quantity: int = data.quantity
         if quantity and quantity < 0:
@@ -59,7 +70,81 @@ class DoneTaskService(DatabaseService):
             selectinload(cls.model.task).options(selectinload(Tasks.category), selectinload(Tasks.scheduler))
         ]
         exceptions = ExceptionsDatabase(unique_error=DoneTaskAlreadyExistsException)
-        return await cls.create(session, options=options, exceptions=exceptions, **data.model_dump())
+        done_task = await cls.create(session, options=options, exceptions=exceptions, **data.model_dump())
+        await TaskMonthlyStatsService.refresh_month(session, done_task.task_id, done_task.date)
+        await on_commit(session, lambda: bump_reports_version(user.id))
+        return done_task
+
+    @classmethod
+    async def done_tasks_bulk_edit(cls, session: AsyncSession,
+                                   user: UserReadSchema,
+                                   items: List[EditDoneTaskSchema]) -> List[BulkEditDoneTaskResultSchema]:
+        query_tasks: Select = (
+            select(Tasks.id,
+                   Tasks.start_date,
+                   *[getattr(Schedulers, field) for field in (*WEEK_DAYS, *RECURRENCE_FIELDS)])
+            .outerjoin(Schedulers, Tasks.scheduler_id == Schedulers.id)
+            .where(Tasks.user_id == user.id, Tasks.id.in_(list({item.task_id for item in items})))
+        )
+        tasks_result: Result = await session.execute(query_tasks)
+        tasks_rules: dict[int, Recurrence] = {row.id: get_recurrence(row, row.start_date) for row in tasks_result}
+
+        results: List[BulkEditDoneTaskResultSchema] = []
+        accepted: List[BulkEditDoneTaskResultSchema] = []
+        values: dict[tuple[int, date], dict] = {}
+        for item in items:
+            result = BulkEditDoneTaskResultSchema(task_id=item.task_id, date=item.date, detail={'code': 'success'})
+            results.append(result)
+            if item.task_id not in tasks_rules:
+                result.detail = InvalidTaskIdException.detail
+            elif not tasks_rules[item.task_id].occurs_on(item.date):
+                result.detail = NotAccordingToScheduleException.detail
+            elif item.quantity and item.quantity < 0:
+                result.detail = QuantityCannotNegativeException.detail
+            elif (item.task_id, item.date) in values:
+                result.detail = DoneTaskDuplicatedException.detail
+            else:
+                values[(item.task_id, item.date)] = item.model_dump()
+                accepted.append(result)
+        if not values:
+            return results
+
+        try:
+            stmt = pg_insert(cls.model).values(list(values.values()))
+            stmt = (
+                stmt.on_conflict_do_update(constraint='uq_task_id_date',
+                                           set_={'quantity': stmt.excluded.quantity,
+                                                 'is_done': stmt.excluded.is_done,
+                                                 'updated': func.timezone('utc', func.now())})
+                .returning(cls.model.id, cls.model.task_id, cls.model.date)
+            )
+            done_tasks_result: Result = await session.execute(stmt)
+        except IntegrityError as err:
+            raise integrity_error_handling(err, ExceptionsDatabase())
+        done_tasks_ids: dict[tuple[int, date], int] = {
+            (row.task_id, row.date): row.id for row in done_tasks_result
+        }
+        await TaskMonthlyStatsService.refresh_task_months(session,
+                                                          {(task_id, day.replace(day=1)) for task_id, day in values})
+        await on_commit(session, lambda: bump_reports_version(user.id))
+        for result in accepted:
+            result.id = done_tasks_ids.get((result.task_id, result.date))
+        return results
+
+    @classmethod
+    async def done_task_detail_validators(cls, session: AsyncSession,
+                                          user: UserReadSchema,
+                                          done_task_id: int) -> tuple[str, datetime] | None:
+        query: Select = (
+            select(cls.model.updated, Tasks.updated)
+            .join(Tasks, Tasks.id == cls.model.task_id)
+            .where(cls.model.id == done_task_id, Tasks.user_id == user.id)
+        )
+        row = (await session.execute(query)).one_or_none()
+        if row is None:
+            return None
+        last_modified: datetime = max(row)
+        return make_etag('done_task', done_task_id, *row), last_modified
 
     @classmethod
     async def done_task_detail(cls, session: AsyncSession, user: UserReadSchema, done_task_id: int):
@@ -122,6 +207,14 @@ class DoneTaskService(DatabaseService):
         if not tasks_db:
             raise NotTasksFoundByDateException(*not_task_found_args)
 
+        if date_start and date_end:
+            current_date: date = date_start
+        else:
+            current_date = current_date
+            date_end = current_date
+        if settings.occurrences.ENABLED:
+            return await cls.get_occurrences_calendar(session, tasks_db, current_date, date_end, is_done)
+
         allowed_tasks_ids: List[int] = [el.id for el in tasks_db]
         query_done_tasks: Select = (
             select(cls.model)
@@ -129,45 +222,67 @@ class DoneTaskService(DatabaseService):
         )
         done_tasks_result: Result[tuple[DoneTasks]] = await session.execute(query_done_tasks)
         done_tasks_db = done_tasks_result.scalars().all()
+        return expand_calendar(tasks_db, done_tasks_db, current_date, date_end, is_done)
 
-        if date_start and date_end:
-            current_date: date = date_start
-        else:
-            current_date = current_date
-            date_end = current_date
-        tasks = {}
-        while current_date <= date_end:
-            day_week: str = current_date.strftime("%A").lower()
-            tasks_in_date = []
-            tasks[current_date] = tasks_in_date
-            for task in tasks_db:
-                allowed_day: bool = task.scheduler.__dict__.get(day_week)
-                if allowed_day:
-                    tasks_in_date.append({'task': task, 'done': {}})
-            tasks[current_date] = tasks_in_date
-            current_date += timedelta(days=1)
-
-        for done_task in done_tasks_db:
-            find_task = tasks.get(done_task.date)
-            if find_task:
-                for el in tasks[done_task.date]:
-                    if el['task'].id == done_task.task_id:
-                        el['done'] = done_task.__dict__
-        is_done_tasks = tasks.copy()
-        if is_done:
-            tasks = {}
-            for key, items in is_done_tasks.items():
-                tasks_in_date = []
-                for item in items:
-                    if item['done'].get('is_done'):
-                        tasks_in_date.append(item)
-                        tasks[key] = tasks_in_date
-        if not is_done and not is_done is None:
-            tasks = {}
-            for key, items in is_done_tasks.items():
-                tasks_in_date = []
-                for item in items:
-                    if not item['done'].get('is_done'):
-                        tasks_in_date.append(item)
-                        tasks[key] = tasks_in_date
-        return tasks
+    @classmethod
+    async def get_occurrences_calendar(cls, session: AsyncSession,
+                                       tasks_db,
+                                       date_start: date,
+                                       date_end: date,
+                                       is_done: bool | None):
+        # Даты задач из task_occurrences, выполнение - соединением с done_tasks по (task_id, date).
+        query_filter = [TaskOccurrences.task_id.in_([task.id for task in tasks_db]),
+                        TaskOccurrences.date >= date_start,
+                        TaskOccurrences.date <= date_end]
+        if is_done is not None:
+            query_filter.append(func.coalesce(cls.model.is_done, False) == is_done)
+        query: Select = (
+            select(TaskOccurrences.task_id, TaskOccurrences.date, cls.model)
+            .outerjoin(cls.model, and_(cls.model.task_id == TaskOccurrences.task_id,
+                                       cls.model.date == TaskOccurrences.date))
+            .where(*query_filter)
+            .order_by(TaskOccurrences.date, TaskOccurrences.task_id)
+        )
+        result: Result[tuple[int, date, DoneTasks | None]] = await session.execute(query)
+        return occurrences_calendar(tasks_db, result.all(), date_start, date_end, is_done)
+
+
+class TaskMonthlyStatsService(DatabaseService):
+    model = TaskMonthlyStats
+
+    @classmethod
+    async def refresh(cls, session: AsyncSession, filters: list):
+        month = cast(func.date_trunc('month', DoneTasks.date), Date)
+        query_stats: Select = (
+            select(DoneTasks.task_id,
+                   month,
+                   func.count(DoneTasks.id).filter(DoneTasks.is_done == True),
+                   func.coalesce(func.sum(DoneTasks.quantity), 0))
+            .where(*filters)
+            .group_by(DoneTasks.task_id, month)
+        )
+        stmt = pg_insert(cls.model).from_select(['task_id', 'month', 'done_count', 'quantity_sum'], query_stats)
+        stmt = stmt.on_conflict_do_update(constraint='uq_task_id_month',
+                                          set_={'done_count': stmt.excluded.done_count,
+                                                'quantity_sum': stmt.excluded.quantity_sum})
+        await session.execute(stmt)
+        await commit(session)
+
+    @classmethod
+    async def refresh_month(cls, session: AsyncSession, task_id: int, day: date):
+        await cls.refresh_months(session, [task_id], day, day)
+
+    @classmethod
+    async def refresh_months(cls, session: AsyncSession, task_ids: List[int], date_from: date, date_to: date):
+        month_start: date = date_from.replace(day=1)
+        next_month_start: date = (date_to.replace(day=1) + timedelta(days=32)).replace(day=1)
+        filters = [DoneTasks.task_id.in_(task_ids), DoneTasks.date >= month_start, DoneTasks.date < next_month_start]
+        await cls.refresh(session, filters)
+
+    @classmethod
+    async def refresh_task_months(cls, session: AsyncSession, task_months: set[tuple[int, date]]):
+        # Только затронутые пары (задача, первый день месяца), без месяцев между ними.
+        month = cast(func.date_trunc('month', DoneTasks.date), Date)
+        filters = [DoneTasks.task_id.in_({task_id for task_id, _ in task_months}),
+                   tuple_(DoneTasks.task_id, month).in_(list(task_months))]
+        await cls.refresh(session, filters)
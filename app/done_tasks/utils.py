@@ -0,0 +1,43 @@
+from datetime import date, timedelta
+
+from app.schedulers.recurrence import get_recurrence
+
+
+def expand_calendar(tasks_db, done_tasks_db, date_start: date, date_end: date, is_done: bool | None = None):
+    done_tasks_index: dict[tuple[int, date], dict] = {
+        (done_task.task_id, done_task.date): done_task.__dict__ for done_task in done_tasks_db
+    }
+    # Еженедельные правила без исключений раскладываются по дням недели, остальные проверяются по дням.
+    tasks_rules = [(task, get_recurrence(task.scheduler, task.start_date)) for task in tasks_db]
+    weekly_rules = [(task, rule) for task, rule in tasks_rules if rule.frequency == 'weekly' and not rule.exdates]
+    other_rules = [(task, rule) for task, rule in tasks_rules if rule.frequency != 'weekly' or rule.exdates]
+    tasks_by_weekday = [[task for task, rule in weekly_rules if rule.mask >> weekday & 1] for weekday in range(7)]
+
+    tasks = {}
+    weekday_start: int = date_start.weekday()
+    for offset in range((date_end - date_start).days + 1):
+        current_date: date = date_start + timedelta(days=offset)
+        tasks_in_date = []
+        day_tasks = tasks_by_weekday[(weekday_start + offset) % 7]
+        if other_rules:
+            day_tasks = day_tasks + [task for task, rule in other_rules if rule.occurs_on(current_date)]
+        for task in day_tasks:
+            done: dict = done_tasks_index.get((task.id, current_date), {})
+            if is_done is not None and bool(done.get('is_done')) != is_done:
+                continue
+            tasks_in_date.append({'task': task, 'done': done})
+        if tasks_in_date or is_done is None:
+            tasks[current_date] = tasks_in_date
+    return tasks
+
+
+def occurrences_calendar(tasks_db, occurrences, date_start: date, date_end: date, is_done: bool | None = None):
+    # occurrences - строки (task_id, date, DoneTasks | None), отсортированные по дате.
+    tasks_index = {task.id: task for task in tasks_db}
+    tasks = {}
+    if is_done is None:
+        tasks = {date_start + timedelta(days=offset): [] for offset in range((date_end - date_start).days + 1)}
+    for task_id, current_date, done_task in occurrences:
+        done: dict = done_task.__dict__ if done_task is not None else {}
+        tasks.setdefault(current_date, []).append({'task': tasks_index[task_id], 'done': done})
+    return tasks
@@ -38,6 +38,11 @@ ObjectNotFoundException = HTTPException(
     detail={'code': 'exception', 'msg': 'Object not found.'}
 )
 
+InvalidCursorException = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail={'code': 'exception', 'msg': 'Pagination cursor is invalid.'}
+)
+
 # Users
 
 UserAlreadyExistsException = HTTPException(
@@ -95,7 +100,7 @@ FailedDeleteCategoryException = HTTPException(
 # Schedulers
 ScheduleAlreadyExistsException = HTTPException(
     status_code=status.HTTP_409_CONFLICT,
-    detail={'code': 'exception', 'msg': 'A schedule with these days of the week already exists.'}
+    detail={'code': 'exception', 'msg': 'A schedule with this title already exists.'}
 )
 
 ScheduleNotFoundException = HTTPException(
@@ -103,6 +108,11 @@ ScheduleNotFoundException = HTTPException(
     detail={'code': 'exception', 'msg': 'Schedule not found.'}
 )
 
+InvalidScheduleRuleException = lambda msg: HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail={'code': 'exception', 'msg': msg}
+)
+
 # Done Task
 
 InvalidTaskIdException = HTTPException(
@@ -125,6 +135,11 @@ DoneTaskAlreadyExistsException = HTTPException(
     detail={'code': 'exception', 'msg': 'The task already exists.'}
 )
 
+DoneTaskDuplicatedException = HTTPException(
+    status_code=status.HTTP_409_CONFLICT,
+    detail={'code': 'exception', 'msg': 'The task and date are repeated in the request.'}
+)
+
 DatesIncorrectException = HTTPException(
     status_code=status.HTTP_409_CONFLICT,
     detail={'code': 'exception', 'msg': 'The dates are incorrect.'}
@@ -141,3 +156,16 @@ ParamDatesMustBeDefinedException = HTTPException(
     detail={'code': 'exception', 'msg': 'date_from and date_to must be defined'}
 )
 
+
+# Transfer
+ImportDataInvalidException = lambda msg: HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail={'code': 'exception', 'msg': msg}
+)
+
+
+# Metrics
+MetricsTokenInvalidException = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN,
+    detail={'code': 'exception', 'msg': 'Invalid metrics token.'}
+)
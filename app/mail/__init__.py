@@ -1,5 +1,7 @@
 __all__ = (
+    'MailOutbox',
     'router'
 )
 
+from app.mail.models import MailOutbox
 from app.mail.routers import router
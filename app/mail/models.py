@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import String, Integer, Text, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.settings import Base
+
+
+class MailOutbox(Base):
+    recipient: Mapped[str] = mapped_column(String(255), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(String(15), server_default=text("'pending'"))
+    attempts: Mapped[int] = mapped_column(Integer, server_default=text('0'))
+    error: Mapped[str] = mapped_column(Text, nullable=True)
+    next_attempt: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"))
+    created: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"))
+    sent: Mapped[datetime] = mapped_column(nullable=True)
+
+    __table_args__ = (Index('ix_mail_outbox_status_next_attempt', 'status', 'next_attempt'),)
+
+    def __str__(self):
+        return f'<MailOutbox {self.id}: {self.recipient}-{self.status}/>'
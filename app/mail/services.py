@@ -1,13 +1,110 @@
+import asyncio
 import smtplib
 import ssl
+from datetime import datetime, timedelta
+from email import message_from_string, policy
 from email.message import EmailMessage
+from typing import List
 
+from sqlalchemy import Select, select, Result, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.services import DatabaseService
+from app.database.unit_of_work import commit
+from app.mail.models import MailOutbox
 from app.settings import settings
 
 
-def send_mail(template: EmailMessage):
-    context = ssl.create_default_context()
-    with smtplib.SMTP(settings.email.HOST, settings.email.PORT) as server:
-        server.starttls(context=context)
-        server.login(settings.email.LOGIN, settings.email.PASSWORD)
-        server.send_message(template)
+class SMTPConnection:
+    # Одно SMTP-соединение на воркер: STARTTLS и авторизация выполняются один раз, а не на каждое письмо.
+    def __init__(self):
+        self.server: smtplib.SMTP | None = None
+
+    def connect(self) -> None:
+        self.close()
+        server = smtplib.SMTP(settings.email.HOST, settings.email.PORT, timeout=settings.email.TIMEOUT_SECONDS)
+        if settings.email.STARTTLS:
+            server.starttls(context=ssl.create_default_context())
+        if settings.email.AUTH:
+            server.login(settings.email.LOGIN, settings.email.PASSWORD)
+        self.server = server
+
+    def send(self, message: EmailMessage) -> None:
+        if self.server is None:
+            self.connect()
+        try:
+            self.server.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            self.connect()
+            self.server.send_message(message)
+
+    def close(self) -> None:
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            self.server.close()
+        self.server = None
+
+
+class MailOutboxService(DatabaseService):
+    model = MailOutbox
+
+    @classmethod
+    async def enqueue(cls, session: AsyncSession, message: EmailMessage) -> MailOutbox:
+        return await cls.create(session, recipient=message['To'], message=message.as_string())
+
+    @classmethod
+    async def enqueue_many(cls, session: AsyncSession, messages: List[EmailMessage]) -> List[MailOutbox]:
+        return await cls.create_many(session, [{'recipient': message['To'], 'message': message.as_string()}
+                                               for message in messages])
+
+    @classmethod
+    async def send_pending(cls, session: AsyncSession, connection: SMTPConnection) -> int:
+        query: Select = (
+            select(cls.model)
+            .where(cls.model.status == 'pending', cls.model.next_attempt <= func.timezone('utc', func.now()))
+            .order_by(cls.model.id)
+            .limit(settings.email.OUTBOX_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        result: Result[tuple[MailOutbox]] = await session.execute(query)
+        mails: List[MailOutbox] = list(result.scalars().all())
+
+        sent_ids: List[int] = []
+        for mail in mails:
+            message = message_from_string(mail.message, policy=policy.default)
+            try:
+                await asyncio.to_thread(connection.send, message)
+            except (smtplib.SMTPException, OSError) as err:
+                connection.close()
+                await cls.retry_later(session, mail, str(err))
+                continue
+            sent_ids.append(mail.id)
+        if sent_ids:
+            stmt = (
+                update(cls.model)
+                .where(cls.model.id.in_(sent_ids))
+                .values(status='sent', sent=func.timezone('utc', func.now()), error=None)
+            )
+            await session.execute(stmt)
+        await commit(session)
+        return len(mails)
+
+    @classmethod
+    async def retry_later(cls, session: AsyncSession, mail: MailOutbox, error: str) -> None:
+        attempts: int = mail.attempts + 1
+        values = {'attempts': attempts, 'error': error}
+        if attempts >= settings.email.OUTBOX_MAX_ATTEMPTS:
+            values['status'] = 'failed'
+        else:
+            delay = timedelta(seconds=settings.email.OUTBOX_RETRY_SECONDS * 2 ** (attempts - 1))
+            values['next_attempt'] = datetime.utcnow() + delay
+        await session.execute(update(cls.model).where(cls.model.id == mail.id).values(**values))
+
+    @classmethod
+    async def delete_sent(cls, session: AsyncSession, before: datetime) -> int:
+        result = await session.execute(delete(cls.model).where(cls.model.status == 'sent', cls.model.sent < before))
+        await commit(session)
+        return result.rowcount
@@ -1,4 +1,7 @@
+from datetime import date, time
 from email.message import EmailMessage
+from html import escape
+from typing import List
 
 from pydantic import EmailStr
 
@@ -33,4 +36,22 @@ def recovery_password_message(email: EmailStr, username: str, token: str):
             """
 
     template_message.set_content(content, subtype='html')
-    return template_message
\ No newline at end of file
+    return template_message
+
+def task_reminder_message(email: str, username: str, reminders: List[tuple[str, date, time]]):
+    # reminders - (название задачи, дата, время напоминания), одно письмо на пользователя за пачку.
+    template_message = EmailMessage()
+    template_message.add_header('From', settings.email.LOGIN)
+    template_message.add_header('To', email)
+    template_message.add_header('Subject', 'Напоминание о задачах')
+    items = ''.join(f'<li>{day:%d.%m.%Y} {remind_time:%H:%M} - {escape(title)}</li>'
+                    for title, day, remind_time in reminders)
+    content = f"""
+        <h1>Напоминание о задачах: {escape(username)}</h1>
+        <p>Задачи на сайте «{settings.site.NAME}»:</p>
+        <ul>{items}</ul>
+        <p><a href="{settings.site.URL_ADDRESS}list-tasks/"> Отметить выполнение </a></p>
+        """
+
+    template_message.set_content(content, subtype='html')
+    return template_message
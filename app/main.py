@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi_pagination import add_pagination
 
+from app.settings import settings
 from app.mail import router as mail_router
 from app.users import router as user_router
 from app.categories import router as category_router
@@ -8,6 +9,10 @@ from app.schedulers import router as scheduler_router
 from app.tasks import router as task_router
 from app.done_tasks import router as done_tasks_router
 from app.reports import router as report_router
+from app.metrics import router as metrics_router
+from app.transfer import router as transfer_router
+from app.sync import router as sync_router
+from app.tasks_celery import reports  # noqa: F401 - задание подготовки отчетов после изменений
 
 app = FastAPI()
 
@@ -18,5 +23,9 @@ app.include_router(task_router)
 app.include_router(done_tasks_router)
 app.include_router(report_router)
 app.include_router(mail_router)
+app.include_router(transfer_router)
+app.include_router(sync_router)
+if settings.metrics.ENABLED:
+    app.include_router(metrics_router)
 
 add_pagination(app)
@@ -0,0 +1,7 @@
+__all__ = (
+    'register_metrics',
+    'router'
+)
+
+from app.metrics.services import register_metrics
+from app.metrics.routers import router
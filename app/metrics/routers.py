@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+
+from app.metrics.services import get_metrics, check_metrics_token
+
+router = APIRouter(
+    prefix='/metrics',
+    tags=['Metrics'],
+    include_in_schema=False,
+    dependencies=[Depends(check_metrics_token)]
+)
+
+
+@router.get('/')
+async def metrics():
+    return get_metrics()
@@ -0,0 +1,22 @@
+import hmac
+from typing import Annotated, Callable
+
+from fastapi import Header
+
+from app.exceptions import MetricsTokenInvalidException
+from app.settings import settings
+
+metrics_providers: dict[str, Callable[[], dict]] = {}
+
+
+def register_metrics(name: str, provider: Callable[[], dict]) -> None:
+    metrics_providers[name] = provider
+
+
+def get_metrics() -> dict[str, dict]:
+    return {name: provider() for name, provider in metrics_providers.items()}
+
+
+async def check_metrics_token(authorization: Annotated[str | None, Header()] = None) -> None:
+    if settings.metrics.TOKEN and not hmac.compare_digest(authorization or '', f'Bearer {settings.metrics.TOKEN}'):
+        raise MetricsTokenInvalidException
@@ -0,0 +1,5 @@
+__all__ = (
+    'ReminderCursors',
+)
+
+from app.reminders.models import ReminderCursors
\ No newline at end of file
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from sqlalchemy import String, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.settings import Base
+
+
+class ReminderCursors(Base):
+    # Все напоминания со временем до position включительно поставлены в mail_outbox.
+    name: Mapped[str] = mapped_column(String(63), unique=True, nullable=False)
+    position: Mapped[datetime] = mapped_column(nullable=False)
+    updated: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"), onupdate=datetime.utcnow)
+
+    def __str__(self):
+        return f'<ReminderCursors {self.id}: {self.name}-{self.position}/>'
@@ -0,0 +1,167 @@
+from datetime import date, datetime, time, timedelta
+from email.message import EmailMessage
+from time import monotonic
+from typing import List
+
+from sqlalchemy import Select, select, func, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.services import DatabaseService
+from app.database.settings import db_settings
+from app.database.unit_of_work import commit
+from app.done_tasks.models import DoneTasks
+from app.mail.services import MailOutboxService
+from app.mail.templates import task_reminder_message
+from app.reminders.models import ReminderCursors
+from app.reminders.utils import ReminderQueue
+from app.schedulers.models import Schedulers
+from app.schedulers.recurrence import RECURRENCE_FIELDS, get_recurrence
+from app.schedulers.utils import WEEK_DAYS
+from app.settings import settings
+from app.tasks.models import Tasks
+from app.users.models import Users
+
+CURSOR_NAME = 'task_reminders'
+RULE_COLUMNS = [getattr(Schedulers, field) for field in (*WEEK_DAYS, *RECURRENCE_FIELDS)]
+
+
+class ReminderCursorService(DatabaseService):
+    model = ReminderCursors
+
+    @classmethod
+    async def get_position(cls, session: AsyncSession, name: str) -> datetime | None:
+        return await session.scalar(select(cls.model.position).where(cls.model.name == name))
+
+    @classmethod
+    async def save_position(cls, session: AsyncSession, name: str, position: datetime) -> None:
+        stmt = pg_insert(cls.model).values(name=name, position=position)
+        stmt = stmt.on_conflict_do_update(index_elements=['name'],
+                                          set_={'position': stmt.excluded.position,
+                                                'updated': func.timezone('utc', func.now())})
+        await session.execute(stmt)
+        await commit(session)
+
+
+class ReminderService:
+
+    @classmethod
+    async def load_window(cls, session: AsyncSession,
+                          date_from: datetime,
+                          date_to: datetime) -> List[tuple[datetime, int, date]]:
+        # Напоминания со временем в (date_from, date_to] по правилам расписаний задач.
+        days: List[date] = [date_from.date() + timedelta(days=offset)
+                            for offset in range((date_to.date() - date_from.date()).days + 1)]
+        filters = [Tasks.remind_time.is_not(None),
+                   Tasks.start_date <= date_to.date(),
+                   Tasks.end_date >= date_from.date()]
+        if len(days) == 1:
+            filters.extend([Tasks.remind_time > date_from.time(), Tasks.remind_time <= date_to.time()])
+        query: Select = (
+            select(Tasks.id, Tasks.start_date, Tasks.end_date, Tasks.remind_time, *RULE_COLUMNS)
+            .join(Schedulers, Schedulers.id == Tasks.scheduler_id)
+            .where(*filters)
+        )
+        reminders = []
+        for task in (await session.execute(query)).all():
+            rule = get_recurrence(task, task.start_date)
+            for day in days:
+                due: datetime = datetime.combine(day, task.remind_time)
+                if date_from < due <= date_to and task.start_date <= day <= task.end_date and rule.occurs_on(day):
+                    reminders.append((due, task.id, day))
+        return reminders
+
+    @classmethod
+    async def get_messages(cls, session: AsyncSession,
+                           reminders: List[tuple[datetime, int, date]]) -> List[EmailMessage]:
+        # Задача могла измениться, удалиться или быть выполненной после загрузки окна - проверка по базе.
+        query_tasks: Select = (
+            select(Tasks.id, Tasks.title, Tasks.start_date, Tasks.end_date, Tasks.remind_time,
+                   Users.email, Users.username, *RULE_COLUMNS)
+            .join(Users, Users.id == Tasks.user_id)
+            .join(Schedulers, Schedulers.id == Tasks.scheduler_id)
+            .where(Tasks.id.in_({task_id for _, task_id, _ in reminders}), Users.active == True)
+        )
+        tasks = {task.id: task for task in (await session.execute(query_tasks)).all()}
+        query_done: Select = (
+            select(DoneTasks.task_id, DoneTasks.date)
+            .where(tuple_(DoneTasks.task_id, DoneTasks.date).in_([(task_id, day) for _, task_id, day in reminders]),
+                   DoneTasks.is_done == True)
+        )
+        done: set[tuple[int, date]] = set((await session.execute(query_done)).tuples().all())
+
+        users_reminders: dict[tuple[str, str], List[tuple[str, date, time]]] = {}
+        for due, task_id, day in reminders:
+            task = tasks.get(task_id)
+            if task is None or task.remind_time is None or (task_id, day) in done:
+                continue
+            if (datetime.combine(day, task.remind_time) != due or not task.start_date <= day <= task.end_date
+                    or not get_recurrence(task, task.start_date).occurs_on(day)):
+                continue
+            users_reminders.setdefault((task.email, task.username), []).append((task.title, day, task.remind_time))
+        return [task_reminder_message(email, username, items) for (email, username), items in users_reminders.items()]
+
+
+class ReminderDispatcher:
+    # Окно напоминаний в памяти: загружается от курсора по WINDOW_SECONDS и перечитывается каждые
+    # REFRESH_SECONDS, чтобы учесть изменения задач. Письма и новая позиция курсора сохраняются
+    # в одной транзакции: после перезапуска отправка продолжается с сохраненной позиции.
+    def __init__(self, name: str = CURSOR_NAME):
+        self.name = name
+        self.queue = ReminderQueue()
+        self.cursor: datetime | None = None
+        self.loaded_until: datetime | None = None
+        self.refreshed: float = 0
+
+    async def start(self, session: AsyncSession) -> None:
+        now: datetime = datetime.utcnow()
+        position: datetime | None = await ReminderCursorService.get_position(session, self.name)
+        oldest: datetime = now - timedelta(seconds=settings.reminders.MAX_DELAY_SECONDS)
+        self.cursor = max(position, oldest) if position else now
+        self.loaded_until = self.cursor
+
+    def is_behind(self, now: datetime) -> bool:
+        return self.loaded_until < now
+
+    def get_sleep_seconds(self, now: datetime) -> float:
+        next_due: datetime | None = self.queue.next_due()
+        if next_due is None:
+            return settings.reminders.POLL_SECONDS
+        return min(max((next_due - now).total_seconds(), 0), settings.reminders.POLL_SECONDS)
+
+    async def load(self, session: AsyncSession, now: datetime) -> None:
+        if monotonic() - self.refreshed >= settings.reminders.REFRESH_SECONDS:
+            self.queue.clear()
+            if self.loaded_until > self.cursor:
+                self.queue.extend(await ReminderService.load_window(session, self.cursor, self.loaded_until))
+            self.refreshed = monotonic()
+        window = timedelta(seconds=settings.reminders.WINDOW_SECONDS)
+        if self.loaded_until < now + window / 2:
+            window_end: datetime = self.loaded_until + window
+            self.queue.extend(await ReminderService.load_window(session, self.loaded_until, window_end))
+            self.loaded_until = window_end
+
+    async def dispatch(self, now: datetime) -> int:
+        until: datetime = min(now, self.loaded_until)
+        reminders = self.queue.pop_due(until, settings.reminders.BATCH_SIZE)
+        if not reminders:
+            self.cursor = max(self.cursor, until)
+            return 0
+        next_due: datetime | None = self.queue.next_due()
+        cursor: datetime = reminders[-1][0] if next_due is not None and next_due <= until else until
+        try:
+            async with db_settings.transaction() as session:
+                messages: List[EmailMessage] = await ReminderService.get_messages(session, reminders)
+                await MailOutboxService.enqueue_many(session, messages)
+                await ReminderCursorService.save_position(session, self.name, cursor)
+        except Exception:
+            self.queue.extend(reminders)
+            raise
+        self.cursor = cursor
+        return len(reminders)
+
+    async def run_once(self) -> int:
+        now: datetime = datetime.utcnow()
+        async with db_settings.session() as session:
+            await self.load(session, now)
+        return await self.dispatch(now)
@@ -0,0 +1,36 @@
+import heapq
+from datetime import date, datetime
+from typing import List
+
+
+class ReminderQueue:
+    # Куча напоминаний (due, task_id, date) загруженного окна: добавление и извлечение - O(log n).
+    def __init__(self):
+        self.heap: List[tuple[datetime, int, date]] = []
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def extend(self, reminders: List[tuple[datetime, int, date]]) -> None:
+        if len(reminders) > len(self.heap):
+            self.heap.extend(reminders)
+            heapq.heapify(self.heap)
+            return
+        for reminder in reminders:
+            heapq.heappush(self.heap, reminder)
+
+    def next_due(self) -> datetime | None:
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, until: datetime, limit: int) -> List[tuple[datetime, int, date]]:
+        # Не больше limit напоминаний со временем до until, но напоминания с одним временем не разделяются:
+        # курсор сохраняется по времени последнего извлеченного.
+        reminders = []
+        while self.heap and self.heap[0][0] <= until:
+            if len(reminders) >= limit and self.heap[0][0] != reminders[-1][0]:
+                break
+            reminders.append(heapq.heappop(self.heap))
+        return reminders
+
+    def clear(self) -> None:
+        self.heap.clear()
@@ -0,0 +1,35 @@
+"""
+Отправка напоминаний о задачах через mail_outbox (письма отправляет app.tasks_celery.worker).
+
+> python -m app.reminders.worker [--once]
+"""
+import argparse
+import asyncio
+from datetime import datetime
+
+from app.database.settings import db_settings
+from app.reminders.services import ReminderDispatcher
+
+
+async def run_worker(once: bool = False) -> None:
+    dispatcher = ReminderDispatcher()
+    try:
+        async with db_settings.session() as session:
+            await dispatcher.start(session)
+        while True:
+            count: int = await dispatcher.run_once()
+            now: datetime = datetime.utcnow()
+            if count or dispatcher.is_behind(now):
+                continue
+            if once:
+                break
+            await asyncio.sleep(dispatcher.get_sleep_seconds(now))
+    finally:
+        await db_settings.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Queue task reminder emails into mail_outbox.')
+    parser.add_argument('--once', action='store_true', help='Dispatch due reminders and exit.')
+    args = parser.parse_args()
+    asyncio.run(run_worker(args.once))
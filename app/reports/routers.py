@@ -1,7 +1,8 @@
 from datetime import date
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.settings import db_settings
@@ -16,20 +17,42 @@ router = APIRouter(
 
 
 @router.get('/', description='Количество выполненных задач')
-async def get_tasks_completed(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def get_tasks_completed(request: Request,
+                              session: Annotated[AsyncSession, Depends(db_settings.get_read_session)],
                               user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
                               date_from: date = None, date_to: date = None):
-    return await ReportServices.base_report(session, user, date_from, date_to)
+    return await ReportServices.get_cached(request, user, 'base', {'date_from': date_from, 'date_to': date_to},
+                                           lambda: ReportServices.base_report(session, user, date_from, date_to))
 
 
 @router.get('/percentage-completed/', description='Процент выполненных задач')
-async def get_percent_tasks_completed(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def get_percent_tasks_completed(request: Request,
+                                      session: Annotated[AsyncSession, Depends(db_settings.get_read_session)],
                                       user: Annotated[UserReadSchema, Depends(UserService.get_current_user)]):
-    return await ReportServices.percent_tasks_completed(session, user)
+    return await ReportServices.get_cached(request, user, 'percentage-completed', {},
+                                           lambda: ReportServices.percent_tasks_completed(session, user))
 
 
 @router.get('/quantitative-data/')
-async def get_quantity_done(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def get_quantity_done(request: Request,
+                            session: Annotated[AsyncSession, Depends(db_settings.get_read_session)],
                             user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
                             date_month: date = None):
-    return await ReportServices.quantity_done(session, user, date_month)
+    return await ReportServices.get_cached(request, user, 'quantitative-data', {'date_month': date_month},
+                                           lambda: ReportServices.quantity_done(session, user, date_month))
+
+
+@router.get('/range/', description='Выполнение задач за период с разбивкой по месяцам')
+async def get_range_report(request: Request,
+                           session: Annotated[AsyncSession, Depends(db_settings.get_read_session)],
+                           user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
+                           date_from: date, date_to: date,
+                           output: Literal['json', 'ndjson', 'csv'] = 'json'):
+    if output == 'json':
+        return await ReportServices.get_cached(
+            request, user, 'range', {'date_from': date_from, 'date_to': date_to},
+            lambda: ReportServices.range_report(session, user, date_from, date_to)
+        )
+    media_type = 'text/csv' if output == 'csv' else 'application/x-ndjson'
+    return StreamingResponse(ReportServices.stream_range_report(user, date_from, date_to, output),
+                             media_type=media_type)
@@ -1,19 +1,73 @@
-from datetime import date, timedelta
+import csv
+import io
+import json
+from datetime import date
+from typing import AsyncGenerator, Awaitable, Callable, Literal
 
-from sqlalchemy import Select, select, Result, func, or_, and_
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import (Select, select, Result, func, or_, and_, case, cast, Float, Numeric, Date, DateTime,
+                        literal, literal_column)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
+from app.cache import cache
+from app.cache.reports import get_reports_version, get_report_etag, get_report_cache_key
 from app.database.services import DatabaseService
-from app.done_tasks import DoneTasks
-from app.exceptions import ParamDatesMustBeDefinedException
-from app.reports.utils import get_date_month
+from app.database.settings import db_settings
+from app.done_tasks import DoneTasks, TaskMonthlyStats
+from app.exceptions import ParamDatesMustBeDefinedException, DatesIncorrectException
+from app.reports.utils import get_date_month, count_scheduled_days_expression, is_whole_months
+from app.schedulers import Schedulers
+from app.settings import settings
 from app.tasks import Tasks
 from app.users.schemas import UserReadSchema
+from app.utils import get_conditional_headers, is_not_modified
 
 
 class ReportServices(DatabaseService):
     model = DoneTasks
+    STREAM_CHUNK_SIZE = 1000
+    RANGE_REPORT_FIELDS = ('id', 'title', 'month', 'need', 'done', 'percent_done', 'quantity_need', 'quantity_done')
+
+    @classmethod
+    async def get_cached(cls, request: Request,
+                         user: UserReadSchema,
+                         report: str,
+                         params: dict,
+                         compute: Callable[[], Awaitable]):
+        # Ключ кеша и ETag включают версию отчетов пользователя, которую повышают записи задач и расписаний.
+        if not settings.cache.REPORTS_ENABLED:
+            return await compute()
+        etag: str = await cls.get_etag(user, report, params)
+        headers: dict[str, str] = get_conditional_headers(etag)
+        if is_not_modified(request.headers, etag):
+            return Response(status_code=304, headers=headers)
+
+        cache_key: str = get_report_cache_key(etag)
+        data = await cache.get(cache_key)
+        if data is None:
+            data = jsonable_encoder(await compute())
+            await cache.set(cache_key, data, settings.cache.REPORTS_TTL_SECONDS)
+        return JSONResponse(data, headers=headers)
+
+    @classmethod
+    async def get_etag(cls, user: UserReadSchema, report: str, params: dict) -> str:
+        version: int = await get_reports_version(user.id)
+        return get_report_etag(user.id, version, report, params)
+
+    @classmethod
+    async def precompute(cls, session: AsyncSession, user: UserReadSchema) -> None:
+        # Отчеты за текущий месяц с параметрами по умолчанию - в кэш до запроса (задание reports.precompute).
+        reports = {
+            'base': ({'date_from': None, 'date_to': None}, lambda: cls.base_report(session, user, None, None)),
+            'percentage-completed': ({}, lambda: cls.percent_tasks_completed(session, user)),
+            'quantitative-data': ({'date_month': None}, lambda: cls.quantity_done(session, user, None)),
+        }
+        for report, (params, compute) in reports.items():
+            cache_key: str = get_report_cache_key(await cls.get_etag(user, report, params))
+            if await cache.get(cache_key) is None:
+                await cache.set(cache_key, jsonable_encoder(await compute()), settings.cache.REPORTS_TTL_SECONDS)
 
     @classmethod
     async def base_report(cls, session: AsyncSession, user: UserReadSchema, date_from, date_to):
@@ -22,49 +76,180 @@ class ReportServices(DatabaseService):
         if not date_from and not date_to:
             date_from, date_to = get_date_month()
 
-        select_fields = [func.count(DoneTasks.id)]
-        filters = [DoneTasks.is_done == True, ]
-        return await cls.select_tasks_by_group(user, session, date_from, date_to, select_fields, filters)
+        use_stats: bool = cls.use_monthly_stats(date_from, date_to)
+        if use_stats:
+            select_fields = [func.sum(TaskMonthlyStats.done_count)]
+            filters = [TaskMonthlyStats.done_count > 0, ]
+        else:
+            select_fields = [func.count()]
+            filters = [DoneTasks.is_done == True, ]
+        return await cls.select_tasks_by_group(user, session, date_from, date_to, select_fields, filters, use_stats)
 
     @classmethod
     async def percent_tasks_completed(cls, session: AsyncSession, user: UserReadSchema):
         date_from, date_to = get_date_month()
-        task_db = await cls.select_tasks_by_timedelta(user, session, date_from, date_to, [])
-        tasks_needs_done = await cls.get_tasks_needs_done(task_db, date_from, date_to, quantity=False)
-        tasks_done = await cls.base_report(session, user, None, None)
-        results = []
-        for task_need_done in tasks_needs_done:
-            task = task_need_done.copy()
-            task['done'] = 0
-            for title, key in tasks_done.items():
-                if task_need_done.get('title') == title:
-                    task['done'] = key
-            task['percent_done'] = round(task['done'] / task['need'] * 100, 2)
-            results.append(task)
-
-        return results
+        use_stats: bool = cls.use_monthly_stats(date_from, date_to)
+        need = count_scheduled_days_expression(date_from, date_to)
+        if use_stats:
+            done = func.coalesce(func.sum(TaskMonthlyStats.done_count), 0)
+        else:
+            done = func.count().filter(DoneTasks.is_done == True)
+        percent_done = case(
+            (need == 0, 0),
+            else_=func.round(cast(done, Numeric) * 100 / need, 2)
+        )
+        select_fields = [need.label('need'), done.label('done'), cast(percent_done, Float).label('percent_done')]
+        return await cls.select_tasks_report(user, session, date_from, date_to, select_fields, [], use_stats)
 
     @classmethod
     async def quantity_done(cls, session: AsyncSession, user: UserReadSchema, date_month: date):
         date_from, date_to = get_date_month(date_month)
+        use_stats: bool = cls.use_monthly_stats(date_from, date_to)
+        need = count_scheduled_days_expression(date_from, date_to) * Tasks.quantity
+        if use_stats:
+            done = func.coalesce(func.sum(TaskMonthlyStats.quantity_sum), 0)
+        else:
+            done = func.coalesce(func.sum(DoneTasks.quantity), 0)
+        select_fields = [need.label('need'), done.label('done'), (need - done).label('remainder')]
         filters = [Tasks.quantity > 0]
-        task_db = await cls.select_tasks_by_timedelta(user, session, date_from, date_to, filters)
-        tasks_needs_done = await cls.get_tasks_needs_done(task_db, date_from, date_to, quantity=True)
+        return await cls.select_tasks_report(user, session, date_from, date_to, select_fields, filters, use_stats)
 
-        select_fields = [func.sum(DoneTasks.quantity)]
-        filters = [Tasks.quantity > 0]
-        tasks = await cls.select_tasks_by_group(user, session, date_from, date_to, select_fields, filters)
+    @classmethod
+    async def range_report(cls, session: AsyncSession, user: UserReadSchema, date_from: date, date_to: date):
+        query: Select = cls.select_range_report(user, date_from, date_to)
+        query_result: Result = await session.execute(query)
+        return [dict(row) for row in query_result.mappings()]
+
+    @classmethod
+    def stream_range_report(cls, user: UserReadSchema,
+                            date_from: date,
+                            date_to: date,
+                            output: Literal['ndjson', 'csv']) -> AsyncGenerator[str, None]:
+        query: Select = cls.select_range_report(user, date_from, date_to)
+        return cls.stream_report(query, output)
+
+    @classmethod
+    async def stream_report(cls, query: Select, output: Literal['ndjson', 'csv']) -> AsyncGenerator[str, None]:
+        # Сессия зависимости закрывается до отправки StreamingResponse, поэтому открывается своя.
+        async with await db_settings.open_read_session() as session:
+            query_result = await session.stream(query.execution_options(yield_per=cls.STREAM_CHUNK_SIZE))
+            if output == 'csv':
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(cls.RANGE_REPORT_FIELDS)
+                async for rows in query_result.partitions():
+                    writer.writerows(rows)
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            else:
+                async for rows in query_result.mappings().partitions():
+                    yield ''.join(json.dumps(dict(row), default=str) + '\n' for row in rows)
+
+    @classmethod
+    def select_range_report(cls, user: UserReadSchema, date_from: date, date_to: date) -> Select:
+        if date_from > date_to:
+            raise DatesIncorrectException
+        use_stats: bool = cls.use_monthly_stats(date_from, date_to)
+        if use_stats:
+            query_done: Select = (
+                select(TaskMonthlyStats.task_id,
+                       TaskMonthlyStats.month,
+                       TaskMonthlyStats.done_count.label('done'),
+                       TaskMonthlyStats.quantity_sum.label('quantity_done'))
+                .join(Tasks, Tasks.id == TaskMonthlyStats.task_id)
+                .where(Tasks.user_id == user.id,
+                       TaskMonthlyStats.month >= date_from,
+                       TaskMonthlyStats.month <= date_to)
+            )
+        else:
+            done_month = cast(func.date_trunc('month', DoneTasks.date), Date)
+            query_done: Select = (
+                select(DoneTasks.task_id,
+                       done_month.label('month'),
+                       func.count().filter(DoneTasks.is_done == True).label('done'),
+                       func.sum(DoneTasks.quantity).label('quantity_done'))
+                .join(Tasks, Tasks.id == DoneTasks.task_id)
+                .where(Tasks.user_id == user.id, DoneTasks.date >= date_from, DoneTasks.date <= date_to)
+                .group_by(DoneTasks.task_id, done_month)
+            )
+        done = query_done.subquery('done')
+
+        months = (
+            func.generate_series(cast(literal(date_from.replace(day=1), Date), DateTime),
+                                 cast(literal(date_to, Date), DateTime),
+                                 literal_column("interval '1 month'"))
+            .table_valued('month')
+            .render_derived(name='months')
+        )
+        month = cast(months.c.month, Date)
+        month_from = func.greatest(month, date_from, type_=Date)
+        month_to = func.least(cast(months.c.month + literal_column("interval '1 month - 1 day'"), Date),
+                              date_to,
+                              type_=Date)
+        need = count_scheduled_days_expression(month_from, month_to)
+        done_count = func.coalesce(done.c.done, 0)
+        percent_done = case(
+            (need == 0, 0),
+            else_=func.round(cast(done_count, Numeric) * 100 / need, 2)
+        )
+        return (
+            select(Tasks.id,
+                   Tasks.title,
+                   month.label('month'),
+                   need.label('need'),
+                   done_count.label('done'),
+                   cast(percent_done, Float).label('percent_done'),
+                   (need * Tasks.quantity).label('quantity_need'),
+                   func.coalesce(done.c.quantity_done, 0).label('quantity_done'))
+            .select_from(Tasks)
+            .join(months, and_(month_from <= Tasks.end_date, month_to >= Tasks.start_date))
+            .outerjoin(Schedulers, Tasks.scheduler_id == Schedulers.id)
+            .outerjoin(done, and_(done.c.task_id == Tasks.id, done.c.month == month))
+            .where(Tasks.user_id == user.id, Tasks.start_date <= date_to, Tasks.end_date >= date_from)
+            .order_by(Tasks.id, months.c.month)
+        )
+
+    @classmethod
+    def use_monthly_stats(cls, date_from: date, date_to: date) -> bool:
+        return settings.reports.USE_TASK_MONTHLY_STATS and is_whole_months(date_from, date_to)
+
+    @classmethod
+    def get_done_source(cls, date_from: date, date_to: date, use_stats: bool) -> tuple:
+        if use_stats:
+            return TaskMonthlyStats, and_(TaskMonthlyStats.month >= date_from, TaskMonthlyStats.month <= date_to)
+        return DoneTasks, and_(DoneTasks.date >= date_from, DoneTasks.date <= date_to)
 
-        results = []
-        for task_need_done in tasks_needs_done:
-            task = task_need_done.copy()
-            task['done'] = 0
-            for title, key in tasks.items():
-                if task_need_done.get('title') == title:
-                    task['done'] = key
-            task['remainder'] = task['need'] - task['done']
-            results.append(task)
-        return results
+    @classmethod
+    async def select_tasks_report(cls, user: UserReadSchema,
+                                  session: AsyncSession,
+                                  date_from: date,
+                                  date_to: date,
+                                  select_fields: list,
+                                  filters: list,
+                                  use_stats: bool = False):
+        query: Select = cls.get_tasks_report_query(user, date_from, date_to, select_fields, filters, use_stats)
+        query_result: Result = await session.execute(query)
+        return [dict(row) for row in query_result.mappings()]
+
+    @classmethod
+    def get_tasks_report_query(cls, user: UserReadSchema,
+                               date_from: date,
+                               date_to: date,
+                               select_fields: list,
+                               filters: list,
+                               use_stats: bool = False) -> Select:
+        done_model, done_filter = cls.get_done_source(date_from, date_to, use_stats)
+        return (
+            select(Tasks.id, Tasks.title, *select_fields)
+            .outerjoin(Schedulers, Tasks.scheduler_id == Schedulers.id)
+            .outerjoin(done_model, and_(done_model.task_id == Tasks.id, done_filter))
+            .where(and_(*filters, Tasks.user_id == user.id,
+                        or_(and_(Tasks.start_date >= date_from, Tasks.start_date <= date_to),
+                            and_(Tasks.start_date <= date_from, Tasks.end_date > date_from))))
+            .group_by(Tasks.id, Schedulers.id)
+            .order_by(Tasks.id)
+        )
 
     @classmethod
     async def select_tasks_by_group(cls, user: UserReadSchema,
@@ -72,19 +257,9 @@ class ReportServices(DatabaseService):
                                     date_from: date,
                                     date_to: date,
                                     select_fields: list,
-                                    filters: list):
-        query_tasks: Select = (
-            select(Tasks.title, *select_fields)
-            .join(DoneTasks, Tasks.id == DoneTasks.task_id)
-            .where(
-                DoneTasks.date >= date_from,
-                DoneTasks.date <= date_to,
-                *filters,
-                Tasks.user_id == user.id
-            )
-            .group_by(Tasks.title)
-        )
-
+                                    filters: list,
+                                    use_stats: bool = False):
+        query_tasks: Select = cls.get_tasks_by_group_query(user, date_from, date_to, select_fields, filters, use_stats)
         result_tasks: Result[tuple[Tasks]] = await session.execute(query_tasks)
         db_tasks = result_tasks.all()
         tasks: dict[str, int] = {}
@@ -93,38 +268,20 @@ class ReportServices(DatabaseService):
         return tasks
 
     @classmethod
-    async def select_tasks_by_timedelta(cls, user: UserReadSchema,
-                                        session: AsyncSession,
-                                        date_from: date,
-                                        date_to: date,
-                                        filters: list):
-        query: Select = (
-            select(Tasks)
-            .where(and_(*filters, Tasks.user_id == user.id,
-                        or_(and_(Tasks.start_date >= date_from, Tasks.start_date <= date_to),
-                            and_(Tasks.start_date <= date_from, Tasks.end_date > date_from))))
-            .options(joinedload(Tasks.scheduler))
+    def get_tasks_by_group_query(cls, user: UserReadSchema,
+                                 date_from: date,
+                                 date_to: date,
+                                 select_fields: list,
+                                 filters: list,
+                                 use_stats: bool = False) -> Select:
+        done_model, done_filter = cls.get_done_source(date_from, date_to, use_stats)
+        return (
+            select(Tasks.title, *select_fields)
+            .join(done_model, Tasks.id == done_model.task_id)
+            .where(
+                done_filter,
+                *filters,
+                Tasks.user_id == user.id
+            )
+            .group_by(Tasks.title)
         )
-        query_result: Result[tuple[Tasks]] = await session.execute(query)
-        return query_result.scalars().all()
-
-    @classmethod
-    async def get_tasks_needs_done(cls, task_db, date_from: date, date_to: date, quantity: bool):
-        tasks_needs_done = []
-        for task in task_db:
-            task_needs_done = {'title': task.title}
-            required = 0
-            task_date_from = max(task.start_date, date_from)
-            task_date_to = min(task.end_date, date_to)
-            while task_date_from <= task_date_to:
-                day_week: str = task_date_from.strftime("%A").lower()
-                allowed_day: bool = task.scheduler.__dict__.get(day_week)
-                if allowed_day:
-                    if quantity:
-                        required += task.quantity
-                    else:
-                        required += 1
-                task_date_from += timedelta(days=1)
-            task_needs_done['need'] = required
-            tasks_needs_done.append(task_needs_done)
-        return tasks_needs_done
@@ -1,5 +1,14 @@
 from datetime import date
 from datetime import timedelta
+from functools import reduce
+from operator import add
+
+from sqlalchemy import Date, DateTime, Integer, cast, extract, func, case, and_, select, literal_column
+
+from app.schedulers import Schedulers
+from app.schedulers.utils import WEEK_DAYS
+from app.settings import settings
+from app.tasks import Tasks, TaskOccurrences
 
 
 def get_date_month(date_from: date = None):
@@ -11,3 +20,82 @@ def get_date_month(date_from: date = None):
     else:
         date_to = date_from.replace(month=date_from.month + 1, day=1) - timedelta(days=1)
     return date_from, date_to
+
+
+def is_whole_months(date_from: date, date_to: date) -> bool:
+    return date_from.day == 1 and (date_to + timedelta(days=1)).day == 1
+
+
+def occurs_on_expression(day):
+    # SQL-аналог app.schedulers.recurrence.Recurrence.matches по колонкам Tasks и Schedulers.
+    mask = reduce(add, [cast(getattr(Schedulers, day_week), Integer) * (1 << bit)
+                        for bit, day_week in enumerate(WEEK_DAYS)])
+    in_mask = mask.op('>>')(cast(extract('isodow', day), Integer) - 1).op('&')(1) == 1
+    day_of_month = cast(extract('day', day), Integer)
+    month_end = cast(func.date_trunc('month', day) + literal_column("interval '1 month - 1 day'"), Date)
+    is_monthly = Schedulers.frequency == 'monthly'
+    return case(
+        (Schedulers.frequency == 'daily',
+         and_(day >= Tasks.start_date, (day - Tasks.start_date) % Schedulers.interval_days == 0)),
+        (and_(is_monthly, Schedulers.month_day == -1), day == month_end),
+        (and_(is_monthly, Schedulers.month_day.is_not(None)), day_of_month == Schedulers.month_day),
+        (and_(is_monthly, Schedulers.month_week == -1),
+         and_(in_mask, day_of_month + 7 > cast(extract('day', month_end), Integer))),
+        (is_monthly, and_(in_mask, (day_of_month - 1) // 7 + 1 == Schedulers.month_week)),
+        else_=in_mask
+    )
+
+
+def count_occurrences_expression(date_from: date, date_to: date):
+    # Количество дат задачи в task_occurrences за период - по индексу uq_task_occurrences_task_id_date.
+    return (
+        select(func.count())
+        .where(TaskOccurrences.task_id == Tasks.id,
+               TaskOccurrences.date >= date_from,
+               TaskOccurrences.date <= date_to)
+        .scalar_subquery()
+    )
+
+
+def count_scheduled_days_expression(date_from: date, date_to: date):
+    # SQL-аналог app.schedulers.recurrence.Recurrence.count_between по колонкам Tasks и Schedulers.
+    if settings.occurrences.ENABLED:
+        return count_occurrences_expression(date_from, date_to)
+    task_date_from = func.greatest(Tasks.start_date, date_from, type_=Date)
+    task_date_to = func.least(Tasks.end_date, date_to, type_=Date)
+    days = func.greatest(task_date_to - task_date_from + 1, 0, type_=Integer)
+    weekday = cast(extract('isodow', task_date_from), Integer) - 1
+    terms = [
+        cast(getattr(Schedulers, day_week), Integer) * ((days + 6 - (bit - weekday + 7) % 7) // 7)
+        for bit, day_week in enumerate(WEEK_DAYS)
+    ]
+    weekly = reduce(add, terms)
+
+    first = (task_date_from - Tasks.start_date + Schedulers.interval_days - 1) // Schedulers.interval_days
+    last = (task_date_to - Tasks.start_date) // Schedulers.interval_days
+    daily = func.greatest(last - first + 1, 0, type_=Integer)
+
+    # Ежемесячные правила - перебором дней периода, их в отчете за месяц не больше 31.
+    series = (
+        func.generate_series(cast(task_date_from, DateTime),
+                             cast(task_date_to, DateTime),
+                             literal_column("interval '1 day'"))
+        .table_valued('day')
+        .render_derived(name='series')
+    )
+    monthly = (
+        select(func.count())
+        .select_from(series)
+        .where(occurs_on_expression(cast(series.c.day, Date)))
+        .scalar_subquery()
+    )
+
+    exdates = func.unnest(Schedulers.exdates).table_valued('day').render_derived(name='exdates')
+    excluded = (
+        select(func.count())
+        .select_from(exdates)
+        .where(exdates.c.day >= task_date_from, exdates.c.day <= task_date_to, occurs_on_expression(exdates.c.day))
+        .scalar_subquery()
+    )
+    need = case((Schedulers.frequency == 'daily', daily), (Schedulers.frequency == 'monthly', monthly), else_=weekly)
+    return func.coalesce(need - case((func.cardinality(Schedulers.exdates) > 0, excluded), else_=0), 0)
@@ -0,0 +1,97 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Iterable, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schedulers.recurrence import Recurrence, get_recurrence
+
+
+class TaskScheduleDelta:
+    # Изменение дат одной задачи после правки расписания: added - новые даты, removed - убранные.
+    __slots__ = ('task_id', 'added', 'removed')
+
+    def __init__(self, task_id: int, added: List[date], removed: List[date]):
+        self.task_id = task_id
+        self.added = added
+        self.removed = removed
+
+    def __repr__(self):
+        return f'<TaskScheduleDelta {self.task_id}: +{len(self.added)} -{len(self.removed)}/>'
+
+
+ScheduleChangeConsumer = Callable[[AsyncSession, int, List[TaskScheduleDelta]], Awaitable]
+schedule_change_consumers: List[ScheduleChangeConsumer] = []
+
+
+def register_schedule_consumer(consumer: ScheduleChangeConsumer) -> ScheduleChangeConsumer:
+    # consumer(session, user_id, deltas) вызывается в транзакции изменения расписания.
+    if consumer not in schedule_change_consumers:
+        schedule_change_consumers.append(consumer)
+    return consumer
+
+
+def iter_weekday_days(mask: int, date_from: date, date_to: date) -> Iterable[date]:
+    # Дни с битом в маске: по одному шагу на неделю для каждого дня недели, без перебора остальных дней.
+    for weekday in range(7):
+        if mask >> weekday & 1:
+            current_date: date = date_from + timedelta(days=(weekday - date_from.weekday()) % 7)
+            while current_date <= date_to:
+                yield current_date
+                current_date += timedelta(days=7)
+
+
+def get_changed_days(old_rule: Recurrence,
+                     new_rule: Recurrence,
+                     date_from: date,
+                     date_to: date) -> tuple[List[date], List[date]]:
+    # Кандидаты - дни, где различается маска (для недельных правил) или есть исключение в одном из правил;
+    # для остальных правил - даты обоих правил за период.
+    if old_rule.frequency == new_rule.frequency == 'weekly':
+        candidates = set(iter_weekday_days(old_rule.mask ^ new_rule.mask, date_from, date_to))
+    else:
+        candidates = {*old_rule.occurrences(date_from, date_to), *new_rule.occurrences(date_from, date_to)}
+    candidates.update(day for day in (*old_rule.exdates, *new_rule.exdates) if date_from <= day <= date_to)
+
+    added, removed = [], []
+    for day in sorted(candidates):
+        was, now = old_rule.occurs_on(day), new_rule.occurs_on(day)
+        if now and not was:
+            added.append(day)
+        elif was and not now:
+            removed.append(day)
+    return added, removed
+
+
+def get_schedule_deltas(old_scheduler, new_scheduler, tasks) -> List[TaskScheduleDelta]:
+    # tasks - строки (id, start_date, end_date) задач расписания. Недельные правила не зависят от задачи:
+    # изменения считаются один раз за общий период и режутся по периоду каждой задачи.
+    if not tasks:
+        return []
+    old_rule: Recurrence = get_recurrence(old_scheduler)
+    new_rule: Recurrence = get_recurrence(new_scheduler)
+    shared: bool = old_rule.frequency != 'daily' and new_rule.frequency != 'daily'
+    if shared:
+        added_all, removed_all = get_changed_days(old_rule, new_rule,
+                                                  min(task.start_date for task in tasks),
+                                                  max(task.end_date for task in tasks))
+
+    deltas = []
+    for task in tasks:
+        if shared:
+            added = added_all[bisect_left(added_all, task.start_date):bisect_right(added_all, task.end_date)]
+            removed = removed_all[bisect_left(removed_all, task.start_date):bisect_right(removed_all, task.end_date)]
+        else:
+            added, removed = get_changed_days(get_recurrence(old_scheduler, task.start_date),
+                                              get_recurrence(new_scheduler, task.start_date),
+                                              task.start_date, task.end_date)
+        if added or removed:
+            deltas.append(TaskScheduleDelta(task.id, added, removed))
+    return deltas
+
+
+async def publish_schedule_deltas(session: AsyncSession, user_id: int, deltas: List[TaskScheduleDelta]) -> None:
+    if not deltas:
+        return
+    for consumer in schedule_change_consumers:
+        await consumer(session, user_id, deltas)
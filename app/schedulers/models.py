@@ -1,6 +1,8 @@
+from datetime import date, datetime
 from typing import List, TYPE_CHECKING
 
-from sqlalchemy import String, ForeignKey, Boolean, UniqueConstraint
+from sqlalchemy import String, ForeignKey, text, Boolean, Integer, Date, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database.settings import Base
 
@@ -17,14 +19,17 @@ class Schedulers(Base):
     friday: Mapped[bool] = mapped_column(Boolean, default=False)
     saturday: Mapped[bool] = mapped_column(Boolean, default=False)
     sunday: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Правило повторения, см. app.schedulers.recurrence.Recurrence.
+    frequency: Mapped[str] = mapped_column(String(7), server_default=text("'weekly'"))
+    interval_days: Mapped[int] = mapped_column(Integer, server_default=text('1'))
+    month_day: Mapped[int] = mapped_column(Integer, nullable=True)
+    month_week: Mapped[int] = mapped_column(Integer, nullable=True)
+    exdates: Mapped[list[date]] = mapped_column(ARRAY(Date), server_default=text("'{}'"))
+    updated: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"), onupdate=datetime.utcnow)
 
     tasks: Mapped[List['Tasks']] = relationship(back_populates='scheduler')
 
-    __table_args__ = (
-        UniqueConstraint('user_id', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday',
-                         name='uq_days_week'),
-        UniqueConstraint('title', 'user_id', name='uq_scheduler_title_user_id')
-    )
+    __table_args__ = (UniqueConstraint('title', 'user_id', name='uq_scheduler_title_user_id'), )
 
     def __str__(self):
         return f'<Scheduler {self.id}: {self.title}/>'
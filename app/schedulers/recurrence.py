@@ -0,0 +1,156 @@
+import calendar
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Iterable
+
+from app.schedulers.utils import get_weekday_mask, is_scheduled_day, count_scheduled_days
+
+FREQUENCIES = ('weekly', 'daily', 'monthly')
+RECURRENCE_FIELDS = ('frequency', 'interval_days', 'month_day', 'month_week', 'exdates')
+
+
+def validate_rule(frequency: str, mask: int, interval_days: int, month_day: int | None, month_week: int | None) -> None:
+    if frequency not in FREQUENCIES:
+        raise ValueError(f'frequency must be one of {FREQUENCIES}')
+    if interval_days < 1:
+        raise ValueError('interval_days must be positive')
+    if frequency == 'monthly':
+        if (month_day is None) == (month_week is None):
+            raise ValueError('monthly rule needs exactly one of month_day, month_week')
+        if month_day is not None and not (1 <= month_day <= 31 or month_day == -1):
+            raise ValueError('month_day must be 1..31 or -1')
+        if month_week is not None and not (1 <= month_week <= 5 or month_week == -1):
+            raise ValueError('month_week must be 1..5 or -1')
+        if month_week is not None and not mask:
+            raise ValueError('month_week needs at least one day of week')
+
+
+class Recurrence:
+    # Правило расписания (аналог RRULE): weekly - маска дней недели, daily - каждые interval дней от start
+    # (дата начала задачи), monthly - число месяца month_day или month_week-й день недели из маски (-1 - последний).
+    # exdates - исключенные даты.
+    __slots__ = ('frequency', 'mask', 'interval', 'month_day', 'month_week', 'start', 'exdates', 'exdates_set')
+
+    def __init__(self, frequency: str = 'weekly',
+                 mask: int = 0,
+                 interval: int = 1,
+                 month_day: int | None = None,
+                 month_week: int | None = None,
+                 start: date | None = None,
+                 exdates: Iterable[date] = ()):
+        self.frequency = frequency
+        self.mask = mask
+        self.interval = interval if frequency == 'daily' else 1
+        self.month_day = month_day
+        self.month_week = month_week
+        self.start = start or date.min
+        # Только даты, попадающие в правило: count_between вычитает их без проверки.
+        self.exdates: tuple[date, ...] = tuple(sorted({day for day in exdates if self.matches(day)}))
+        self.exdates_set: frozenset[date] = frozenset(self.exdates)
+
+    def occurs_on(self, day: date) -> bool:
+        return self.matches(day) and day not in self.exdates_set
+
+    def count_between(self, date_from: date, date_to: date) -> int:
+        if date_from > date_to:
+            return 0
+        excluded: int = bisect_right(self.exdates, date_to) - bisect_left(self.exdates, date_from)
+        return self.count_matches(date_from, date_to) - excluded
+
+    def occurrences(self, date_from: date, date_to: date) -> Iterable[date]:
+        current_date: date = date_from
+        while current_date <= date_to:
+            if self.occurs_on(current_date):
+                yield current_date
+            current_date += timedelta(days=1)
+
+    def matches(self, day: date) -> bool:
+        if self.frequency == 'daily':
+            return day >= self.start and (day - self.start).days % self.interval == 0
+        if self.frequency == 'monthly':
+            days_in_month: int = calendar.monthrange(day.year, day.month)[1]
+            if self.month_day is not None:
+                return day.day == (days_in_month if self.month_day == -1 else self.month_day)
+            if not is_scheduled_day(self.mask, day):
+                return False
+            if self.month_week == -1:
+                return day.day + 7 > days_in_month
+            return (day.day - 1) // 7 + 1 == self.month_week
+        return is_scheduled_day(self.mask, day)
+
+    def count_matches(self, date_from: date, date_to: date) -> int:
+        if self.frequency == 'daily':
+            date_from = max(date_from, self.start)
+            if date_from > date_to:
+                return 0
+            first: int = -(-(date_from - self.start).days // self.interval)
+            last: int = (date_to - self.start).days // self.interval
+            return max(last - first + 1, 0)
+        if self.frequency == 'monthly':
+            return self.count_monthly(date_from, date_to)
+        return count_scheduled_days(self.mask, date_from, date_to)
+
+    def count_monthly(self, date_from: date, date_to: date) -> int:
+        if (date_from.year, date_from.month) == (date_to.year, date_to.month):
+            return sum(date_from <= day <= date_to for day in self.month_occurrences(date_from.year, date_from.month))
+        count: int = sum(day >= date_from for day in self.month_occurrences(date_from.year, date_from.month))
+        count += sum(day <= date_to for day in self.month_occurrences(date_to.year, date_to.month))
+        month_from: int = date_from.year * 12 + date_from.month
+        months: int = date_to.year * 12 + date_to.month - month_from - 1
+        if self.is_every_month():
+            per_month: int = 1 if self.month_day is not None else self.mask.bit_count()
+            return count + months * per_month
+        # 29-31 число и пятая неделя есть не в каждом месяце.
+        for month_index in range(month_from, month_from + months):
+            year, month = divmod(month_index, 12)
+            count += len(self.month_occurrences(year, month + 1))
+        return count
+
+    def is_every_month(self) -> bool:
+        if self.month_day is not None:
+            return self.month_day <= 28
+        return self.month_week <= 4
+
+    def month_occurrences(self, year: int, month: int) -> list[date]:
+        first_weekday, days_in_month = calendar.monthrange(year, month)
+        if self.month_day is not None:
+            day: int = days_in_month if self.month_day == -1 else self.month_day
+            return [date(year, month, day)] if day <= days_in_month else []
+        occurrences = []
+        for weekday in range(7):
+            if not self.mask >> weekday & 1:
+                continue
+            first_day: int = (weekday - first_weekday) % 7 + 1
+            if self.month_week == -1:
+                day = first_day + (days_in_month - first_day) // 7 * 7
+            else:
+                day = first_day + (self.month_week - 1) * 7
+            if day <= days_in_month:
+                occurrences.append(date(year, month, day))
+        return occurrences
+
+
+@lru_cache(maxsize=4096)
+def compile_recurrence(frequency: str,
+                       mask: int,
+                       interval: int,
+                       month_day: int | None,
+                       month_week: int | None,
+                       start: date | None,
+                       exdates: tuple[date, ...]) -> Recurrence:
+    return Recurrence(frequency, mask, interval, month_day, month_week, start, exdates)
+
+
+def get_recurrence(scheduler, start: date | None = None) -> Recurrence:
+    # scheduler - модель Schedulers или строка запроса с теми же колонками; start - дата начала задачи.
+    if scheduler is None:
+        return compile_recurrence('weekly', 0, 1, None, None, None, ())
+    frequency: str = getattr(scheduler, 'frequency', None) or 'weekly'
+    return compile_recurrence(frequency,
+                              get_weekday_mask(scheduler),
+                              getattr(scheduler, 'interval_days', None) or 1,
+                              getattr(scheduler, 'month_day', None),
+                              getattr(scheduler, 'month_week', None),
+                              start if frequency == 'daily' else None,
+                              tuple(getattr(scheduler, 'exdates', None) or ()))
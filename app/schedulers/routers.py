@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends
 from fastapi_pagination import Page
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database.pagination import CursorPage, CursorParams, get_cursor_params
 from app.database.settings import db_settings
 from app.schedulers.schemas import SchedulerListSchema, SchedulerDetailSchema, SchedulerCreateUpdateSchema
 from app.schedulers.services import SchedulerService
@@ -18,33 +19,40 @@ router = APIRouter(
 
 @router.get('/list/', response_model=Page[SchedulerListSchema])
 async def get_list(user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
-                   session: Annotated[AsyncSession, Depends(db_settings.get_session)]):
+                   session: Annotated[AsyncSession, Depends(db_settings.get_read_session)]):
     return await SchedulerService.get_list(session, user_id=user.id, is_paginate=True)
 
 
+@router.get('/list/cursor/', response_model=CursorPage[SchedulerListSchema])
+async def get_list_cursor(user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
+                          session: Annotated[AsyncSession, Depends(db_settings.get_read_session)],
+                          params: Annotated[CursorParams, Depends(get_cursor_params)]):
+    return await SchedulerService.get_list(session, cursor_params=params, user_id=user.id)
+
+
 @router.get('/detail/{scheduler_id}', response_model=SchedulerDetailSchema)
 async def get_detail(user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
-                     session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+                     session: Annotated[AsyncSession, Depends(db_settings.get_read_session)],
                      scheduler_id: int):
     return await SchedulerService.get_detail(session, id=scheduler_id, user_id=user.id)
 
 
 @router.post('/create/', response_model=SchedulerDetailSchema)
 async def create(user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
-                 session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+                 session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
                  data: SchedulerCreateUpdateSchema):
     return await SchedulerService.create_scheduler(session, user, data)
 
 
 @router.put('/update/{scheduler_id}', response_model=SchedulerDetailSchema)
 async def update(user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
-                 session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+                 session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
                  data: SchedulerCreateUpdateSchema, scheduler_id: int):
     return await SchedulerService.update_scheduler(session, user, scheduler_id, data)
 
 
 @router.delete('/delete/{scheduler_id}/')
 async def delete(user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
-                 session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+                 session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
                  scheduler_id:int):
     await SchedulerService.delete_scheduler(session, user, scheduler_id)
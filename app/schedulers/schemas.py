@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from datetime import date
+from typing import List, Literal
+
+from pydantic import BaseModel, Field
 
 
 class SchedulerBaseSchema(BaseModel):
@@ -10,6 +13,11 @@ class SchedulerBaseSchema(BaseModel):
     friday: bool
     saturday: bool
     sunday: bool
+    frequency: Literal['weekly', 'daily', 'monthly'] = 'weekly'
+    interval_days: int = Field(1, ge=1, le=366)
+    month_day: int | None = Field(None, ge=-1, le=31)
+    month_week: int | None = Field(None, ge=-1, le=5)
+    exdates: List[date] = Field([], max_length=366)
 
 
 class SchedulerCreateUpdateSchema(SchedulerBaseSchema):
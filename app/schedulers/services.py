@@ -1,36 +1,78 @@
+from sqlalchemy import Select, select, Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.reports import bump_reports_version, bump_reports_on_schedule_change
 from app.database.exceptions import ExceptionsDatabase
 from app.database.services import DatabaseService
-from app.exceptions import ScheduleAlreadyExistsException, ScheduleNotFoundException
+from app.database.unit_of_work import on_commit
+from app.exceptions import (ScheduleAlreadyExistsException, ScheduleNotFoundException,
+                            InvalidScheduleRuleException)
 from app.schedulers import Schedulers
+from app.schedulers.changes import register_schedule_consumer, publish_schedule_deltas, get_schedule_deltas
+from app.schedulers.recurrence import RECURRENCE_FIELDS, validate_rule
 from app.schedulers.schemas import SchedulerCreateUpdateSchema
+from app.schedulers.utils import WEEK_DAYS, get_weekday_mask
+from app.tasks.models import Tasks
+from app.tasks.occurrences import TaskOccurrenceService
 from app.users.schemas import UserReadSchema
 
+register_schedule_consumer(TaskOccurrenceService.apply_schedule_deltas)
+register_schedule_consumer(bump_reports_on_schedule_change)
+
 
 class SchedulerService(DatabaseService):
     model = Schedulers
+    tombstone_entity = 'schedulers'
+
+    @classmethod
+    def validate_scheduler(cls, data: SchedulerCreateUpdateSchema) -> None:
+        try:
+            validate_rule(data.frequency, get_weekday_mask(data), data.interval_days, data.month_day, data.month_week)
+        except ValueError as err:
+            raise InvalidScheduleRuleException(str(err))
 
     @classmethod
     async def create_scheduler(cls, session: AsyncSession,
                                user: UserReadSchema,
                                data: SchedulerCreateUpdateSchema) -> Schedulers:
+        cls.validate_scheduler(data)
         exceptions = ExceptionsDatabase(unique_error=ScheduleAlreadyExistsException)
-        return await cls.create(session, exceptions=exceptions, user_id=user.id, **data.model_dump())
+        scheduler = await cls.create(session, exceptions=exceptions, user_id=user.id, **data.model_dump())
+        await on_commit(session, lambda: bump_reports_version(user.id))
+        return scheduler
 
     @classmethod
     async def update_scheduler(cls, session: AsyncSession,
                                user: UserReadSchema,
                                scheduler_id: int,
                                data: SchedulerCreateUpdateSchema) -> Schedulers:
+        cls.validate_scheduler(data)
         exceptions = ExceptionsDatabase(unique_error=ScheduleAlreadyExistsException,
                                         object_not_found=ScheduleNotFoundException)
-        return await cls.update(session,
-                                filters={'id': scheduler_id, 'user_id': user.id},
-                                exceptions=exceptions,
-                                **data.model_dump()
-                                )
+        # Правило до изменения - для расчета добавленных и убранных дат задач.
+        query_rule: Select = (
+            select(*[getattr(cls.model, field) for field in (*WEEK_DAYS, *RECURRENCE_FIELDS)])
+            .where(cls.model.id == scheduler_id, cls.model.user_id == user.id)
+        )
+        old_scheduler: Row | None = (await session.execute(query_rule)).one_or_none()
+        scheduler = await cls.update(session,
+                                     filters={'id': scheduler_id, 'user_id': user.id},
+                                     exceptions=exceptions,
+                                     **data.model_dump()
+                                     )
+        await cls.touch_related(session, cls.model.tasks, user_id=user.id, scheduler_id=scheduler_id)
+        query_tasks: Select = (
+            select(Tasks.id, Tasks.start_date, Tasks.end_date)
+            .where(Tasks.user_id == user.id, Tasks.scheduler_id == scheduler_id)
+        )
+        tasks = (await session.execute(query_tasks)).all()
+        await publish_schedule_deltas(session, user.id, get_schedule_deltas(old_scheduler, scheduler, tasks))
+        return scheduler
 
     @classmethod
     async def delete_scheduler(cls, session: AsyncSession, user: UserReadSchema, scheduler_id: int) -> None:
+        await cls.touch_related(session, cls.model.tasks, user_id=user.id, scheduler_id=scheduler_id)
+        # Задачи остаются без расписания (SET NULL), у них нет дат.
+        await TaskOccurrenceService.clear(session, [Tasks.user_id == user.id, Tasks.scheduler_id == scheduler_id])
         await cls.delete(session, filters={'id': scheduler_id, 'user_id': user.id})
+        await on_commit(session, lambda: bump_reports_version(user.id))
@@ -0,0 +1,32 @@
+from datetime import date
+
+WEEK_DAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+FULL_WEEK_MASK = 0b1111111
+
+
+def get_weekday_mask(scheduler) -> int:
+    # Bit N соответствует date.weekday() == N (0 - понедельник).
+    if scheduler is None:
+        return 0
+    mask = 0
+    for bit, day_week in enumerate(WEEK_DAYS):
+        if getattr(scheduler, day_week):
+            mask |= 1 << bit
+    return mask
+
+
+def is_scheduled_day(mask: int, day: date) -> bool:
+    return bool(mask >> day.weekday() & 1)
+
+
+def rotate_weekday_mask(mask: int, weekday: int) -> int:
+    # Сдвиг маски так, чтобы бит 0 соответствовал дню недели weekday.
+    return ((mask >> weekday) | (mask << (7 - weekday))) & FULL_WEEK_MASK
+
+
+def count_scheduled_days(mask: int, date_from: date, date_to: date) -> int:
+    if not mask or date_from > date_to:
+        return 0
+    weeks, remainder = divmod((date_to - date_from).days + 1, 7)
+    rotated_mask: int = rotate_weekday_mask(mask, date_from.weekday())
+    return weeks * mask.bit_count() + (rotated_mask & ((1 << remainder) - 1)).bit_count()
@@ -16,6 +16,17 @@ class SiteSettings(BaseModel):
         return f'{self.PROTOCOL}://{self.DOMAIN}:{self.PORT}/'
 
 
+# Значения пула по умолчанию для VERSION, переопределяются явно заданными DATABASE__POOL_*.
+POOL_PROFILES: dict[str, dict] = {
+    'TEST': {'POOL_MODE': 'null', 'POOL_SIZE': 1, 'MAX_OVERFLOW': 0, 'POOL_TIMEOUT': 5,
+             'POOL_PRE_PING': False, 'POOL_RECYCLE': -1, 'STATEMENT_CACHE_SIZE': 100},
+    'DEV': {'POOL_MODE': 'queue', 'POOL_SIZE': 5, 'MAX_OVERFLOW': 5, 'POOL_TIMEOUT': 30,
+            'POOL_PRE_PING': True, 'POOL_RECYCLE': 1800, 'STATEMENT_CACHE_SIZE': 100},
+    'PROD': {'POOL_MODE': 'queue', 'POOL_SIZE': 20, 'MAX_OVERFLOW': 10, 'POOL_TIMEOUT': 10,
+             'POOL_PRE_PING': True, 'POOL_RECYCLE': 1800, 'STATEMENT_CACHE_SIZE': 500},
+}
+
+
 class DatabasePGSettings(BaseModel):
     POSTGRES_HOST: str
     POSTGRES_PORT: int
@@ -25,6 +36,22 @@ class DatabasePGSettings(BaseModel):
 
     ENGINE_ECHO: bool = False
 
+    # null - без пула на стороне приложения (PgBouncer), для transaction pooling STATEMENT_CACHE_SIZE=0.
+    POOL_MODE: Literal['queue', 'null'] | None = None
+    POOL_SIZE: int | None = None
+    MAX_OVERFLOW: int | None = None
+    POOL_TIMEOUT: float | None = None
+    POOL_PRE_PING: bool | None = None
+    POOL_RECYCLE: int | None = None
+    STATEMENT_CACHE_SIZE: int | None = None
+    SERVER_SETTINGS: dict[str, str] = {}
+    QUERY_CACHE_SIZE: int = 500  # Кэш скомпилированных запросов SQLAlchemy на engine.
+
+    # Реплики только для чтения (get_read_session), недоступная исключается на REPLICA_RETRY_SECONDS.
+    REPLICA_URLS: list[str] = []
+    REPLICA_CONNECT_TIMEOUT: float = 2
+    REPLICA_RETRY_SECONDS: int = 30
+
     CONVENTION: dict[str, str] = {
         'ix': 'ix_%(column_0_label)s',
         'uq': 'uq_%(table_name)s_%(column_0_N_name)s',
@@ -37,6 +64,14 @@ class DatabasePGSettings(BaseModel):
     def POSTGRES_URL(self):
         return f'postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}/{self.POSTGRES_DB}'
 
+    def get_pool_settings(self, version: str) -> dict:
+        pool_settings: dict = POOL_PROFILES[version].copy()
+        for key in pool_settings:
+            value = getattr(self, key)
+            if value is not None:
+                pool_settings[key] = value
+        return pool_settings
+
 
 class SecuritySettings(BaseModel):
     JWT_SECRET_KEY: str
@@ -45,6 +80,9 @@ class SecuritySettings(BaseModel):
     JWT_REFRESH_TOKEN_EXPIRE_MINUTES: int
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int
     VERIFY_URL_SECRET_KEY: str
+    JWT_STATELESS: bool = False
+    PASSWORD_HASH_EXECUTOR: Literal['thread', 'process'] = 'thread'
+    PASSWORD_HASH_WORKERS: int = 4
 
 
 class EmailSettings(BaseModel):
@@ -52,6 +90,60 @@ class EmailSettings(BaseModel):
     PORT: int
     LOGIN: str
     PASSWORD: str
+    STARTTLS: bool = True
+    AUTH: bool = True
+    TIMEOUT_SECONDS: int = 30
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_POLL_SECONDS: float = 5
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    OUTBOX_RETRY_SECONDS: int = 60
+
+
+class CacheSettings(BaseModel):
+    BACKEND: Literal['memory', 'redis'] = 'memory'
+    REDIS_URL: str = 'redis://localhost:6379/0'
+    MEMORY_MAX_SIZE: int = 10000
+    USER_ENABLED: bool = False
+    USER_TTL_SECONDS: int = 60
+    REPORTS_ENABLED: bool = False
+    REPORTS_TTL_SECONDS: int = 300
+
+
+class ReportSettings(BaseModel):
+    USE_TASK_MONTHLY_STATS: bool = False
+
+
+class SyncSettings(BaseModel):
+    OVERLAP_SECONDS: int = 60
+    TOMBSTONES_TTL_DAYS: int = 90
+
+
+class OccurrenceSettings(BaseModel):
+    ENABLED: bool = False
+    CHUNK_DAYS: int = 366
+
+
+class ReminderSettings(BaseModel):
+    WINDOW_SECONDS: int = 900
+    REFRESH_SECONDS: int = 60
+    POLL_SECONDS: float = 5
+    BATCH_SIZE: int = 1000
+    MAX_DELAY_SECONDS: int = 24 * 3600
+
+
+class JobSettings(BaseModel):
+    BROKER: Literal['database', 'memory'] = 'database'
+    CONCURRENCY: int = 4
+    POLL_SECONDS: float = 1
+    VISIBILITY_SECONDS: int = 300
+    KEEP_DAYS: int = 7
+    PRECOMPUTE_REPORTS: bool = False
+
+
+class MetricsSettings(BaseModel):
+    # /metrics/ не подключается без ENABLED; с TOKEN запрос требует заголовок Authorization: Bearer <TOKEN>.
+    ENABLED: bool = False
+    TOKEN: str | None = None
 
 
 class Settings(BaseSettings):
@@ -65,6 +157,13 @@ class Settings(BaseSettings):
     database: DatabasePGSettings
     security: SecuritySettings
     email: EmailSettings
+    reports: ReportSettings = ReportSettings()
+    cache: CacheSettings = CacheSettings()
+    sync: SyncSettings = SyncSettings()
+    occurrences: OccurrenceSettings = OccurrenceSettings()
+    reminders: ReminderSettings = ReminderSettings()
+    jobs: JobSettings = JobSettings()
+    metrics: MetricsSettings = MetricsSettings()
     model_config = SettingsConfigDict(env_file=('.env.template', '.env'),
                                       env_nested_delimiter="__",
                                       case_sensitive=False
@@ -0,0 +1,5 @@
+__all__ = (
+    'router'
+)
+
+from app.sync.routers import router
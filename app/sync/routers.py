@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.settings import db_settings
+from app.sync.schemas import SyncSchema
+from app.sync.services import SyncService
+from app.users.schemas import UserReadSchema
+from app.users.services import UserService
+
+router = APIRouter(
+    prefix='/sync',
+    tags=['Sync']
+)
+
+
+# Основная база, а не реплика: с отстающей реплики водяной знак пропустил бы еще не доехавшие изменения.
+@router.get('/', response_model=SyncSchema, description='Изменения категорий, расписаний и задач с момента since')
+async def sync(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+               user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
+               since: datetime = None):
+    return await SyncService.get_changes(session, user, since)
@@ -0,0 +1,30 @@
+from datetime import date, datetime
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+from app.categories.schemas import CategoryListSchema
+from app.schedulers.schemas import SchedulerListSchema
+from app.tasks.schemas import TaskBulkSchema
+
+
+class SyncTaskSchema(TaskBulkSchema):
+    quantity_unit: str | None
+
+
+class SyncDoneTaskSchema(BaseModel):
+    id: int
+    task_id: int
+    date: date
+    quantity: int
+    is_done: bool
+
+
+class SyncSchema(BaseModel):
+    watermark: datetime
+    full: bool
+    categories: List[CategoryListSchema]
+    schedulers: List[SchedulerListSchema]
+    tasks: List[SyncTaskSchema]
+    done_tasks: List[SyncDoneTaskSchema]
+    deleted: Dict[str, List[int]]
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import Select, select, func, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.categories import Categories
+from app.database.tombstones import Tombstones
+from app.database.unit_of_work import commit
+from app.done_tasks import DoneTasks
+from app.schedulers import Schedulers
+from app.schedulers.recurrence import RECURRENCE_FIELDS
+from app.schedulers.utils import WEEK_DAYS
+from app.settings import settings
+from app.tasks import Tasks
+from app.users.schemas import UserReadSchema
+
+SYNC_FIELDS: dict[str, tuple[str, ...]] = {
+    'categories': ('id', 'title'),
+    'schedulers': ('id', 'title', *WEEK_DAYS, *RECURRENCE_FIELDS),
+    'tasks': ('id', 'title', 'category_id', 'scheduler_id', 'start_date', 'end_date', 'quantity', 'quantity_unit',
+              'remind_time'),
+    'done_tasks': ('id', 'task_id', 'date', 'quantity', 'is_done'),
+}
+
+
+class SyncService:
+
+    @classmethod
+    def get_changes_query(cls, user: UserReadSchema, entity: str, changed_since: datetime | None) -> Select:
+        if entity == 'done_tasks':
+            query: Select = (
+                select(*[getattr(DoneTasks, field) for field in SYNC_FIELDS[entity]])
+                .join(Tasks, Tasks.id == DoneTasks.task_id)
+                .where(Tasks.user_id == user.id)
+                .order_by(DoneTasks.id)
+            )
+            if changed_since:
+                query = query.where(DoneTasks.updated >= changed_since)
+            return query
+        model = {'categories': Categories, 'schedulers': Schedulers, 'tasks': Tasks}[entity]
+        query: Select = (
+            select(*[getattr(model, field) for field in SYNC_FIELDS[entity]])
+            .where(model.user_id == user.id)
+            .order_by(model.id)
+        )
+        if changed_since:
+            query = query.where(model.updated >= changed_since)
+        return query
+
+    @classmethod
+    async def get_changes(cls, session: AsyncSession, user: UserReadSchema, since: datetime | None) -> dict:
+        # Водяной знак - время базы, а не сервера приложения. Записи за OVERLAP_SECONDS до since отдаются повторно:
+        # так не теряются транзакции, зафиксированные позже начала, и расхождение часов воркеров.
+        watermark: datetime = await session.scalar(select(func.timezone('utc', func.now())))
+        if since is not None:
+            since = since.replace(tzinfo=None) - (since.utcoffset() or timedelta())
+        full: bool = since is None or since < watermark - timedelta(days=settings.sync.TOMBSTONES_TTL_DAYS)
+        changed_since: datetime | None = None if full else since - timedelta(seconds=settings.sync.OVERLAP_SECONDS)
+
+        data: dict = {'watermark': watermark, 'full': full, 'deleted': {}}
+        for entity in SYNC_FIELDS:
+            result = await session.execute(cls.get_changes_query(user, entity, changed_since))
+            data[entity] = result.mappings().all()
+        if not full:
+            query: Select = (
+                select(Tombstones.entity, Tombstones.object_id)
+                .where(Tombstones.user_id == user.id, Tombstones.deleted >= changed_since)
+                .order_by(Tombstones.id)
+            )
+            for entity, object_id in await session.execute(query):
+                data['deleted'].setdefault(entity, []).append(object_id)
+        return data
+
+    @classmethod
+    async def delete_expired_tombstones(cls, session: AsyncSession) -> int:
+        # Клиенты с since старше TOMBSTONES_TTL_DAYS получают полную выгрузку, удаления им не нужны.
+        expired = func.timezone('utc', func.now()) - timedelta(days=settings.sync.TOMBSTONES_TTL_DAYS)
+        result = await session.execute(delete(Tombstones).where(Tombstones.deleted < expired))
+        await commit(session)
+        return result.rowcount
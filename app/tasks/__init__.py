@@ -1,7 +1,8 @@
 __all__ = (
     'Tasks',
+    'TaskOccurrences',
     'router'
 )
 
-from app.tasks.models import Tasks
+from app.tasks.models import Tasks, TaskOccurrences
 from app.tasks.routers import router
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Заполнение таблицы task_occurrences по задачам и расписаниям.
+
+> OCCURRENCES__ENABLED=true python -m app.tasks.backfill [--user-id ID]
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select
+
+from app.database.settings import db_settings
+from app.tasks import Tasks
+from app.tasks.occurrences import TaskOccurrenceService
+
+BATCH_SIZE = 500
+
+
+async def backfill_task_occurrences(user_id: int | None = None) -> None:
+    # Задачи обрабатываются пачками по id, каждая пачка - в своей транзакции.
+    filters = [Tasks.user_id == user_id] if user_id else []
+    last_id: int = 0
+    async with db_settings.session() as session:
+        while True:
+            query = select(Tasks.id).where(Tasks.id > last_id, *filters).order_by(Tasks.id).limit(BATCH_SIZE)
+            tasks_ids = (await session.scalars(query)).all()
+            if not tasks_ids:
+                break
+            await TaskOccurrenceService.regenerate(session, [Tasks.id.in_(tasks_ids)])
+            last_id = tasks_ids[-1]
+    await db_settings.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Backfill task_occurrences from tasks and schedulers.')
+    parser.add_argument('--user-id', type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(backfill_task_occurrences(args.user_id))
@@ -1,6 +1,6 @@
-from datetime import date, datetime
+from datetime import date, datetime, time
 from typing import TYPE_CHECKING, List
-from sqlalchemy import String, ForeignKey, Integer, Date, text
+from sqlalchemy import String, ForeignKey, Integer, Date, Time, text, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.settings import Base
@@ -21,6 +21,8 @@ class Tasks(Base):
     end_date: Mapped[date] = mapped_column(Date, nullable=False)
     quantity: Mapped[int] = mapped_column(Integer, default=0)
     quantity_unit: Mapped[str] = mapped_column(String(31), nullable=True)
+    # Время напоминания (UTC) в дни задачи по расписанию, без него напоминания не отправляются.
+    remind_time: Mapped[time] = mapped_column(Time, nullable=True)
     created: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"))
     updated: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"), onupdate=datetime.utcnow)
 
@@ -29,5 +31,22 @@ class Tasks(Base):
     scheduler: Mapped['Schedulers'] = relationship(back_populates='tasks')
     done_tasks: Mapped[List['DoneTasks']] = relationship(back_populates='task')
 
+    __table_args__ = (
+        Index('ix_tasks_user_id_start_date_end_date', 'user_id', 'start_date', 'end_date'),
+        Index('ix_tasks_user_id_created_id', 'user_id', 'created', 'id'),
+        Index('ix_tasks_user_id_updated', 'user_id', 'updated'),
+        Index('ix_tasks_remind_time', 'remind_time', postgresql_where=text('remind_time IS NOT NULL')),
+    )
+
     def __str__(self):
         return f'<Tasks {self.id}: {self.title}/>'
+
+
+class TaskOccurrences(Base):
+    task_id: Mapped[int] = mapped_column(ForeignKey('tasks.id', ondelete='CASCADE'), nullable=False)
+    date: Mapped[date] = mapped_column(Date, nullable=False)
+
+    __table_args__ = (UniqueConstraint('task_id', 'date', name='uq_task_occurrences_task_id_date'),)
+
+    def __str__(self):
+        return f'<TaskOccurrences {self.id}: {self.task_id}-{self.date}/>'
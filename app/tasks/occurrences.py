@@ -0,0 +1,91 @@
+from datetime import date, timedelta
+from typing import List
+
+from sqlalchemy import Select, select, func, delete, literal, all_, or_, tuple_, Date, Integer, Row
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.services import DatabaseService
+from app.database.unit_of_work import commit
+from app.schedulers.changes import TaskScheduleDelta
+from app.schedulers.models import Schedulers
+from app.schedulers.recurrence import RECURRENCE_FIELDS, get_recurrence
+from app.schedulers.utils import WEEK_DAYS
+from app.settings import settings
+from app.tasks.models import Tasks, TaskOccurrences
+
+
+class TaskOccurrenceService(DatabaseService):
+    model = TaskOccurrences
+    DELTA_BATCH_SIZE = 10000
+
+    @classmethod
+    async def regenerate(cls, session: AsyncSession, filters: list) -> None:
+        # Даты задач по правилу расписания (settings.occurrences.ENABLED). Период задачи обрабатывается частями
+        # по CHUNK_DAYS дней: в каждой удаляются лишние даты и добавляются недостающие, совпадающие не трогаются.
+        if not settings.occurrences.ENABLED:
+            return
+        query: Select = (
+            select(Tasks.id, Tasks.start_date, Tasks.end_date,
+                   *[getattr(Schedulers, field) for field in (*WEEK_DAYS, *RECURRENCE_FIELDS)])
+            .outerjoin(Schedulers, Schedulers.id == Tasks.scheduler_id)
+            .where(*filters)
+        )
+        for task in (await session.execute(query)).all():
+            await cls.regenerate_task(session, task)
+        await commit(session)
+
+    @classmethod
+    async def regenerate_task(cls, session: AsyncSession, task: Row) -> None:
+        rule = get_recurrence(task, task.start_date)
+        await session.execute(
+            delete(cls.model)
+            .where(cls.model.task_id == task.id,
+                   or_(cls.model.date < task.start_date, cls.model.date > task.end_date))
+        )
+        chunk_from: date = task.start_date
+        while chunk_from <= task.end_date:
+            chunk_to: date = min(chunk_from + timedelta(days=settings.occurrences.CHUNK_DAYS - 1), task.end_date)
+            days = literal(list(rule.occurrences(chunk_from, chunk_to)), ARRAY(Date))
+            await session.execute(
+                delete(cls.model)
+                .where(cls.model.task_id == task.id,
+                       cls.model.date >= chunk_from,
+                       cls.model.date <= chunk_to,
+                       cls.model.date != all_(days))
+            )
+            stmt = (
+                pg_insert(cls.model)
+                .from_select(['task_id', 'date'], select(literal(task.id), func.unnest(days)))
+                .on_conflict_do_nothing(constraint='uq_task_occurrences_task_id_date')
+            )
+            await session.execute(stmt)
+            chunk_from = chunk_to + timedelta(days=1)
+
+    @classmethod
+    async def apply_schedule_deltas(cls, session: AsyncSession, user_id: int, deltas: List[TaskScheduleDelta]) -> None:
+        # Потребитель app.schedulers.changes: меняются только добавленные и убранные даты.
+        if not settings.occurrences.ENABLED:
+            return
+        for is_added in (False, True):
+            rows = [(delta.task_id, day) for delta in deltas for day in (delta.added if is_added else delta.removed)]
+            for start in range(0, len(rows), cls.DELTA_BATCH_SIZE):
+                batch = rows[start:start + cls.DELTA_BATCH_SIZE]
+                source: Select = select(func.unnest(literal([task_id for task_id, _ in batch], ARRAY(Integer))),
+                                        func.unnest(literal([day for _, day in batch], ARRAY(Date))))
+                if is_added:
+                    stmt = (
+                        pg_insert(cls.model)
+                        .from_select(['task_id', 'date'], source)
+                        .on_conflict_do_nothing(constraint='uq_task_occurrences_task_id_date')
+                    )
+                else:
+                    stmt = delete(cls.model).where(tuple_(cls.model.task_id, cls.model.date).in_(source))
+                await session.execute(stmt)
+        await commit(session)
+
+    @classmethod
+    async def clear(cls, session: AsyncSession, filters: list) -> None:
+        if not settings.occurrences.ENABLED:
+            return
+        await session.execute(delete(cls.model).where(cls.model.task_id.in_(select(Tasks.id).where(*filters))))
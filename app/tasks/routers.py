@@ -1,14 +1,17 @@
-from typing import Annotated
+from typing import Annotated, List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi_pagination import Page
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database.pagination import CursorPage, CursorParams, get_cursor_params
 from app.database.settings import db_settings
-from app.tasks.schemas import TaskListSchema, TaskDetailSchema, TaskBaseCreateSchema
+from app.tasks.schemas import (TaskListSchema, TaskDetailSchema, TaskBaseCreateSchema, TaskBulkCreateSchema,
+                               TaskBulkUpdateSchema, TaskBulkDeleteSchema, TaskBulkSchema)
 from app.tasks.services import TaskService
 from app.users.schemas import UserReadSchema
 from app.users.services import UserService
+from app.utils import get_conditional_headers, is_not_modified
 
 router = APIRouter(
     prefix='/tasks',
@@ -17,27 +20,63 @@ router = APIRouter(
 
 
 @router.get('/list/', response_model=Page[TaskListSchema])
-async def get_list(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def get_list(request: Request,
+                   response: Response,
+                   session: Annotated[AsyncSession, Depends(db_settings.get_read_session)],
                    user: Annotated[UserReadSchema, Depends(UserService.get_current_user)]):
+    etag, last_modified = await TaskService.task_list_validators(session, user, dict(request.query_params))
+    # If-Modified-Since для списка не проверяется: по max(updated) не видно удаленных задач.
+    if is_not_modified(request.headers, etag):
+        return Response(status_code=304, headers=get_conditional_headers(etag, last_modified))
+    response.headers.update(get_conditional_headers(etag, last_modified))
     return await TaskService.task_list(session, user)
 
 
+@router.get('/list/cursor/', response_model=CursorPage[TaskListSchema])
+async def get_list_cursor(session: Annotated[AsyncSession, Depends(db_settings.get_read_session)],
+                          user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
+                          params: Annotated[CursorParams, Depends(get_cursor_params)]):
+    return await TaskService.task_list(session, user, params)
+
+
 @router.get('/detail/{task_id}/', response_model=TaskDetailSchema)
-async def get_detail(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def get_detail(request: Request,
+                     response: Response,
+                     session: Annotated[AsyncSession, Depends(db_settings.get_read_session)],
                      user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
                      task_id: int):
+    validators = await TaskService.task_detail_validators(session, user, task_id)
+    if validators:
+        headers: dict[str, str] = get_conditional_headers(*validators)
+        if is_not_modified(request.headers, *validators):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
     return await TaskService.task_detail(session, user, task_id)
 
 
 @router.post('/create/', response_model=TaskDetailSchema)
-async def create(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def create(session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
                  user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
                  data: TaskBaseCreateSchema):
     return await TaskService.task_create(session, user, data)
 
 
+@router.post('/create/bulk/', response_model=List[TaskBulkSchema])
+async def create_bulk(session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
+                      user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
+                      data: TaskBulkCreateSchema):
+    return await TaskService.task_create_many(session, user, data.items)
+
+
+@router.put('/update/bulk/', response_model=List[TaskBulkSchema])
+async def update_bulk(session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
+                      user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
+                      data: TaskBulkUpdateSchema):
+    return await TaskService.task_update_many(session, user, data.items)
+
+
 @router.put('/update/{task_id}/', response_model=TaskDetailSchema)
-async def update(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def update(session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
                  user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
                  task_id: int,
                  data: TaskBaseCreateSchema):
@@ -45,7 +84,14 @@ async def update(session: Annotated[AsyncSession, Depends(db_settings.get_sessio
 
 
 @router.delete('/delete/{task_id}')
-async def delete(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def delete(session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
                  user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
                  task_id: int):
     await TaskService.task_delete(session, user, task_id)
+
+
+@router.post('/delete/bulk/', response_model=List[int])
+async def delete_bulk(session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
+                      user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
+                      data: TaskBulkDeleteSchema):
+    return await TaskService.task_delete_many(session, user, data.ids)
@@ -1,6 +1,7 @@
-from datetime import date, datetime
+from datetime import date, datetime, time
+from typing import List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.categories.schemas import CategoryListSchema
 from app.schedulers.schemas import SchedulerDetailSchema
@@ -12,6 +13,7 @@ class TaskBaseSchema(BaseModel):
     end_date: date
     quantity: int
     quantity_unit: str
+    remind_time: time | None = None
 
 
 class TaskBaseCreateSchema(TaskBaseSchema):
@@ -29,3 +31,23 @@ class TaskDetailSchema(TaskListSchema):
     scheduler: SchedulerDetailSchema
     created: datetime
     updated: datetime
+
+
+class TaskBulkCreateSchema(BaseModel):
+    items: List[TaskBaseCreateSchema] = Field(min_length=1, max_length=1000)
+
+
+class TaskBulkUpdateItemSchema(TaskBaseCreateSchema):
+    id: int
+
+
+class TaskBulkUpdateSchema(BaseModel):
+    items: List[TaskBulkUpdateItemSchema] = Field(min_length=1, max_length=1000)
+
+
+class TaskBulkDeleteSchema(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=1000)
+
+
+class TaskBulkSchema(TaskBaseCreateSchema):
+    id: int
@@ -1,38 +1,98 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import Select, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
+from app.cache.reports import bump_reports_version
+from app.database.pagination import CursorParams
 from app.database.services import DatabaseService
+from app.database.unit_of_work import on_commit
 from app.tasks import Tasks
-from app.tasks.schemas import TaskBaseCreateSchema
+from app.tasks.occurrences import TaskOccurrenceService
+from app.tasks.schemas import TaskBaseCreateSchema, TaskBulkUpdateItemSchema
 from app.users.schemas import UserReadSchema
+from app.utils import make_etag
 
 
 class TaskService(DatabaseService):
     model = Tasks
+    tombstone_entity = 'tasks'
 
     @classmethod
-    async def task_list(cls, session: AsyncSession, user: UserReadSchema):
+    async def task_list(cls, session: AsyncSession, user: UserReadSchema, cursor_params: CursorParams | None = None):
         options = [joinedload(cls.model.category), ]
-        return await cls.get_list(session, options=options, user_id=user.id, is_paginate=True)
+        return await cls.get_list(session, options=options, user_id=user.id, is_paginate=True,
+                                  cursor_params=cursor_params, cursor_keys=('created', 'id'))
 
     @classmethod
     async def task_detail(cls, session: AsyncSession, user: UserReadSchema, task_id):
         options = [selectinload(cls.model.category), selectinload(cls.model.scheduler)]
         return await cls.get_detail(session, options=options, user_id=user.id, id=task_id)
 
+    @classmethod
+    async def task_list_validators(cls, session: AsyncSession,
+                                   user: UserReadSchema,
+                                   params: dict) -> tuple[str, datetime | None]:
+        # Количество задач в ETag: удаление не меняет max(updated).
+        query: Select = select(func.count(), func.max(cls.model.updated)).where(cls.model.user_id == user.id)
+        count, last_modified = (await session.execute(query)).one()
+        return make_etag('tasks', user.id, count, last_modified, params), last_modified
+
+    @classmethod
+    async def task_detail_validators(cls, session: AsyncSession,
+                                     user: UserReadSchema,
+                                     task_id: int) -> tuple[str, datetime] | None:
+        query: Select = select(cls.model.updated).where(cls.model.id == task_id, cls.model.user_id == user.id)
+        last_modified: datetime | None = await session.scalar(query)
+        if last_modified is None:
+            return None
+        return make_etag('task', task_id, last_modified), last_modified
+
     @classmethod
     async def task_create(cls, session: AsyncSession, user: UserReadSchema, data: TaskBaseCreateSchema):
         options = [selectinload(cls.model.category), selectinload(cls.model.scheduler)]
-        return await cls.create(session, options=options, user_id=user.id, **data.model_dump())
+        task = await cls.create(session, options=options, user_id=user.id, **data.model_dump())
+        await TaskOccurrenceService.regenerate(session, [Tasks.id == task.id])
+        await on_commit(session, lambda: bump_reports_version(user.id))
+        return task
 
     @classmethod
     async def task_update(cls, session: AsyncSession, user: UserReadSchema, task_id: int, data: TaskBaseCreateSchema):
         options = [selectinload(cls.model.category), selectinload(cls.model.scheduler)]
-        return await cls.update(session,
+        task = await cls.update(session,
                                 filters={'id': task_id, 'user_id': user.id},
                                 options=options,
                                 **data.model_dump())
+        await TaskOccurrenceService.regenerate(session, [Tasks.id == task.id])
+        await on_commit(session, lambda: bump_reports_version(user.id))
+        return task
 
     @classmethod
     async def task_delete(cls, session: AsyncSession, user: UserReadSchema, task_id):
         await cls.delete(session, filters={'id': task_id, 'user_id': user.id})
+        await on_commit(session, lambda: bump_reports_version(user.id))
+
+    @classmethod
+    async def task_create_many(cls, session: AsyncSession, user: UserReadSchema, items: List[TaskBaseCreateSchema]):
+        tasks = await cls.create_many(session, [{'user_id': user.id, **item.model_dump()} for item in items])
+        await TaskOccurrenceService.regenerate(session, [Tasks.id.in_([task.id for task in tasks])])
+        await on_commit(session, lambda: bump_reports_version(user.id))
+        return tasks
+
+    @classmethod
+    async def task_update_many(cls, session: AsyncSession,
+                               user: UserReadSchema,
+                               items: List[TaskBulkUpdateItemSchema]):
+        tasks = await cls.update_many(session, [item.model_dump() for item in items], filters={'user_id': user.id})
+        await TaskOccurrenceService.regenerate(session, [Tasks.id.in_([task.id for task in tasks])])
+        await on_commit(session, lambda: bump_reports_version(user.id))
+        return tasks
+
+    @classmethod
+    async def task_delete_many(cls, session: AsyncSession, user: UserReadSchema, ids: List[int]) -> List[int]:
+        deleted_ids: List[int] = await cls.delete_many(session, ids, filters={'user_id': user.id})
+        await on_commit(session, lambda: bump_reports_version(user.id))
+        return deleted_ids
+
@@ -0,0 +1,5 @@
+__all__ = (
+    'Jobs',
+)
+
+from app.tasks_celery.models import Jobs
\ No newline at end of file
@@ -0,0 +1,256 @@
+import heapq
+from datetime import datetime, timedelta
+from itertools import count
+from typing import Any, List
+
+from sqlalchemy import Select, select, update, delete, func, or_, and_, text, exists, literal, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.settings import db_settings
+from app.database.unit_of_work import commit, on_commit
+from app.settings import settings
+from app.tasks_celery.models import Jobs
+
+
+class JobMessage:
+    # locked_until - метка захвата: результат записывается, только пока задание не забрал другой воркер.
+    __slots__ = ('id', 'name', 'payload', 'attempts', 'key', 'locked_until')
+
+    def __init__(self, id: int,
+                 name: str,
+                 payload: dict[str, Any],
+                 attempts: int = 0,
+                 key: str | None = None,
+                 locked_until: datetime | None = None):
+        self.id = id
+        self.name = name
+        self.payload = payload
+        self.attempts = attempts
+        self.key = key
+        self.locked_until = locked_until
+
+    def __repr__(self):
+        return f'<JobMessage {self.id}: {self.name}/>'
+
+
+class BaseBroker:
+    async def enqueue(self, session: AsyncSession | None,
+                      name: str,
+                      payload: dict[str, Any],
+                      delay_seconds: float = 0,
+                      key: str | None = None) -> None:
+        raise NotImplementedError
+
+    async def enqueue_periodic(self, name: str, interval_seconds: float) -> bool:
+        # Общее для всех воркеров расписание: задание не ставится, если за interval_seconds оно уже ставилось.
+        raise NotImplementedError
+
+    async def claim(self, limit: int) -> List[JobMessage]:
+        raise NotImplementedError
+
+    async def complete(self, message: JobMessage) -> None:
+        raise NotImplementedError
+
+    async def retry(self, message: JobMessage, error: str | None, delay_seconds: float, attempt: bool = True) -> None:
+        # attempt=False - отложить без учета попытки (ограничение частоты).
+        raise NotImplementedError
+
+    async def fail(self, message: JobMessage, error: str, attempt: bool = True) -> None:
+        raise NotImplementedError
+
+    async def cleanup(self, before: datetime) -> int:
+        return 0
+
+
+class MemoryBroker(BaseBroker):
+    # Очередь в памяти процесса: для тестов и локального запуска воркера без базы заданий.
+    def __init__(self):
+        self.heap: List[tuple[datetime, int, JobMessage]] = []
+        self.running: dict[int, JobMessage] = {}
+        self.active_keys: set[str] = set()
+        self.ids = count(1)
+        self.finished: List[tuple[JobMessage, str, str | None]] = []
+        self.periodic_runs: dict[str, datetime] = {}
+
+    async def enqueue(self, session: AsyncSession | None,
+                      name: str,
+                      payload: dict[str, Any],
+                      delay_seconds: float = 0,
+                      key: str | None = None) -> None:
+        async def push():
+            if key is not None and key in self.active_keys:
+                return
+            if key is not None:
+                self.active_keys.add(key)
+            message = JobMessage(next(self.ids), name, payload, key=key)
+            self.push(message, delay_seconds)
+
+        # В транзакции задание появляется только после ее фиксации, как и в базе.
+        if session is None:
+            await push()
+        else:
+            await on_commit(session, push)
+
+    async def enqueue_periodic(self, name: str, interval_seconds: float) -> bool:
+        now: datetime = datetime.utcnow()
+        if name in self.periodic_runs and now - self.periodic_runs[name] < timedelta(seconds=interval_seconds):
+            return False
+        self.periodic_runs[name] = now
+        await self.enqueue(None, name, {}, key=name)
+        return True
+
+    def push(self, message: JobMessage, delay_seconds: float) -> None:
+        heapq.heappush(self.heap, (datetime.utcnow() + timedelta(seconds=delay_seconds), message.id, message))
+
+    async def claim(self, limit: int) -> List[JobMessage]:
+        messages = []
+        now: datetime = datetime.utcnow()
+        while self.heap and self.heap[0][0] <= now and len(messages) < limit:
+            message: JobMessage = heapq.heappop(self.heap)[2]
+            self.running[message.id] = message
+            messages.append(message)
+        return messages
+
+    def finish(self, message: JobMessage, status: str, error: str | None = None) -> None:
+        self.running.pop(message.id, None)
+        self.active_keys.discard(message.key)
+        self.finished.append((message, status, error))
+
+    async def complete(self, message: JobMessage) -> None:
+        self.finish(message, 'done')
+
+    async def retry(self, message: JobMessage, error: str | None, delay_seconds: float, attempt: bool = True) -> None:
+        self.running.pop(message.id, None)
+        if attempt:
+            message.attempts += 1
+        self.push(message, delay_seconds)
+
+    async def fail(self, message: JobMessage, error: str, attempt: bool = True) -> None:
+        if attempt:
+            message.attempts += 1
+        self.finish(message, 'failed', error)
+
+    async def cleanup(self, before: datetime) -> int:
+        removed: int = len(self.finished)
+        self.finished.clear()
+        return removed
+
+
+class DatabaseBroker(BaseBroker):
+    # Очередь в таблице jobs: задание ставится в транзакции запроса, воркеры забирают его через SKIP LOCKED.
+    # Задание зависшего воркера снова доступно после VISIBILITY_SECONDS, повторный захват считается попыткой.
+    model = Jobs
+
+    async def enqueue(self, session: AsyncSession | None,
+                      name: str,
+                      payload: dict[str, Any],
+                      delay_seconds: float = 0,
+                      key: str | None = None) -> None:
+        stmt = (
+            pg_insert(self.model)
+            .values(name=name,
+                    payload=payload,
+                    key=key,
+                    run_after=func.timezone('utc', func.now()) + timedelta(seconds=delay_seconds))
+            .on_conflict_do_nothing(index_elements=['key'], index_where=text("status IN ('pending', 'running')"))
+        )
+        if session is not None:
+            await session.execute(stmt)
+            await commit(session)
+            return
+        async with db_settings.session() as session_db:
+            await session_db.execute(stmt)
+            await session_db.commit()
+
+    async def enqueue_periodic(self, name: str, interval_seconds: float) -> bool:
+        # Последний запуск - строка jobs с ключом name (в том числе выполненная). Advisory lock по ключу
+        # упорядочивает проверку и вставку: второй воркер ждет фиксации первого и видит его строку.
+        now = func.timezone('utc', func.now())
+        recent: Select = (
+            select(self.model.id)
+            .where(self.model.key == name, self.model.created > now - timedelta(seconds=interval_seconds))
+        )
+        stmt = (
+            pg_insert(self.model)
+            .from_select(['name', 'key'], select(literal(name), literal(name)).where(~exists(recent)))
+            .on_conflict_do_nothing(index_elements=['key'], index_where=text("status IN ('pending', 'running')"))
+        )
+        async with db_settings.session() as session:
+            await session.execute(select(func.pg_advisory_xact_lock(func.hashtext(name))))
+            result = await session.execute(stmt)
+            await session.commit()
+        return bool(result.rowcount)
+
+    async def claim(self, limit: int) -> List[JobMessage]:
+        now = func.timezone('utc', func.now())
+        query_ids: Select = (
+            select(self.model.id)
+            .where(or_(and_(self.model.status == 'pending', self.model.run_after <= now),
+                       and_(self.model.status == 'running', self.model.locked_until < now)))
+            .order_by(self.model.run_after)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(query_ids.scalar_subquery()))
+            .values(status='running',
+                    attempts=case((self.model.status == 'running', self.model.attempts + 1), else_=self.model.attempts),
+                    locked_until=now + timedelta(seconds=settings.jobs.VISIBILITY_SECONDS))
+            .returning(self.model.id, self.model.name, self.model.payload, self.model.attempts, self.model.key,
+                       self.model.locked_until)
+        )
+        async with db_settings.session() as session:
+            result = await session.execute(stmt)
+            messages = [JobMessage(*row) for row in result.all()]
+            await session.commit()
+        return messages
+
+    async def set_values(self, message: JobMessage, **values) -> bool:
+        # Воркер, потерявший захват (истек locked_until, задание забрал другой), ничего не меняет.
+        async with db_settings.session() as session:
+            result = await session.execute(
+                update(self.model)
+                .where(self.model.id == message.id,
+                       self.model.status == 'running',
+                       self.model.locked_until == message.locked_until)
+                .values(**values)
+            )
+            await session.commit()
+        return bool(result.rowcount)
+
+    async def complete(self, message: JobMessage) -> None:
+        await self.set_values(message, status='done', locked_until=None, error=None,
+                              finished=func.timezone('utc', func.now()))
+
+    async def retry(self, message: JobMessage, error: str | None, delay_seconds: float, attempt: bool = True) -> None:
+        values = {'status': 'pending',
+                  'locked_until': None,
+                  'run_after': func.timezone('utc', func.now()) + timedelta(seconds=delay_seconds)}
+        if attempt:
+            values.update(attempts=self.model.attempts + 1, error=error)
+        await self.set_values(message, **values)
+
+    async def fail(self, message: JobMessage, error: str, attempt: bool = True) -> None:
+        values = {'status': 'failed',
+                  'error': error,
+                  'locked_until': None,
+                  'finished': func.timezone('utc', func.now())}
+        if attempt:
+            values.update(attempts=self.model.attempts + 1)
+        await self.set_values(message, **values)
+
+    async def cleanup(self, before: datetime) -> int:
+        async with db_settings.session() as session:
+            result = await session.execute(
+                delete(self.model).where(self.model.status.in_(('done', 'failed')), self.model.finished < before)
+            )
+            await session.commit()
+        return result.rowcount
+
+
+def get_broker() -> BaseBroker:
+    if settings.jobs.BROKER == 'memory':
+        return MemoryBroker()
+    return DatabaseBroker()
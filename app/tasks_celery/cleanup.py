@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.mail.services import MailOutboxService
+from app.settings import settings
+from app.sync.services import SyncService
+from app.tasks_celery.jobs import job, broker
+
+
+@job('cleanup.tombstones')
+async def cleanup_tombstones(session: AsyncSession) -> None:
+    await SyncService.delete_expired_tombstones(session)
+
+
+@job('cleanup.mail_outbox')
+async def cleanup_mail_outbox(session: AsyncSession) -> None:
+    await MailOutboxService.delete_sent(session, datetime.utcnow() - timedelta(days=settings.jobs.KEEP_DAYS))
+
+
+@job('cleanup.jobs')
+async def cleanup_jobs(session: AsyncSession) -> None:
+    await broker.cleanup(datetime.utcnow() - timedelta(days=settings.jobs.KEEP_DAYS))
@@ -0,0 +1,74 @@
+from time import monotonic
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.settings import settings
+from app.tasks_celery.brokers import BaseBroker, get_broker
+
+broker: BaseBroker = get_broker()
+
+
+class JobDefinition:
+    # func(session, **payload); при ошибке повтор через retry_seconds * 2 ** (попытка - 1), но не больше
+    # max_retry_seconds; rate_limit - заданий в секунду на процесс воркера.
+    __slots__ = ('name', 'func', 'max_attempts', 'retry_seconds', 'max_retry_seconds', 'rate_limit', 'timeout_seconds')
+
+    def __init__(self, name: str,
+                 func: Callable[..., Awaitable],
+                 max_attempts: int = 5,
+                 retry_seconds: float = 10,
+                 max_retry_seconds: float = 3600,
+                 rate_limit: float | None = None,
+                 timeout_seconds: float = 60):
+        self.name = name
+        self.func = func
+        self.max_attempts = max_attempts
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.rate_limit = rate_limit
+        self.timeout_seconds = timeout_seconds
+        # Иначе задание забирает второй воркер, пока первый еще его выполняет.
+        if timeout_seconds >= settings.jobs.VISIBILITY_SECONDS:
+            raise ValueError(f'Job {name!r}: timeout_seconds must be less than JOBS__VISIBILITY_SECONDS')
+
+    def get_retry_delay(self, attempts: int) -> float:
+        return min(self.retry_seconds * 2 ** attempts, self.max_retry_seconds)
+
+
+jobs: dict[str, JobDefinition] = {}
+
+
+def job(name: str, **options) -> Callable:
+    def decorator(func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        jobs[name] = JobDefinition(name, func, **options)
+        return func
+
+    return decorator
+
+
+class RateLimiter:
+    # Token bucket на процесс: ограничение делится на число воркеров.
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens: float = rate
+        self.updated: float = monotonic()
+
+    def acquire(self) -> float:
+        # 0 - можно выполнять, иначе - через сколько секунд появится токен.
+        now: float = monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+async def send_job(name: str,
+                   payload: dict[str, Any] | None = None,
+                   session: AsyncSession | None = None,
+                   delay_seconds: float = 0,
+                   key: str | None = None) -> None:
+    # С session задание ставится в ее транзакции, без нее - отдельной транзакцией.
+    await broker.enqueue(session, name, payload or {}, delay_seconds, key)
@@ -0,0 +1,15 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.mail.services import MailOutboxService, SMTPConnection
+from app.settings import settings
+from app.tasks_celery.jobs import job
+
+# Одно SMTP-соединение на процесс воркера.
+connection = SMTPConnection()
+
+
+@job('mail.send_outbox', max_attempts=3, retry_seconds=30, rate_limit=1, timeout_seconds=120)
+async def send_outbox(session: AsyncSession) -> None:
+    # Письма с ошибкой отправки MailOutboxService повторяет сам по next_attempt.
+    while await MailOutboxService.send_pending(session, connection) >= settings.email.OUTBOX_BATCH_SIZE:
+        pass
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from sqlalchemy import String, Integer, Text, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.settings import Base
+
+
+class Jobs(Base):
+    name: Mapped[str] = mapped_column(String(63), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, server_default=text("'{}'::jsonb"))
+    # Ключ для исключения дублей: пока задание с ключом ожидает или выполняется, такое же не ставится.
+    key: Mapped[str] = mapped_column(String(127), nullable=True)
+    status: Mapped[str] = mapped_column(String(15), server_default=text("'pending'"))
+    attempts: Mapped[int] = mapped_column(Integer, server_default=text('0'))
+    error: Mapped[str] = mapped_column(Text, nullable=True)
+    run_after: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"))
+    locked_until: Mapped[datetime] = mapped_column(nullable=True)
+    created: Mapped[datetime] = mapped_column(server_default=text("TIMEZONE('utc', now())"))
+    finished: Mapped[datetime] = mapped_column(nullable=True)
+
+    __table_args__ = (
+        Index('ix_jobs_status_run_after', 'status', 'run_after'),
+        Index('uq_jobs_key_active', 'key', unique=True, postgresql_where=text("status IN ('pending', 'running')")),
+        Index('ix_jobs_key_created', 'key', 'created'),
+    )
+
+    def __str__(self):
+        return f'<Jobs {self.id}: {self.name}-{self.status}/>'
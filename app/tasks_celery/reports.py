@@ -0,0 +1,28 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.reports import register_reports_consumer
+from app.reports.services import ReportServices
+from app.settings import settings
+from app.tasks_celery.jobs import job, send_job
+from app.users.models import Users
+from app.users.schemas import UserReadSchema
+
+# Задержка подготовки отчетов: несколько записей подряд дают одно задание.
+REPORTS_PRECOMPUTE_DELAY_SECONDS = 5
+
+
+@job('reports.precompute', max_attempts=3, rate_limit=20)
+async def precompute_reports(session: AsyncSession, user_id: int) -> None:
+    if not settings.cache.REPORTS_ENABLED:
+        return
+    user_db: Users | None = await session.get(Users, user_id)
+    if user_db is None or not user_db.active:
+        return
+    await ReportServices.precompute(session, UserReadSchema.model_validate(user_db, from_attributes=True))
+
+
+@register_reports_consumer
+async def enqueue_precompute_reports(user_id: int) -> None:
+    if settings.jobs.PRECOMPUTE_REPORTS:
+        await send_job('reports.precompute', {'user_id': user_id},
+                       delay_seconds=REPORTS_PRECOMPUTE_DELAY_SECONDS, key=f'reports.precompute:{user_id}')
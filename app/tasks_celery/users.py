@@ -1,16 +1,23 @@
 from email.message import EmailMessage
 
 from pydantic import EmailStr
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.mail.services import send_mail
+from app.mail.services import MailOutboxService
 from app.mail.templates import recovery_password_message, verify_email_message
+from app.tasks_celery.jobs import send_job
 
 
-def send_mail_recovery_password(email: EmailStr, username: str, confirmation_token: str) -> None:
+async def send_mail_recovery_password(session: AsyncSession,
+                                      email: EmailStr,
+                                      username: str,
+                                      confirmation_token: str) -> None:
     template_message: EmailMessage = recovery_password_message(email, username, confirmation_token)
-    send_mail(template_message)
+    await MailOutboxService.enqueue(session, template_message)
+    await send_job('mail.send_outbox', session=session, key='mail.send_outbox')
 
 
-def send_mail_email_confirmation(email: EmailStr, token: str) -> None:
+async def send_mail_email_confirmation(session: AsyncSession, email: EmailStr, token: str) -> None:
     template_message: EmailMessage = verify_email_message(email, token)
-    send_mail(template_message)
+    await MailOutboxService.enqueue(session, template_message)
+    await send_job('mail.send_outbox', session=session, key='mail.send_outbox')
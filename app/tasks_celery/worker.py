@@ -0,0 +1,85 @@
+"""
+Воркер фоновых заданий: письма, подготовка отчетов, очистка. Воркеров может быть несколько.
+
+> python -m app.tasks_celery.worker [--once]
+"""
+import argparse
+import asyncio
+from time import monotonic
+
+from app.database.settings import db_settings
+from app.settings import settings
+from app.tasks_celery import cleanup, mail, reports  # noqa: F401 - регистрация заданий
+from app.tasks_celery.brokers import JobMessage
+from app.tasks_celery.jobs import RateLimiter, broker, jobs
+
+# Периодические задания (секунды). Интервал общий для всех воркеров: последний запуск берется из таблицы jobs,
+# поэтому при нескольких воркерах задание ставится один раз за интервал (для memory - в пределах процесса).
+PERIODIC_JOBS: dict[str, float] = {
+    'mail.send_outbox': settings.email.OUTBOX_POLL_SECONDS,
+    'cleanup.tombstones': 3600,
+    'cleanup.mail_outbox': 3600,
+    'cleanup.jobs': 3600,
+}
+
+
+async def run_job(message: JobMessage, limiters: dict[str, RateLimiter]) -> None:
+    definition = jobs.get(message.name)
+    if definition is None:
+        await broker.fail(message, f'Unknown job {message.name!r}')
+        return
+    if message.attempts >= definition.max_attempts:
+        # Попытки израсходованы повторными захватами после зависания или падения воркера.
+        await broker.fail(message, 'Visibility timeout exceeded', attempt=False)
+        return
+    if definition.rate_limit:
+        limiter: RateLimiter = limiters.setdefault(message.name, RateLimiter(definition.rate_limit))
+        wait: float = limiter.acquire()
+        if wait:
+            await broker.retry(message, None, wait, attempt=False)
+            return
+    try:
+        async with asyncio.timeout(definition.timeout_seconds):
+            async with db_settings.session() as session:
+                await definition.func(session, **message.payload)
+    except Exception as err:
+        error: str = f'{type(err).__name__}: {err}'
+        if message.attempts + 1 >= definition.max_attempts:
+            await broker.fail(message, error)
+        else:
+            await broker.retry(message, error, definition.get_retry_delay(message.attempts))
+        return
+    await broker.complete(message)
+
+
+async def enqueue_periodic(last_runs: dict[str, float]) -> None:
+    now: float = monotonic()
+    for name, interval in PERIODIC_JOBS.items():
+        if name not in last_runs or now - last_runs[name] >= interval:
+            await broker.enqueue_periodic(name, interval)
+            last_runs[name] = now
+
+
+async def run_worker(once: bool = False) -> None:
+    limiters: dict[str, RateLimiter] = {}
+    last_runs: dict[str, float] = {}
+    try:
+        while True:
+            await enqueue_periodic(last_runs)
+            messages = await broker.claim(settings.jobs.CONCURRENCY)
+            if messages:
+                await asyncio.gather(*[run_job(message, limiters) for message in messages])
+                continue
+            if once:
+                break
+            await asyncio.sleep(settings.jobs.POLL_SECONDS)
+    finally:
+        mail.connection.close()
+        await db_settings.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run background jobs.')
+    parser.add_argument('--once', action='store_true', help='Run due jobs and exit.')
+    args = parser.parse_args()
+    asyncio.run(run_worker(args.once))
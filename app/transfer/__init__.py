@@ -0,0 +1,5 @@
+__all__ = (
+    'router'
+)
+
+from app.transfer.routers import router
\ No newline at end of file
@@ -0,0 +1,44 @@
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.settings import db_settings
+from app.exceptions import ImportDataInvalidException
+from app.transfer.services import ExportService, ImportService
+from app.transfer.utils import TRANSFER_FIELDS
+from app.users.schemas import UserReadSchema
+from app.users.services import UserService
+
+router = APIRouter(
+    tags=['Transfer']
+)
+
+Entity = Literal['categories', 'schedulers', 'tasks', 'done_tasks']
+
+
+@router.get('/export/', description='Выгрузка категорий, расписаний, задач и выполненных задач пользователя')
+async def export_data(user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
+                      output: Literal['ndjson', 'csv'] = 'ndjson',
+                      entity: Entity = None):
+    if output == 'csv' and not entity:
+        raise ImportDataInvalidException('entity is required for csv')
+    entities: tuple[str, ...] = (entity, ) if entity else tuple(TRANSFER_FIELDS)
+    media_type = 'text/csv' if output == 'csv' else 'application/x-ndjson'
+    filename = f'{entity or "export"}.{output}'
+    return StreamingResponse(ExportService.stream_export(user, entities, output),
+                             media_type=media_type,
+                             headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+
+@router.post('/import/', description='Загрузка данных в формате /export/: NDJSON или CSV одной сущности')
+async def import_data(request: Request,
+                      session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
+                      user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
+                      input: Literal['ndjson', 'csv'] = 'ndjson',
+                      entity: Entity = None):
+    if input == 'csv' and not entity:
+        raise ImportDataInvalidException('entity is required for csv')
+    with await ImportService.spool(request.stream()) as file:
+        return await ImportService.import_data(session, user, file, input, entity)
@@ -0,0 +1,275 @@
+import csv
+import io
+import json
+from tempfile import SpooledTemporaryFile
+from typing import AsyncGenerator, AsyncIterator, Iterator, Literal
+
+from asyncpg import DataError, IntegrityConstraintViolationError
+from sqlalchemy import Select, select, update, func, literal, false, Table, Date, and_
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.reports import bump_reports_version
+from app.categories import Categories
+from app.database.settings import db_settings
+from app.database.unit_of_work import on_commit
+from app.done_tasks import DoneTasks
+from app.done_tasks.services import TaskMonthlyStatsService
+from app.exceptions import ImportDataInvalidException
+from app.schedulers import Schedulers
+from app.schedulers.recurrence import RECURRENCE_FIELDS
+from app.schedulers.utils import WEEK_DAYS
+from app.tasks import Tasks
+from app.tasks.occurrences import TaskOccurrenceService
+from app.transfer.staging import (staging_metadata, import_categories, import_schedulers, import_tasks,
+                                  import_done_tasks, STAGING_TABLES)
+from app.transfer.utils import TRANSFER_FIELDS, convert_record
+from app.users.schemas import UserReadSchema
+
+
+class ExportService:
+    STREAM_CHUNK_SIZE = 1000
+
+    @classmethod
+    def get_export_query(cls, user: UserReadSchema, entity: str) -> Select:
+        if entity == 'done_tasks':
+            return (
+                select(*[getattr(DoneTasks, field) for field in TRANSFER_FIELDS[entity]])
+                .join(Tasks, Tasks.id == DoneTasks.task_id)
+                .where(Tasks.user_id == user.id)
+                .order_by(DoneTasks.task_id, DoneTasks.date)
+            )
+        model = {'categories': Categories, 'schedulers': Schedulers, 'tasks': Tasks}[entity]
+        columns = [
+            func.array_to_string(model.exdates, ';').label(field) if field == 'exdates' else getattr(model, field)
+            for field in TRANSFER_FIELDS[entity]
+        ]
+        return (
+            select(*columns)
+            .where(model.user_id == user.id)
+            .order_by(model.id)
+        )
+
+    @classmethod
+    async def stream_export(cls, user: UserReadSchema,
+                            entities: tuple[str, ...],
+                            output: Literal['ndjson', 'csv']) -> AsyncGenerator[str, None]:
+        # Сессия зависимости закрывается до отправки StreamingResponse, поэтому открывается своя.
+        async with await db_settings.open_read_session() as session:
+            for entity in entities:
+                query: Select = cls.get_export_query(user, entity)
+                query_result = await session.stream(query.execution_options(yield_per=cls.STREAM_CHUNK_SIZE))
+                if output == 'csv':
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer)
+                    writer.writerow(TRANSFER_FIELDS[entity])
+                    async for rows in query_result.partitions():
+                        writer.writerows(rows)
+                        yield buffer.getvalue()
+                        buffer.seek(0)
+                        buffer.truncate()
+                else:
+                    async for rows in query_result.mappings().partitions():
+                        yield ''.join(json.dumps({'entity': entity, **row}, default=str) + '\n' for row in rows)
+
+
+class ImportService:
+    BATCH_SIZE = 5000
+    SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+    @classmethod
+    async def spool(cls, stream: AsyncIterator[bytes]) -> SpooledTemporaryFile:
+        # Тело запроса до SPOOL_MAX_SIZE в памяти, дальше - во временном файле.
+        file = SpooledTemporaryFile(max_size=cls.SPOOL_MAX_SIZE, mode='w+b')
+        async for chunk in stream:
+            file.write(chunk)
+        file.seek(0)
+        return file
+
+    @classmethod
+    def read_records(cls, file: SpooledTemporaryFile,
+                     input: Literal['ndjson', 'csv'],
+                     entity: str | None) -> Iterator[tuple[str, tuple]]:
+        text = io.TextIOWrapper(file, encoding='utf-8', newline='')
+        line_number = 0
+        try:
+            if input == 'csv':
+                for line_number, record in enumerate(csv.DictReader(text), start=2):
+                    yield entity, convert_record(entity, record)
+            else:
+                for line_number, line in enumerate(text, start=1):
+                    if not line.strip():
+                        continue
+                    record: dict = json.loads(line)
+                    if record.get('entity') not in TRANSFER_FIELDS:
+                        raise ValueError(f'unknown entity {record.get("entity")!r}')
+                    yield record['entity'], convert_record(record['entity'], record)
+        except (ValueError, TypeError, AttributeError) as err:
+            raise ImportDataInvalidException(f'Line {line_number}: {err}')
+        finally:
+            text.detach()
+
+    @classmethod
+    async def import_data(cls, session: AsyncSession,
+                          user: UserReadSchema,
+                          file: SpooledTemporaryFile,
+                          input: Literal['ndjson', 'csv'],
+                          entity: str | None) -> dict[str, int]:
+        connection = await session.connection()
+        await connection.run_sync(lambda sync_connection: staging_metadata.create_all(sync_connection,
+                                                                                       checkfirst=False))
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        counts: dict[str, int] = dict.fromkeys(TRANSFER_FIELDS, 0)
+        batches: dict[str, list[tuple]] = {entity_name: [] for entity_name in TRANSFER_FIELDS}
+        try:
+            for entity_name, record in cls.read_records(file, input, entity):
+                batch = batches[entity_name]
+                batch.append(record)
+                if len(batch) >= cls.BATCH_SIZE:
+                    await cls.copy_batch(driver_connection, STAGING_TABLES[entity_name], batch)
+                    counts[entity_name] += len(batch)
+                    batch.clear()
+            for entity_name, batch in batches.items():
+                if batch:
+                    await cls.copy_batch(driver_connection, STAGING_TABLES[entity_name], batch)
+                    counts[entity_name] += len(batch)
+        except (IntegrityConstraintViolationError, DataError) as err:
+            raise ImportDataInvalidException(f'{getattr(err, "table_name", None) or "import"}: {err}')
+
+        try:
+            await cls.merge_categories(session, user)
+            await cls.merge_schedulers(session, user)
+            await cls.merge_tasks(session, user)
+            await cls.merge_done_tasks(session, user)
+        except IntegrityError as err:
+            raise ImportDataInvalidException(f'merge: {err.orig}')
+        await on_commit(session, lambda: bump_reports_version(user.id))
+        return counts
+
+    @classmethod
+    async def copy_batch(cls, driver_connection, table: Table, batch: list[tuple]) -> None:
+        columns = [column.name for column in table.columns if column.name != 'target_id']
+        await driver_connection.copy_records_to_table(table.name, records=batch, columns=columns)
+
+    @classmethod
+    async def merge_categories(cls, session: AsyncSession, user: UserReadSchema) -> None:
+        # Существующая категория с тем же названием (uq_title_user_id) сохраняется, задачи ссылаются на нее.
+        stmt = (
+            pg_insert(Categories)
+            .from_select(['title', 'user_id'], select(import_categories.c.title, literal(user.id)).distinct())
+            .on_conflict_do_nothing(constraint='uq_title_user_id')
+        )
+        await session.execute(stmt)
+        await session.execute(
+            update(import_categories)
+            .values(target_id=Categories.id)
+            .where(Categories.user_id == user.id, Categories.title == import_categories.c.title)
+        )
+
+    @classmethod
+    async def merge_schedulers(cls, session: AsyncSession, user: UserReadSchema) -> None:
+        # Расписание сопоставляется только по названию: при конфликте uq_scheduler_title_user_id
+        # используется существующее, поэтому target_id есть у каждой строки файла.
+        days = [import_schedulers.c[day_week] for day_week in WEEK_DAYS]
+        stmt = (
+            pg_insert(Schedulers)
+            .from_select(['title', 'user_id', *WEEK_DAYS, *RECURRENCE_FIELDS],
+                         select(import_schedulers.c.title,
+                                literal(user.id),
+                                *[func.coalesce(day, false()) for day in days],
+                                func.coalesce(import_schedulers.c.frequency, 'weekly'),
+                                func.coalesce(import_schedulers.c.interval_days, 1),
+                                import_schedulers.c.month_day,
+                                import_schedulers.c.month_week,
+                                func.coalesce(import_schedulers.c.exdates, literal([], ARRAY(Date)))))
+            .on_conflict_do_nothing(constraint='uq_scheduler_title_user_id')
+        )
+        await session.execute(stmt)
+        await session.execute(
+            update(import_schedulers)
+            .values(target_id=Schedulers.id)
+            .where(Schedulers.user_id == user.id, Schedulers.title == import_schedulers.c.title)
+        )
+
+    @classmethod
+    async def merge_tasks(cls, session: AsyncSession, user: UserReadSchema) -> None:
+        # Задачи пользователя с тем же id обновляются, остальные создаются с новыми id из последовательности.
+        # Существующие категории и расписания по id из файла берутся, только если их нет в самом файле.
+        await session.execute(
+            update(import_tasks)
+            .values(target_id=Tasks.id)
+            .where(Tasks.id == import_tasks.c.id, Tasks.user_id == user.id)
+        )
+        await session.execute(
+            update(import_tasks)
+            .values(target_id=func.nextval(func.pg_get_serial_sequence('tasks', 'id')))
+            .where(import_tasks.c.target_id.is_(None))
+        )
+
+        fields = ['id', 'title', 'user_id', 'category_id', 'scheduler_id', 'start_date', 'end_date', 'quantity',
+                  'quantity_unit', 'remind_time']
+        user_categories = select(Categories.id).where(Categories.user_id == user.id).subquery('user_categories')
+        user_schedulers = select(Schedulers.id).where(Schedulers.user_id == user.id).subquery('user_schedulers')
+        query_source: Select = (
+            select(import_tasks.c.target_id,
+                   import_tasks.c.title,
+                   literal(user.id),
+                   func.coalesce(import_categories.c.target_id, user_categories.c.id),
+                   func.coalesce(import_schedulers.c.target_id, user_schedulers.c.id),
+                   import_tasks.c.start_date,
+                   import_tasks.c.end_date,
+                   func.coalesce(import_tasks.c.quantity, 0),
+                   import_tasks.c.quantity_unit,
+                   import_tasks.c.remind_time)
+            .select_from(import_tasks)
+            .outerjoin(import_categories, import_categories.c.id == import_tasks.c.category_id)
+            .outerjoin(user_categories, and_(user_categories.c.id == import_tasks.c.category_id,
+                                             import_categories.c.id.is_(None)))
+            .outerjoin(import_schedulers, import_schedulers.c.id == import_tasks.c.scheduler_id)
+            .outerjoin(user_schedulers, and_(user_schedulers.c.id == import_tasks.c.scheduler_id,
+                                             import_schedulers.c.id.is_(None)))
+        )
+        stmt = pg_insert(Tasks).from_select(fields, query_source)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['id'],
+            set_={**{field: stmt.excluded[field] for field in fields[1:]},
+                  'updated': func.timezone('utc', func.now())},
+            where=Tasks.user_id == user.id
+        )
+        await session.execute(stmt)
+        await TaskOccurrenceService.regenerate(session, [Tasks.id.in_(select(import_tasks.c.target_id)),
+                                                         Tasks.user_id == user.id])
+
+    @classmethod
+    async def merge_done_tasks(cls, session: AsyncSession, user: UserReadSchema) -> None:
+        # Ссылка на задачу из файла - через import_tasks, иначе на существующую задачу пользователя.
+        user_tasks = select(Tasks.id).where(Tasks.user_id == user.id).subquery('user_tasks')
+        task_id = func.coalesce(import_tasks.c.target_id, user_tasks.c.id)
+        query_source: Select = (
+            select(task_id,
+                   import_done_tasks.c.date,
+                   func.coalesce(import_done_tasks.c.quantity, 0),
+                   func.coalesce(import_done_tasks.c.is_done, false()))
+            .select_from(import_done_tasks)
+            .outerjoin(import_tasks, import_tasks.c.id == import_done_tasks.c.task_id)
+            .outerjoin(user_tasks, user_tasks.c.id == import_done_tasks.c.task_id)
+            .where(task_id.is_not(None))
+        )
+        stmt = pg_insert(DoneTasks).from_select(['task_id', 'date', 'quantity', 'is_done'], query_source)
+        stmt = stmt.on_conflict_do_update(constraint='uq_task_id_date',
+                                          set_={'quantity': stmt.excluded.quantity,
+                                                'is_done': stmt.excluded.is_done,
+                                                'updated': func.timezone('utc', func.now())})
+        await session.execute(stmt)
+
+        imported_tasks_ids: Select = (
+            select(task_id)
+            .select_from(import_done_tasks)
+            .outerjoin(import_tasks, import_tasks.c.id == import_done_tasks.c.task_id)
+            .outerjoin(user_tasks, user_tasks.c.id == import_done_tasks.c.task_id)
+            .distinct()
+        )
+        await TaskMonthlyStatsService.refresh(session, [DoneTasks.task_id.in_(imported_tasks_ids)])
@@ -0,0 +1,61 @@
+from sqlalchemy import MetaData, Table, Column, Integer, String, Date, Time, Boolean
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.schedulers.utils import WEEK_DAYS
+
+# Временные таблицы импорта: создаются в транзакции импорта и удаляются при ее завершении.
+staging_metadata = MetaData()
+
+
+def staging_table(name: str, *columns: Column) -> Table:
+    return Table(name, staging_metadata, *columns, prefixes=['TEMPORARY'], postgresql_on_commit='DROP')
+
+
+import_categories = staging_table(
+    'import_categories',
+    Column('id', Integer, primary_key=True, autoincrement=False),
+    Column('title', String(255)),
+    Column('target_id', Integer),
+)
+
+import_schedulers = staging_table(
+    'import_schedulers',
+    Column('id', Integer, primary_key=True, autoincrement=False),
+    Column('title', String(255)),
+    *[Column(day_week, Boolean) for day_week in WEEK_DAYS],
+    Column('frequency', String(7)),
+    Column('interval_days', Integer),
+    Column('month_day', Integer),
+    Column('month_week', Integer),
+    Column('exdates', ARRAY(Date)),
+    Column('target_id', Integer),
+)
+
+import_tasks = staging_table(
+    'import_tasks',
+    Column('id', Integer, primary_key=True, autoincrement=False),
+    Column('title', String(65)),
+    Column('category_id', Integer),
+    Column('scheduler_id', Integer),
+    Column('start_date', Date),
+    Column('end_date', Date),
+    Column('quantity', Integer),
+    Column('quantity_unit', String(31)),
+    Column('remind_time', Time),
+    Column('target_id', Integer),
+)
+
+import_done_tasks = staging_table(
+    'import_done_tasks',
+    Column('task_id', Integer, primary_key=True, autoincrement=False),
+    Column('date', Date, primary_key=True),
+    Column('quantity', Integer),
+    Column('is_done', Boolean),
+)
+
+STAGING_TABLES: dict[str, Table] = {
+    'categories': import_categories,
+    'schedulers': import_schedulers,
+    'tasks': import_tasks,
+    'done_tasks': import_done_tasks,
+}
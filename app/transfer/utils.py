@@ -0,0 +1,55 @@
+from datetime import date, time
+from types import SimpleNamespace
+from typing import Any
+
+from app.schedulers.recurrence import RECURRENCE_FIELDS, validate_rule
+from app.schedulers.utils import WEEK_DAYS, get_weekday_mask
+
+TRANSFER_FIELDS: dict[str, tuple[str, ...]] = {
+    'categories': ('id', 'title'),
+    'schedulers': ('id', 'title', *WEEK_DAYS, *RECURRENCE_FIELDS),
+    'tasks': ('id', 'title', 'category_id', 'scheduler_id', 'start_date', 'end_date', 'quantity', 'quantity_unit',
+              'remind_time'),
+    'done_tasks': ('task_id', 'date', 'quantity', 'is_done'),
+}
+
+INT_FIELDS = frozenset(('id', 'category_id', 'scheduler_id', 'task_id', 'quantity', 'interval_days', 'month_day',
+                        'month_week'))
+DATE_FIELDS = frozenset(('start_date', 'end_date', 'date'))
+TIME_FIELDS = frozenset(('remind_time',))
+BOOL_FIELDS = frozenset((*WEEK_DAYS, 'is_done'))
+# Список дат: в NDJSON - массив, в CSV - строка через ';'.
+DATE_LIST_FIELDS = frozenset(('exdates',))
+
+
+def convert_value(field: str, value: Any) -> Any:
+    # Значения из CSV приходят строками, из NDJSON - типами JSON; даты в обоих случаях строкой ISO.
+    if value is None or value == '':
+        return None
+    if field in INT_FIELDS:
+        return int(value)
+    if field in DATE_LIST_FIELDS:
+        days = value.split(';') if isinstance(value, str) else value
+        return [day if isinstance(day, date) else date.fromisoformat(day) for day in days if day]
+    if field in DATE_FIELDS:
+        return value if isinstance(value, date) else date.fromisoformat(value)
+    if field in TIME_FIELDS:
+        return value if isinstance(value, time) else time.fromisoformat(value)
+    if field in BOOL_FIELDS:
+        if isinstance(value, bool):
+            return value
+        if str(value).lower() in ('true', '1', 't'):
+            return True
+        if str(value).lower() in ('false', '0', 'f'):
+            return False
+        raise ValueError(f'invalid boolean {value!r}')
+    return str(value)
+
+
+def convert_record(entity: str, record: dict) -> tuple:
+    values = tuple(convert_value(field, record.get(field)) for field in TRANSFER_FIELDS[entity])
+    if entity == 'schedulers':
+        scheduler = SimpleNamespace(**dict(zip(TRANSFER_FIELDS[entity], values)))
+        validate_rule(scheduler.frequency or 'weekly', get_weekday_mask(scheduler), scheduler.interval_days or 1,
+                      scheduler.month_day, scheduler.month_week)
+    return values
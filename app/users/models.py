@@ -1,6 +1,6 @@
 from datetime import date
 from typing import TYPE_CHECKING, List
-from sqlalchemy import String, text, func
+from sqlalchemy import String, Integer, text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.settings import Base
@@ -16,6 +16,7 @@ class Users(Base):
     hash_password: Mapped[str] = mapped_column(nullable=False)
     active: Mapped[bool] = mapped_column(server_default=text('false'))
     created: Mapped[date] = mapped_column(nullable=False, default=func.current_date())
+    token_version: Mapped[int] = mapped_column(Integer, server_default=text('0'))
 
     categories: Mapped[List['Categories']] = relationship(back_populates='user')
     tasks: Mapped[List['Tasks']] = relationship(back_populates='user',
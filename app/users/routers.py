@@ -4,9 +4,8 @@ from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.settings import db_settings
-from app.users import Users
 from app.users.schemas import (RegistrationSchema, AuthenticationSchema, UserRecoveryPasswordSchema,
-                               UserRecoveryPasswordEditSchema)
+                               UserRecoveryPasswordEditSchema, UserReadSchema)
 from app.users.services import UserService
 
 router = APIRouter(
@@ -16,7 +15,7 @@ router = APIRouter(
 
 
 @router.post('/registration')
-async def registration(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def registration(session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
                        user: RegistrationSchema):
     await UserService.registration(session, user)
     return {'detail': {'code': 'success'}}
@@ -37,7 +36,7 @@ async def logout(response: Response):
 
 
 @router.post('/recovery-password/')
-async def recovery_password(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def recovery_password(session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
                             data: UserRecoveryPasswordSchema):
     await UserService.recovery_password(session, data.email)
     return {'detail': {'code': 'success'}}
@@ -51,27 +50,37 @@ async def recovery_password_confirmation(session: Annotated[AsyncSession, Depend
 
 
 @router.post('/recovery-password/edit/{token}')
-async def recovery_password_edit(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def recovery_password_edit(session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
                                  token: str, data: UserRecoveryPasswordEditSchema):
     await UserService.recovery_password_edit(session, token, data.password1, data.password2)
     return {'detail': {'code': 'success'}}
 
 
 @router.post('/change-password')
-async def change_password(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
-                          user: Annotated[Users, Depends(UserService.get_current_user)],
+async def change_password(session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
+                          user: Annotated[UserReadSchema, Depends(UserService.get_current_user)],
                           data: UserRecoveryPasswordEditSchema):
     await UserService.change_password(session, user, data.password1, data.password2)
     return {'detail': {'code': 'success'}}
 
 
+@router.post('/deactivate')
+async def deactivate(response: Response,
+                     session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
+                     user: Annotated[UserReadSchema, Depends(UserService.get_current_user)]):
+    await UserService.deactivate(session, user.id)
+    response.delete_cookie('access_token')
+    response.delete_cookie('refresh_token')
+    return {'detail': {'code': 'success'}}
+
+
 @router.get('/activate/{token}')
-async def confirmation_email_address(session: Annotated[AsyncSession, Depends(db_settings.get_session)],
+async def confirmation_email_address(session: Annotated[AsyncSession, Depends(db_settings.get_transaction_session)],
                                      token: str):
     await UserService.confirmation_email(session, token)
     return {'detail': {'code': 'success'}}
 
 
 @router.get('/me')
-async def get_me(user: Annotated[Users, Depends(UserService.get_current_user)]):
+async def get_me(user: Annotated[UserReadSchema, Depends(UserService.get_current_user)]):
     return user
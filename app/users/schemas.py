@@ -31,4 +31,8 @@ class UserRecoveryPasswordEditSchema(BaseModel):
 
 class JWTPyloadSchema(BaseModel):
     id: str
-    exp: int
\ No newline at end of file
+    exp: int
+    ver: int = 0
+    username: str | None = None
+    email: EmailStr | None = None
+    active: bool | None = None
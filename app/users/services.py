@@ -9,7 +9,9 @@ from sqlalchemy.exc import MultipleResultsFound
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import defer
 
+from app.cache import cache
 from app.database.settings import db_settings
+from app.database.unit_of_work import commit, on_commit
 from app.exceptions import (UserAlreadyExistsException,
                             UserOrPasswordEnteredIncorrectException,
                             UserNotAuthorizedException, URLTokenExpiredOrInvalidException,
@@ -18,7 +20,7 @@ from app.exceptions import (UserAlreadyExistsException,
 from app.settings import settings
 from app.tasks_celery.users import send_mail_recovery_password, send_mail_email_confirmation
 from app.users.models import Users
-from app.users.schemas import RegistrationSchema, AuthenticationSchema, JWTPyloadSchema
+from app.users.schemas import RegistrationSchema, AuthenticationSchema, JWTPyloadSchema, UserReadSchema
 from app.users.utils import (get_hash_password, verify_password, create_access_jwt_token, get_access_token,
                              get_refresh_token, get_url_token, check_url_token)
 
@@ -38,17 +40,16 @@ class UserService:
             raise UserAlreadyExistsException
         if user_exists:
             raise UserAlreadyExistsException
-        hash_password: str = get_hash_password(user.password)
+        hash_password: str = await get_hash_password(user.password)
         stmt: Insert = insert(cls.model).values(
             username=user.username,
             email=user.email,
             hash_password=hash_password
         ).returning(cls.model.id)
         user_result: Result[tuple[Users]] = await session.execute(stmt)
-        await session.commit()
         user_id: int | None = user_result.scalars().one_or_none()
         token = await get_url_token(user.email)
-        send_mail_email_confirmation(user.email, token)
+        await send_mail_email_confirmation(session, user.email, token)  # Коммит пользователя вместе с письмом.
         return user_id
 
     @classmethod
@@ -58,7 +59,8 @@ class UserService:
             raise UserAlreadyActivatedException
         stmt_user: Update = update(cls.model).where(cls.model.email == db_user.email).values(active=True)
         await session.execute(stmt_user)
-        await session.commit()
+        await commit(session)
+        await on_commit(session, lambda: cls.invalidate_user_cache(db_user.id))
 
     @classmethod
     async def authorization(cls, session: AsyncSession, user: AuthenticationSchema) -> tuple:
@@ -72,29 +74,67 @@ class UserService:
             raise UserOrPasswordEnteredIncorrectException
         if db_user is None:
             raise UserOrPasswordEnteredIncorrectException
-        if not verify_password(user.password, db_user.hash_password):
+        if not await verify_password(user.password, db_user.hash_password):
             raise UserOrPasswordEnteredIncorrectException
-        data_token = {'id': str(db_user.id)}
-        access_token: str = create_access_jwt_token(data_token)
-        refresh_token: str = create_access_jwt_token(data_token, refresh=True)
+        access_token: str = create_access_jwt_token(cls.get_access_token_data(db_user, db_user.token_version))
+        refresh_token: str = create_access_jwt_token(cls.get_refresh_token_data(db_user, db_user.token_version),
+                                                     refresh=True)
         return access_token, refresh_token
 
+    @classmethod
+    def get_refresh_token_data(cls, user: Users | UserReadSchema, token_version: int) -> dict:
+        return {'id': str(user.id), 'ver': token_version}
+
+    @classmethod
+    def get_access_token_data(cls, user: Users | UserReadSchema, token_version: int) -> dict:
+        data_token = cls.get_refresh_token_data(user, token_version)
+        if settings.security.JWT_STATELESS:
+            data_token.update({'username': user.username, 'email': user.email, 'active': user.active})
+        return data_token
+
     @classmethod
     async def get_user_db(cls,
                           session: Annotated[AsyncSession, db_settings.get_session],
-                          user_id: int) -> Users:
+                          user_id: int) -> UserReadSchema:
+        if settings.cache.USER_ENABLED:
+            user_cache: dict | None = await cache.get(cls.get_user_cache_key(user_id))
+            if user_cache:
+                return UserReadSchema(**user_cache)
         query: Select = select(cls.model).where(cls.model.id == int(user_id)).options(defer(cls.model.hash_password))
         user_db: Result[tuple[Users]] = await session.execute(query)
         user_db: Users | None = user_db.scalar_one_or_none()
         if not user_db or not user_db.active:
             raise UserNotAuthorizedException
-        return user_db
+        user: UserReadSchema = UserReadSchema.model_validate(user_db, from_attributes=True)
+        if settings.cache.USER_ENABLED:
+            await cache.set(cls.get_user_cache_key(user_id), user.model_dump(), settings.cache.USER_TTL_SECONDS)
+        return user
+
+    @classmethod
+    async def get_user_db_by_token_version(cls, session: AsyncSession,
+                                           user_id: int,
+                                           token_version: int) -> UserReadSchema:
+        query: Select = select(cls.model).where(cls.model.id == user_id).options(defer(cls.model.hash_password))
+        user_db: Result[tuple[Users]] = await session.execute(query)
+        user_db: Users | None = user_db.scalar_one_or_none()
+        if not user_db or not user_db.active or user_db.token_version != token_version:
+            raise UserNotAuthorizedException
+        return UserReadSchema.model_validate(user_db, from_attributes=True)
+
+    @classmethod
+    def get_user_cache_key(cls, user_id: int) -> str:
+        return f'user:{user_id}'
+
+    @classmethod
+    async def invalidate_user_cache(cls, user_id: int) -> None:
+        # Вызывать при любом изменении пользователя: пароль, активация, деактивация.
+        await cache.delete(cls.get_user_cache_key(user_id))
 
     @classmethod
     async def get_current_user(cls, response: Response,
                                session: Annotated[AsyncSession, Depends(db_settings.get_session)],
                                access_token: Annotated[str | None, Depends(get_access_token)],
-                               refresh_token: Annotated[str | None, Depends(get_refresh_token)]) -> Users:
+                               refresh_token: Annotated[str | None, Depends(get_refresh_token)]) -> UserReadSchema:
         if not access_token:
             raise UserNotAuthorizedException
         try:
@@ -111,9 +151,11 @@ class UserService:
             except InvalidTokenError as e:
                 raise UserNotAuthorizedException
             user_id: str = refresh_payload.get('id')
-            user_db: Users = await cls.get_user_db(session, int(user_id))
-            data_token = {'id': str(user_db.id)}
-            access_token: str = create_access_jwt_token(data_token)
+            if not user_id or not user_id.isdigit():
+                raise UserNotAuthorizedException
+            token_version: int = refresh_payload.get('ver', 0)
+            user_db: UserReadSchema = await cls.get_user_db_by_token_version(session, int(user_id), token_version)
+            access_token: str = create_access_jwt_token(cls.get_access_token_data(user_db, token_version))
             response.set_cookie('access_token', access_token)
             return await cls.get_current_user(response, session, access_token, refresh_token)
         except InvalidTokenError as e:
@@ -122,8 +164,26 @@ class UserService:
         user_id: str = access_payload.get('id')
         if not user_id or not user_id.isdigit():
             raise UserNotAuthorizedException
+        if settings.security.JWT_STATELESS and access_payload.get('username'):
+            if not access_payload.get('active'):
+                raise UserNotAuthorizedException
+            return UserReadSchema(id=int(user_id),
+                                  username=access_payload.get('username'),
+                                  email=access_payload.get('email'),
+                                  active=True)
         return await cls.get_user_db(session, int(user_id))
 
+    @classmethod
+    async def deactivate(cls, session: AsyncSession, user_id: int) -> None:
+        stmt: Update = (
+            update(cls.model)
+            .where(cls.model.id == user_id)
+            .values(active=False, token_version=cls.model.token_version + 1)
+        )
+        await session.execute(stmt)
+        await commit(session)
+        await on_commit(session, lambda: cls.invalidate_user_cache(user_id))
+
     @classmethod
     async def recovery_password(cls, session: AsyncSession, email: EmailStr) -> None:
         query: Select = select(cls.model).where(cls.model.email == email)
@@ -132,7 +192,7 @@ class UserService:
         if not users_db or not users_db.active:
             raise EmailAddressIsNotRegisteredException
         confirmation_token: str = await get_url_token(email)
-        send_mail_recovery_password(email, users_db.username, confirmation_token)  # TODO: Task library.
+        await send_mail_recovery_password(session, email, users_db.username, confirmation_token)
 
     @classmethod
     async def check_url_token(cls, session: AsyncSession, token: str, max_age: int = 3600) -> Users:
@@ -152,16 +212,29 @@ class UserService:
         db_user: Users = await cls.check_url_token(session, token)
         if password1 != password2:
             raise PasswordsNotMatchException
-        hash_password: str = get_hash_password(password1)
-        stmt: Update = update(cls.model).where(cls.model.id == db_user.id).values(hash_password=hash_password)
+        hash_password: str = await get_hash_password(password1)
+        stmt: Update = (
+            update(cls.model)
+            .where(cls.model.id == db_user.id)
+            .values(hash_password=hash_password, token_version=cls.model.token_version + 1)
+        )
         await session.execute(stmt)
-        await session.commit()
+        await commit(session)
+        await on_commit(session, lambda: cls.invalidate_user_cache(db_user.id))
 
     @classmethod
-    async def change_password(cls, session: AsyncSession, user: Users, password1: str, password2: str) -> None:
+    async def change_password(cls, session: AsyncSession,
+                              user: UserReadSchema,
+                              password1: str,
+                              password2: str) -> None:
         if password1 != password2:
             raise PasswordsNotMatchException
-        hash_password: str = get_hash_password(password1)
-        stmt: Update = update(cls.model).where(cls.model.id == user.id).values(hash_password=hash_password)
+        hash_password: str = await get_hash_password(password1)
+        stmt: Update = (
+            update(cls.model)
+            .where(cls.model.id == user.id)
+            .values(hash_password=hash_password, token_version=cls.model.token_version + 1)
+        )
         await session.execute(stmt)
-        await session.commit()
+        await commit(session)
+        await on_commit(session, lambda: cls.invalidate_user_cache(user.id))
@@ -1,4 +1,8 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime, timezone
+from typing import Callable, Literal
 
 import jwt
 from asyncpg.pgproto.pgproto import timedelta
@@ -9,19 +13,82 @@ from passlib.context import CryptContext
 from pydantic import EmailStr
 
 from app.exceptions import URLTokenExpiredOrInvalidException
+from app.metrics import register_metrics
 from app.settings import settings
 
 password_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 
 
-def get_hash_password(password: str) -> str:
+class PasswordHasher:
+    # bcrypt занимает десятки миллисекунд, поэтому выполняется вне event loop с ограничением параллельности.
+    def __init__(self, executor: Literal['thread', 'process'], workers: int):
+        self.workers = workers
+        self.executor_type = executor
+        self.executor: Executor | None = None
+        self.semaphore: asyncio.Semaphore | None = None
+        self.calls = 0
+        self.in_progress = 0
+        self.waiting = 0
+        self.seconds_total = 0.0
+        self.seconds_max = 0.0
+
+    def get_executor(self) -> Executor:
+        if self.executor is None:
+            if self.executor_type == 'process':
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+            self.semaphore = asyncio.Semaphore(self.workers)
+        return self.executor
+
+    async def run(self, func: Callable, *args):
+        executor: Executor = self.get_executor()
+        started: float = time.perf_counter()
+        self.waiting += 1
+        async with self.semaphore:
+            self.waiting -= 1
+            self.in_progress += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+            finally:
+                self.in_progress -= 1
+                seconds: float = time.perf_counter() - started
+                self.calls += 1
+                self.seconds_total += seconds
+                self.seconds_max = max(self.seconds_max, seconds)
+
+    def get_metrics(self) -> dict:
+        return {
+            'executor': self.executor_type,
+            'workers': self.workers,
+            'calls': self.calls,
+            'in_progress': self.in_progress,
+            'waiting': self.waiting,
+            'seconds_avg': self.seconds_total / self.calls if self.calls else 0.0,
+            'seconds_max': self.seconds_max,
+        }
+
+
+password_hasher = PasswordHasher(settings.security.PASSWORD_HASH_EXECUTOR, settings.security.PASSWORD_HASH_WORKERS)
+register_metrics('password_hashing', password_hasher.get_metrics)
+
+
+def hash_password_sync(password: str) -> str:
     return password_context.hash(password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def verify_password_sync(plain_password: str, hashed_password: str) -> bool:
     return password_context.verify(plain_password, hashed_password)
 
 
+async def get_hash_password(password: str) -> str:
+    return await password_hasher.run(hash_password_sync, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password_sync, plain_password, hashed_password)
+
+
 def create_access_jwt_token(data: dict, refresh=False):
     to_encode = data.copy()
     if not refresh:
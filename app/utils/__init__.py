@@ -1,5 +1,10 @@
 __all__ = (
-    'camel_case_to_snake_case'
+    'camel_case_to_snake_case',
+    'etag_matches',
+    'make_etag',
+    'get_conditional_headers',
+    'is_not_modified'
 )
 
-from app.utils.utils import camel_case_to_snake_case
\ No newline at end of file
+from app.utils.utils import (camel_case_to_snake_case, etag_matches, make_etag, get_conditional_headers,
+                             is_not_modified)
\ No newline at end of file
@@ -1,3 +1,9 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+
 def camel_case_to_snake_case(camel_case_string):
     snake_case_string = ""
     for i, c in enumerate(camel_case_string):
@@ -6,3 +12,37 @@ def camel_case_to_snake_case(camel_case_string):
         snake_case_string += c.lower()
     return snake_case_string
 
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return etag.removeprefix('W/') in {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+
+
+def make_etag(*parts) -> str:
+    raw: str = json.dumps(parts, default=str, sort_keys=True)
+    return f'"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+
+def get_conditional_headers(etag: str, last_modified: datetime | None = None) -> dict[str, str]:
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if last_modified:
+        headers['Last-Modified'] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    return headers
+
+
+def is_not_modified(headers, etag: str, last_modified: datetime | None = None) -> bool:
+    # If-None-Match важнее If-Modified-Since (RFC 9110), updated в базе хранится в UTC без зоны.
+    if 'if-none-match' in headers:
+        return etag_matches(headers['if-none-match'], etag)
+    if not last_modified or 'if-modified-since' not in headers:
+        return False
+    try:
+        modified_since: datetime = parsedate_to_datetime(headers['if-modified-since'])
+    except (TypeError, ValueError):
+        return False
+    if modified_since.tzinfo is None:
+        modified_since = modified_since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= modified_since
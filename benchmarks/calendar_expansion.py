@@ -0,0 +1,91 @@
+"""
+Сравнение построения календаря задач (DoneTaskService.get_tasks): прежние вложенные циклы
+против индекса выполненных задач по (task_id, date) и разбивки задач по дням недели.
+
+> python -m benchmarks.calendar_expansion
+"""
+import random
+import timeit
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from app.done_tasks.utils import expand_calendar
+from app.schedulers.utils import WEEK_DAYS
+
+TASKS_COUNT = (100, 300, 500)
+DAYS = 365
+DONE_RATIO = 0.3
+REPEAT = 3
+
+
+def legacy_expand_calendar(tasks_db, done_tasks_db, current_date: date, date_end: date, is_done: bool | None):
+    tasks = {}
+    while current_date <= date_end:
+        day_week: str = current_date.strftime("%A").lower()
+        tasks_in_date = []
+        tasks[current_date] = tasks_in_date
+        for task in tasks_db:
+            allowed_day: bool = task.scheduler.__dict__.get(day_week)
+            if allowed_day:
+                tasks_in_date.append({'task': task, 'done': {}})
+        tasks[current_date] = tasks_in_date
+        current_date += timedelta(days=1)
+
+    for done_task in done_tasks_db:
+        find_task = tasks.get(done_task.date)
+        if find_task:
+            for el in tasks[done_task.date]:
+                if el['task'].id == done_task.task_id:
+                    el['done'] = done_task.__dict__
+    is_done_tasks = tasks.copy()
+    if is_done:
+        tasks = {}
+        for key, items in is_done_tasks.items():
+            tasks_in_date = []
+            for item in items:
+                if item['done'].get('is_done'):
+                    tasks_in_date.append(item)
+                    tasks[key] = tasks_in_date
+    if not is_done and not is_done is None:
+        tasks = {}
+        for key, items in is_done_tasks.items():
+            tasks_in_date = []
+            for item in items:
+                if not item['done'].get('is_done'):
+                    tasks_in_date.append(item)
+                    tasks[key] = tasks_in_date
+    return tasks
+
+
+def make_data(tasks_count: int, date_start: date):
+    tasks = []
+    done_tasks = []
+    for task_id in range(1, tasks_count + 1):
+        scheduler = SimpleNamespace(**{day_week: random.random() < 0.5 for day_week in WEEK_DAYS})
+        tasks.append(SimpleNamespace(id=task_id, scheduler=scheduler, start_date=date_start))
+        for offset in range(DAYS):
+            current_date = date_start + timedelta(days=offset)
+            if getattr(scheduler, WEEK_DAYS[current_date.weekday()]) and random.random() < DONE_RATIO:
+                done_tasks.append(SimpleNamespace(task_id=task_id, date=current_date,
+                                                  quantity=1, is_done=random.random() < 0.5))
+    return tasks, done_tasks
+
+
+def main():
+    random.seed(0)
+    date_start = date(2024, 1, 1)
+    date_end = date_start + timedelta(days=DAYS - 1)
+    print(f'{"tasks":>5} {"done rows":>10} {"is_done":>8} {"loop, ms":>12} {"index, ms":>12} {"speedup":>10}')
+    for tasks_count in TASKS_COUNT:
+        tasks, done_tasks = make_data(tasks_count, date_start)
+        for is_done in (None, True, False):
+            args = (tasks, done_tasks, date_start, date_end, is_done)
+            assert legacy_expand_calendar(*args) == expand_calendar(*args)
+            legacy = min(timeit.repeat(lambda: legacy_expand_calendar(*args), number=1, repeat=REPEAT))
+            index = min(timeit.repeat(lambda: expand_calendar(*args), number=1, repeat=REPEAT))
+            print(f'{tasks_count:>5} {len(done_tasks):>10} {str(is_done):>8} '
+                  f'{legacy * 1000:>12.1f} {index * 1000:>12.1f} {legacy / index:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
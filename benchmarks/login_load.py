@@ -0,0 +1,71 @@
+"""
+Задержка /tasks/list/ при параллельных авторизациях (bcrypt) на запущенном сервере.
+
+> python -m benchmarks.login_load --url http://localhost:8000 --username USER --password PASSWORD
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> None:
+    response = await client.post('/authentication/authorization', json={'username': username, 'password': password})
+    response.raise_for_status()
+
+
+async def hammer_logins(client: httpx.AsyncClient, username: str, password: str, stop: asyncio.Event) -> int:
+    count = 0
+    while not stop.is_set():
+        await login(client, username, password)
+        count += 1
+    return count
+
+
+async def measure_list(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get('/tasks/list/')
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+
+def percentile(values: list[float], percent: int) -> float:
+    return statistics.quantiles(values, n=100)[percent - 1] * 1000 if len(values) > 1 else 0.0
+
+
+async def run(url: str, username: str, password: str, logins: int, readers: int, duration: float) -> None:
+    async with httpx.AsyncClient(base_url=url, timeout=60) as reader_client, \
+            httpx.AsyncClient(base_url=url, timeout=60) as login_client:
+        await login(reader_client, username, password)
+        for logins_count in (0, logins):
+            stop = asyncio.Event()
+            latencies: list[float] = []
+            workers = [asyncio.create_task(measure_list(reader_client, stop, latencies)) for _ in range(readers)]
+            login_workers = [asyncio.create_task(hammer_logins(login_client, username, password, stop))
+                             for _ in range(logins_count)]
+            await asyncio.sleep(duration)
+            stop.set()
+            await asyncio.gather(*workers)
+            done_logins = sum(await asyncio.gather(*login_workers))
+            print(f'logins in parallel: {logins_count:>3}, logins done: {done_logins:>5}, '
+                  f'/tasks/list/ requests: {len(latencies):>6}, '
+                  f'p50: {percentile(latencies, 50):>8.1f} ms, p99: {percentile(latencies, 99):>8.1f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='p99 latency of /tasks/list/ under login load.')
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--logins', type=int, default=16)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.username, args.password, args.logins, args.readers, args.duration))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Планы горячих запросов (отчеты и календарь) на синтетических данных: EXPLAIN ANALYZE и проверка,
+что tasks и done_tasks читаются по индексам, а не последовательным сканированием.
+
+Данные создаются в отдельной схеме базы из настроек и удаляются после проверки (--keep - оставить).
+
+> python -m benchmarks.query_plans --users 1000 --tasks 10 --days 365
+"""
+import argparse
+import asyncio
+import json
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import Select, select, text, func
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncConnection
+from sqlalchemy.pool import NullPool
+
+from app.database.settings import Base
+from app.done_tasks import DoneTasks
+from app.reports.services import ReportServices
+from app.reports.utils import count_scheduled_days_expression
+from app.settings import settings
+from app.tasks import Tasks
+# Модели для Base.metadata.create_all.
+from app.users import Users  # noqa: F401
+from app.categories import Categories  # noqa: F401
+from app.schedulers import Schedulers  # noqa: F401
+from app.mail import MailOutbox  # noqa: F401
+
+SCHEMA = 'benchmark_query_plans'
+CHECKED_RELATIONS = ('tasks', 'done_tasks')
+DATE_START = date(2024, 1, 1)
+
+SEED_SQL = (
+    '''
+    INSERT INTO users (id, username, email, hash_password, active, created, token_version)
+    SELECT n, 'user' || n, 'user' || n || '@example.com', '', true, CAST(:date_start AS date), 0
+    FROM generate_series(1, CAST(:users AS integer)) AS n
+    ''',
+    '''
+    INSERT INTO schedulers (id, title, user_id, monday, tuesday, wednesday, thursday, friday, saturday, sunday)
+    SELECT n, 'scheduler' || n, n, true, random() < 0.5, true, random() < 0.5, true, false, false
+    FROM generate_series(1, CAST(:users AS integer)) AS n
+    ''',
+    '''
+    INSERT INTO tasks (id, title, user_id, scheduler_id, start_date, end_date, quantity)
+    SELECT n, 'task' || n, (n - 1) / CAST(:tasks AS integer) + 1, (n - 1) / CAST(:tasks AS integer) + 1,
+           CAST(:date_start AS date) + (random() * CAST(:days AS integer) / 4)::int,
+           CAST(:date_start AS date) + CAST(:days AS integer) - (random() * CAST(:days AS integer) / 4)::int,
+           (random() * 10)::int
+    FROM generate_series(1, CAST(:users AS integer) * CAST(:tasks AS integer)) AS n
+    ''',
+    '''
+    INSERT INTO done_tasks (task_id, date, quantity, is_done)
+    SELECT tasks.id, day::date, (random() * 10)::int, random() < 0.7
+    FROM tasks
+    CROSS JOIN generate_series(tasks.start_date, tasks.end_date, interval '1 day') AS day
+    WHERE random() < CAST(:done_ratio AS float)
+    ''',
+    "SELECT setval(pg_get_serial_sequence('users', 'id'), CAST(:users AS integer))",
+    "SELECT setval(pg_get_serial_sequence('schedulers', 'id'), CAST(:users AS integer))",
+    "SELECT setval(pg_get_serial_sequence('tasks', 'id'), CAST(:users AS integer) * CAST(:tasks AS integer))",
+)
+
+
+def get_hot_queries(user, date_from: date, date_to: date, task_ids: list[int]) -> dict[str, Select]:
+    month_from = date_from.replace(day=1)
+    month_to = (month_from + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return {
+        'calendar: tasks': (
+            select(Tasks)
+            .where(Tasks.user_id == user.id, Tasks.end_date > date_from, Tasks.start_date < date_to)
+        ),
+        'calendar: done_tasks': (
+            select(DoneTasks)
+            .where(DoneTasks.task_id.in_(task_ids), DoneTasks.date >= date_from, DoneTasks.date <= date_to)
+        ),
+        'report: base': ReportServices.get_tasks_by_group_query(
+            user, month_from, month_to, [func.count()], [DoneTasks.is_done == True]
+        ),
+        'report: percentage-completed': ReportServices.get_tasks_report_query(
+            user, month_from, month_to,
+            [count_scheduled_days_expression(month_from, month_to),
+             func.count().filter(DoneTasks.is_done == True)],
+            []
+        ),
+        'report: quantitative-data': ReportServices.get_tasks_report_query(
+            user, month_from, month_to,
+            [count_scheduled_days_expression(month_from, month_to) * Tasks.quantity,
+             func.coalesce(func.sum(DoneTasks.quantity), 0)],
+            [Tasks.quantity > 0]
+        ),
+        'report: range': ReportServices.select_range_report(user, date_from, date_to),
+    }
+
+
+def get_scans(plan: dict) -> list[tuple[str, str, str]]:
+    scans = []
+    if plan.get('Relation Name') in CHECKED_RELATIONS:
+        scans.append((plan['Relation Name'], plan['Node Type'], plan.get('Index Name', '')))
+    for child in plan.get('Plans', []):
+        scans.extend(get_scans(child))
+    return scans
+
+
+async def explain(connection: AsyncConnection, query: Select) -> tuple[float, list[tuple[str, str, str]]]:
+    sql: str = str(query.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True}))
+    result = await connection.exec_driver_sql(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}')
+    plan = result.scalar()
+    plan = json.loads(plan) if isinstance(plan, str) else plan
+    return plan[0]['Execution Time'], get_scans(plan[0]['Plan'])
+
+
+async def run(users: int, tasks: int, days: int, done_ratio: float, keep: bool) -> None:
+    url: str = settings.POSTGRES_URL if settings.VERSION == 'PROD' else settings.database.POSTGRES_URL
+    async with create_async_engine(url, poolclass=NullPool).begin() as connection:
+        await connection.execute(text(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE'))
+        await connection.execute(text(f'CREATE SCHEMA {SCHEMA}'))
+
+    engine = create_async_engine(url, poolclass=NullPool,
+                                 connect_args={'server_settings': {'search_path': SCHEMA}})
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+            params = {'users': users, 'tasks': tasks, 'days': days, 'done_ratio': done_ratio,
+                      'date_start': DATE_START}
+            for statement in SEED_SQL:
+                await connection.execute(text(statement), params)
+        async with engine.connect() as connection:
+            await connection.execution_options(isolation_level='AUTOCOMMIT')
+            await connection.execute(text('VACUUM ANALYZE'))
+            done_count: int = (await connection.execute(select(func.count()).select_from(DoneTasks))).scalar()
+            print(f'users: {users}, tasks: {users * tasks}, done_tasks: {done_count}')
+
+            user = SimpleNamespace(id=users // 2)
+            task_ids = list((await connection.execute(select(Tasks.id).where(Tasks.user_id == user.id))).scalars())
+            date_from = DATE_START + timedelta(days=days // 2)
+            date_to = date_from + timedelta(days=30)
+
+            failed: list[str] = []
+            for name, query in get_hot_queries(user, date_from, date_to, task_ids).items():
+                execution_time, scans = await explain(connection, query)
+                print(f'{name:<30} {execution_time:>10.2f} ms')
+                for relation, node_type, index_name in scans:
+                    print(f'    {relation:<12} {node_type:<18} {index_name}')
+                    if node_type == 'Seq Scan':
+                        failed.append(f'{name}: {relation}')
+            assert not failed, f'sequential scans: {failed}'
+    finally:
+        if not keep:
+            async with engine.begin() as connection:
+                await connection.execute(text(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE'))
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EXPLAIN ANALYZE of report and calendar queries.')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--tasks', type=int, default=10, help='tasks per user')
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--done-ratio', type=float, default=0.5)
+    parser.add_argument('--keep', action='store_true', help=f'keep the {SCHEMA} schema')
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.tasks, args.days, args.done_ratio, args.keep))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Правила расписаний на горизонте до 10 лет: перебор дней против Recurrence.count_between
+и проверка occurs_on по каждому дню.
+
+> python -m benchmarks.recurrence_rules
+"""
+import calendar
+import random
+import timeit
+from datetime import date, timedelta
+
+from app.schedulers.recurrence import Recurrence
+from app.schedulers.utils import WEEK_DAYS
+
+RULES_COUNT = 200
+RANGES_YEARS = (1, 3, 10)
+REPEAT = 3
+DATE_FROM = date(2024, 1, 1)
+
+
+def legacy_occurs_on(rule: Recurrence, exdates: set[date], day: date) -> bool:
+    # Прямая проверка по определению правила, как в цикле по дням.
+    if day in exdates:
+        return False
+    day_week: str = day.strftime('%A').lower()
+    in_week: bool = bool(rule.mask >> WEEK_DAYS.index(day_week) & 1)
+    if rule.frequency == 'daily':
+        return day >= rule.start and (day - rule.start).days % rule.interval == 0
+    if rule.frequency == 'weekly':
+        return in_week
+    days_in_month: int = calendar.monthrange(day.year, day.month)[1]
+    if rule.month_day is not None:
+        return day.day == (days_in_month if rule.month_day == -1 else rule.month_day)
+    same_weekday = [number for number in range(1, days_in_month + 1)
+                    if date(day.year, day.month, number).weekday() == day.weekday()]
+    position: int = same_weekday.index(day.day) + 1
+    return in_week and (position == len(same_weekday) if rule.month_week == -1 else position == rule.month_week)
+
+
+def legacy_count(rule: Recurrence, exdates: set[date], date_from: date, date_to: date) -> int:
+    count = 0
+    while date_from <= date_to:
+        count += legacy_occurs_on(rule, exdates, date_from)
+        date_from += timedelta(days=1)
+    return count
+
+
+def make_rules(date_to: date) -> list[tuple[Recurrence, set[date]]]:
+    days = (date_to - DATE_FROM).days
+    rules = []
+    for number in range(RULES_COUNT):
+        frequency = ('weekly', 'daily', 'monthly')[number % 3]
+        mask = random.randint(1, 127)
+        month_day = month_week = None
+        if frequency == 'monthly':
+            if random.random() < 0.5:
+                month_day = random.choice((-1, *range(1, 32)))
+            else:
+                month_week = random.choice((-1, 1, 2, 3, 4, 5))
+        exdates = {DATE_FROM + timedelta(days=random.randint(0, days)) for _ in range(random.randint(0, 20))}
+        start = DATE_FROM + timedelta(days=random.randint(0, 30))
+        rules.append((Recurrence(frequency, mask, random.randint(1, 14), month_day, month_week, start, exdates),
+                      exdates))
+    return rules
+
+
+def main():
+    random.seed(0)
+    print(f'{"years":>5} {"loop, ms":>12} {"rule, ms":>12} {"speedup":>10} {"occurs_on, ms":>14}')
+    for years in RANGES_YEARS:
+        date_to = DATE_FROM.replace(year=DATE_FROM.year + years) - timedelta(days=1)
+        rules = make_rules(date_to)
+        days = [DATE_FROM + timedelta(days=offset) for offset in range((date_to - DATE_FROM).days + 1)]
+        for rule, exdates in rules:
+            assert legacy_count(rule, exdates, DATE_FROM, date_to) == rule.count_between(DATE_FROM, date_to)
+            assert [day for day in days if legacy_occurs_on(rule, exdates, day)] == list(
+                rule.occurrences(DATE_FROM, date_to))
+
+        legacy = min(timeit.repeat(lambda: [legacy_count(rule, exdates, DATE_FROM, date_to)
+                                            for rule, exdates in rules],
+                                   number=1, repeat=REPEAT))
+        compiled = min(timeit.repeat(lambda: [rule.count_between(DATE_FROM, date_to) for rule, _ in rules],
+                                     number=1, repeat=REPEAT))
+        occurs_on = min(timeit.repeat(lambda: [rule.occurs_on(day) for rule, _ in rules for day in days],
+                                      number=1, repeat=REPEAT))
+        print(f'{years:>5} {legacy * 1000:>12.2f} {compiled * 1000:>12.3f} {legacy / compiled:>9.0f}x '
+              f'{occurs_on * 1000:>14.2f}')
+
+
+if __name__ == '__main__':
+    main()
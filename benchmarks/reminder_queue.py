@@ -0,0 +1,71 @@
+"""
+Напоминания за сутки в куче ReminderQueue: загрузка окнами по WINDOW_SECONDS, извлечение пачками
+по BATCH_SIZE и сборка писем по пользователям (без базы данных).
+
+> python -m benchmarks.reminder_queue
+"""
+import random
+import timeit
+from datetime import date, datetime, time, timedelta
+
+from app.mail.templates import task_reminder_message
+from app.reminders.utils import ReminderQueue
+
+REMINDERS_COUNTS = (100_000, 300_000, 1_000_000)
+USERS_COUNT = 50_000
+WINDOW_SECONDS = 900
+BATCH_SIZE = 1000
+DAY = date(2026, 1, 1)
+
+
+def make_reminders(count: int) -> list[tuple[datetime, int, date]]:
+    # Половина напоминаний - на популярное время (начало часа), остальные - равномерно по суткам.
+    reminders = []
+    for task_id in range(count):
+        if task_id % 2:
+            seconds = random.randint(6, 22) * 3600
+        else:
+            seconds = random.randint(0, 24 * 3600 - 1) // 60 * 60
+        reminders.append((datetime.combine(DAY, time()) + timedelta(seconds=seconds), task_id, DAY))
+    return reminders
+
+
+def run_day(reminders: list[tuple[datetime, int, date]]) -> tuple[int, int]:
+    queue = ReminderQueue()
+    windows: dict[int, list] = {}
+    for reminder in reminders:
+        windows.setdefault(int((reminder[0] - datetime.combine(DAY, time())).total_seconds()) // WINDOW_SECONDS,
+                           []).append(reminder)
+    popped = batches = 0
+    for window in range(24 * 3600 // WINDOW_SECONDS):
+        queue.extend(windows.get(window, []))
+        until = datetime.combine(DAY, time()) + timedelta(seconds=(window + 1) * WINDOW_SECONDS)
+        while batch := queue.pop_due(until, BATCH_SIZE):
+            popped += len(batch)
+            batches += 1
+    return popped, batches
+
+
+def build_messages(batch: list[tuple[datetime, int, date]]) -> int:
+    users: dict[int, list] = {}
+    for due, task_id, day in batch:
+        users.setdefault(task_id % USERS_COUNT, []).append((f'Task {task_id}', day, due.time()))
+    return len([task_reminder_message(f'user{user_id}@example.com', f'user{user_id}', items)
+                for user_id, items in users.items()])
+
+
+def main():
+    random.seed(0)
+    print(f'{"reminders":>10} {"batches":>8} {"queue, ms":>10} {"per sec":>12} {"mail batch, ms":>15}')
+    for count in REMINDERS_COUNTS:
+        reminders = make_reminders(count)
+        popped, batches = run_day(reminders)
+        assert popped == count
+        queue_time = min(timeit.repeat(lambda: run_day(reminders), number=1, repeat=3))
+        mail_time = min(timeit.repeat(lambda: build_messages(reminders[:BATCH_SIZE]), number=1, repeat=3))
+        print(f'{count:>10} {batches:>8} {queue_time * 1000:>10.1f} {count / queue_time:>12.0f} '
+              f'{mail_time * 1000:>15.1f}')
+
+
+if __name__ == '__main__':
+    main()
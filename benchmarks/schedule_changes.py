@@ -0,0 +1,66 @@
+"""
+Изменение недельного расписания, общего для сотен задач: полный пересчет дат каждой задачи
+против app.schedulers.changes.get_schedule_deltas.
+
+> python -m benchmarks.schedule_changes
+"""
+import random
+import timeit
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from app.schedulers.changes import get_schedule_deltas
+from app.schedulers.recurrence import get_recurrence
+from app.schedulers.utils import WEEK_DAYS
+
+TASKS_COUNTS = (100, 500, 2000)
+REPEAT = 3
+DATE_FROM = date(2024, 1, 1)
+MAX_DAYS = 3 * 365
+
+
+def make_scheduler(days: set[str], exdates: tuple[date, ...] = ()) -> SimpleNamespace:
+    return SimpleNamespace(**{day_week: day_week in days for day_week in WEEK_DAYS},
+                           frequency='weekly', interval_days=1, month_day=None, month_week=None, exdates=exdates)
+
+
+def make_tasks(count: int) -> list[SimpleNamespace]:
+    tasks = []
+    for task_id in range(count):
+        start_date = DATE_FROM + timedelta(days=random.randint(0, 60))
+        tasks.append(SimpleNamespace(id=task_id, start_date=start_date,
+                                     end_date=start_date + timedelta(days=random.randint(30, MAX_DAYS))))
+    return tasks
+
+
+def full_recompute(old_scheduler, new_scheduler, tasks) -> dict[int, tuple[list[date], list[date]]]:
+    # Даты каждой задачи по старому и новому правилу и разность множеств.
+    deltas = {}
+    for task in tasks:
+        old_days = set(get_recurrence(old_scheduler, task.start_date).occurrences(task.start_date, task.end_date))
+        new_days = set(get_recurrence(new_scheduler, task.start_date).occurrences(task.start_date, task.end_date))
+        if old_days != new_days:
+            deltas[task.id] = (sorted(new_days - old_days), sorted(old_days - new_days))
+    return deltas
+
+
+def main():
+    random.seed(0)
+    old_scheduler = make_scheduler({'monday', 'wednesday', 'friday'})
+    new_scheduler = make_scheduler({'monday', 'wednesday', 'saturday'}, (DATE_FROM + timedelta(days=100),))
+    print(f'{"tasks":>6} {"delta days":>11} {"full, ms":>10} {"delta, ms":>10} {"speedup":>8}')
+    for count in TASKS_COUNTS:
+        tasks = make_tasks(count)
+        deltas = get_schedule_deltas(old_scheduler, new_scheduler, tasks)
+        assert {delta.task_id: (delta.added, delta.removed) for delta in deltas} == full_recompute(
+            old_scheduler, new_scheduler, tasks)
+
+        full = min(timeit.repeat(lambda: full_recompute(old_scheduler, new_scheduler, tasks), number=1, repeat=REPEAT))
+        delta = min(timeit.repeat(lambda: get_schedule_deltas(old_scheduler, new_scheduler, tasks),
+                                  number=1, repeat=REPEAT))
+        delta_days = sum(len(item.added) + len(item.removed) for item in deltas)
+        print(f'{count:>6} {delta_days:>11} {full * 1000:>10.1f} {delta * 1000:>10.2f} {full / delta:>7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
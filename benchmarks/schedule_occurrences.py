@@ -0,0 +1,65 @@
+"""
+Сравнение подсчета дней по расписанию: цикл по дням против маски дней недели.
+
+> python -m benchmarks.schedule_occurrences
+"""
+import random
+import timeit
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from app.schedulers.utils import WEEK_DAYS, get_weekday_mask, count_scheduled_days
+
+TASKS_COUNT = 200
+RANGES_YEARS = (1, 3, 5, 10)
+REPEAT = 3
+
+
+def legacy_count(task, date_from: date, date_to: date) -> int:
+    required = 0
+    task_date_from = max(task.start_date, date_from)
+    task_date_to = min(task.end_date, date_to)
+    while task_date_from <= task_date_to:
+        day_week: str = task_date_from.strftime("%A").lower()
+        if task.scheduler.__dict__.get(day_week):
+            required += 1
+        task_date_from += timedelta(days=1)
+    return required
+
+
+def mask_count(task, date_from: date, date_to: date) -> int:
+    return count_scheduled_days(get_weekday_mask(task.scheduler),
+                                max(task.start_date, date_from),
+                                min(task.end_date, date_to))
+
+
+def make_tasks(date_from: date, date_to: date) -> list:
+    days = (date_to - date_from).days
+    tasks = []
+    for _ in range(TASKS_COUNT):
+        scheduler = SimpleNamespace(**{day_week: random.random() < 0.5 for day_week in WEEK_DAYS})
+        start_date = date_from + timedelta(days=random.randint(0, days // 4))
+        end_date = date_to - timedelta(days=random.randint(0, days // 4))
+        tasks.append(SimpleNamespace(scheduler=scheduler, start_date=start_date, end_date=end_date))
+    return tasks
+
+
+def main():
+    random.seed(0)
+    date_from = date(2024, 1, 1)
+    print(f'{"years":>5} {"loop, ms":>12} {"mask, ms":>12} {"speedup":>10}')
+    for years in RANGES_YEARS:
+        date_to = date_from.replace(year=date_from.year + years) - timedelta(days=1)
+        tasks = make_tasks(date_from, date_to)
+        for task in tasks:
+            assert legacy_count(task, date_from, date_to) == mask_count(task, date_from, date_to)
+
+        legacy = min(timeit.repeat(lambda: [legacy_count(task, date_from, date_to) for task in tasks],
+                                   number=1, repeat=REPEAT))
+        mask = min(timeit.repeat(lambda: [mask_count(task, date_from, date_to) for task in tasks],
+                                 number=1, repeat=REPEAT))
+        print(f'{years:>5} {legacy * 1000:>12.2f} {mask * 1000:>12.3f} {legacy / mask:>9.0f}x')
+
+
+if __name__ == '__main__':
+    main()